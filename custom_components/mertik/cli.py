@@ -0,0 +1,264 @@
+"""Command line tool for Mertik fireplaces, outside Home Assistant.
+
+    python -m custom_components.mertik.cli discover
+    python -m custom_components.mertik.cli scan 192.168.20.0/24
+    python -m custom_components.mertik.cli status 192.168.1.20 192.168.1.21 --json
+    python -m custom_components.mertik.cli send 192.168.1.20 light_on
+    python -m custom_components.mertik.cli send 192.168.1.20 flame 6
+    python -m custom_components.mertik.cli clock 192.168.1.20 --set
+    python -m custom_components.mertik.cli soak 192.168.1.20 192.168.1.21 --duration 300
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+
+from .const import (
+    CMD_STATUS_POLL,
+    CMD_IGNITE,
+    CMD_SHUTDOWN,
+    CMD_PILOT_STANDBY,
+    CMD_AUX_ON,
+    CMD_AUX_OFF,
+    CMD_LIGHT_ON,
+    CMD_LIGHT_OFF,
+    CMD_FAN_ON,
+    CMD_FAN_OFF,
+    CMD_ECO_MODE,
+    CMD_MANUAL_MODE,
+    CMD_DATETIME_GET,
+    SCAN_CONCURRENCY,
+    SCAN_TIMEOUT
+)
+from .codec import FRAME_STATUS_POLL, encode_command, flame_frame, light_brightness_frame
+from .mertik import Mertik
+from .core import describe
+from .scan import async_scan
+
+_LOGGER = logging.getLogger(__name__)
+
+# Named commands accepted by "send"; flame and brightness take a value
+COMMANDS = {
+    "status_poll": CMD_STATUS_POLL,
+    "ignite": CMD_IGNITE,
+    "shutdown": CMD_SHUTDOWN,
+    "pilot_standby": CMD_PILOT_STANDBY,
+    "aux_on": CMD_AUX_ON,
+    "aux_off": CMD_AUX_OFF,
+    "light_on": CMD_LIGHT_ON,
+    "light_off": CMD_LIGHT_OFF,
+    "fan_on": CMD_FAN_ON,
+    "fan_off": CMD_FAN_OFF,
+    "eco_mode": CMD_ECO_MODE,
+    "manual_mode": CMD_MANUAL_MODE,
+    "datetime_get": CMD_DATETIME_GET,
+}
+VALUE_COMMANDS = {"flame": flame_frame, "brightness": light_brightness_frame}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values: return None
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def poll_once(device):
+    """One status request without the client's retries, so failures are visible."""
+    async with device._lock:
+        try:
+            data = await device._async_exchange(FRAME_STATUS_POLL)
+        finally:
+            if not device._persistent: await device._async_close()
+    device._handle_response(data)
+    return data
+
+
+def _print_status(host, state, as_json):
+    if as_json:
+        print(json.dumps({"host": host, **state}), flush=True)
+        return
+    if "error" in state:
+        print(f"{host:<16} ERROR {state['error']}")
+        return
+    flame = f"flame {state['flame']:>2}" if state["on"] else "off     "
+    flags = [name for name in ("aux", "igniting", "shutting_down", "guard_flame", "light", "fan", "low_battery") if state[name]]
+    print(f"{host:<16} {flame}  {state['temp']:>4.1f}°C  rf {state['rf']:>3}  {' '.join(flags)}")
+
+
+async def cmd_discover(args):
+    devices = await Mertik.async_discover(args.timeout)
+    for device in devices:
+        if args.json: print(json.dumps(device))
+        else: print(f"{device['ip']:<16} {device['response']}")
+    if not devices and not args.json: print("No fireplaces found.")
+    return 0
+
+
+async def cmd_scan(args):
+    try:
+        found = await async_scan(args.network, args.port, args.concurrency, args.timeout)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    for host, frame in found.items():
+        if args.json: print(json.dumps({"ip": host, **frame._asdict()}))
+        else: print(f"{host:<16} {'on' if frame.on else 'off'}  {frame.raw_temperature:>4.1f}°C")
+    if not found and not args.json: print("No fireplaces found.")
+    return 0
+
+
+async def cmd_status(args):
+    limit = asyncio.Semaphore(args.concurrency)
+    failures = 0
+
+    async def one(host):
+        nonlocal failures
+        device = Mertik(host, args.port)
+        async with limit:
+            try:
+                await poll_once(device)
+                state = describe(device)
+            except (OSError, asyncio.TimeoutError, ConnectionError) as e:
+                failures += 1
+                state = {"error": repr(e)}
+        _print_status(host, state, args.json)
+
+    await asyncio.gather(*(one(host) for host in args.hosts))
+    return 1 if failures else 0
+
+
+async def cmd_send(args):
+    if args.command in VALUE_COMMANDS:
+        if args.value is None:
+            print(f"'{args.command}' needs a value", file=sys.stderr)
+            return 2
+        frame = VALUE_COMMANDS[args.command](args.value)
+    elif args.command in COMMANDS:
+        frame = encode_command(COMMANDS[args.command])
+    else:
+        print(f"Unknown command '{args.command}'. Known: {', '.join([*COMMANDS, *VALUE_COMMANDS])}", file=sys.stderr)
+        return 2
+    if frame is None:
+        print(f"Value out of range: {args.value}", file=sys.stderr)
+        return 2
+    device = Mertik(args.host, args.port)
+    data = await device._async_send_frame(frame)
+    if data is None: return 1
+    _print_status(args.host, describe(device), args.json)
+    return 0
+
+
+async def cmd_clock(args):
+    device = Mertik(args.host, args.port)
+    if args.set and not await device.async_set_clock(datetime.now().replace(microsecond=0)): return 1
+    device_time = await device.async_get_clock(max_age=0)
+    if device_time is None:
+        print("The module did not return its clock.", file=sys.stderr)
+        return 1
+    device_time = device_time.replace(microsecond=0)
+    drift = round((device_time - datetime.now()).total_seconds())
+    if args.json: print(json.dumps({"host": args.host, "device_time": device_time.isoformat(), "drift": drift}))
+    else: print(f"{args.host:<16} {device_time}  drift {drift:+d}s")
+    return 0
+
+
+async def cmd_soak(args):
+    limit = asyncio.Semaphore(args.concurrency)
+    stats = {host: {"latencies": [], "failures": 0} for host in args.hosts}
+    deadline = time.monotonic() + args.duration
+
+    async def run(host):
+        device = Mertik(host, args.port)
+        device.keep_alive = args.keep_alive
+        while time.monotonic() < deadline:
+            cycle = time.monotonic()
+            async with limit:
+                # Latency excludes the wait for a concurrency slot
+                started = time.monotonic()
+                try:
+                    await poll_once(device)
+                    stats[host]["latencies"].append(time.monotonic() - started)
+                except (OSError, asyncio.TimeoutError, ConnectionError) as e:
+                    stats[host]["failures"] += 1
+                    _LOGGER.debug(f"{host}: {repr(e)}")
+            wait = cycle + args.interval - time.monotonic()
+            if wait > 0: await asyncio.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+        await device.async_close()
+
+    await asyncio.gather(*(run(host) for host in args.hosts))
+
+    def ms(value): return None if value is None else round(value * 1000, 1)
+
+    report = []
+    for host, s in stats.items():
+        latencies = sorted(s["latencies"])
+        total = len(latencies) + s["failures"]
+        report.append({
+            "host": host,
+            "requests": total,
+            "failures": s["failures"],
+            "failure_rate": round(s["failures"] / total, 4) if total else None,
+            "p50_ms": ms(percentile(latencies, 50)),
+            "p90_ms": ms(percentile(latencies, 90)),
+            "p99_ms": ms(percentile(latencies, 99)),
+            "max_ms": ms(latencies[-1] if latencies else None),
+        })
+    if args.json:
+        for line in report: print(json.dumps(line))
+    else:
+        print(f"{'host':<16} {'requests':>8} {'fail %':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for r in report:
+            rate = "-" if r["failure_rate"] is None else f"{r['failure_rate'] * 100:.1f}"
+            cols = ["-" if r[k] is None else r[k] for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms")]
+            print(f"{r['host']:<16} {r['requests']:>8} {rate:>7} " + " ".join(f"{c:>8}" for c in cols))
+    return 1 if any(r["failures"] for r in report) else 0
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="Print one JSON object per line")
+    common.add_argument("--port", type=int, default=2000, help="Module TCP port")
+    common.add_argument("-v", "--verbose", action="store_true", help="Debug logging")
+    parser = argparse.ArgumentParser(description="Talk to Mertik fireplaces without Home Assistant.")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    p = sub.add_parser("discover", parents=[common], help="Find all modules on the local network")
+    p.add_argument("--timeout", type=float, default=3.0, help="Seconds to wait for answers")
+
+    p = sub.add_parser("scan", parents=[common], help="Probe every host of a network range over TCP")
+    p.add_argument("network", help="CIDR range, e.g. 192.168.20.0/24 (at most 1024 hosts)")
+    p.add_argument("--concurrency", type=int, default=SCAN_CONCURRENCY, help="Hosts probed at the same time")
+    p.add_argument("--timeout", type=float, default=SCAN_TIMEOUT, help="Seconds to wait per host")
+
+    p = sub.add_parser("status", parents=[common], help="Poll and decode the status of one or more hosts")
+    p.add_argument("hosts", nargs="+")
+    p.add_argument("--concurrency", type=int, default=8, help="Hosts polled at the same time")
+
+    p = sub.add_parser("send", parents=[common], help="Send a named command")
+    p.add_argument("host")
+    p.add_argument("command", help=f"One of: {', '.join([*COMMANDS, *VALUE_COMMANDS])}")
+    p.add_argument("value", nargs="?", type=int, help="Flame level (0-12) or brightness (0-255)")
+
+    p = sub.add_parser("clock", parents=[common], help="Read the module clock, or set it to local time")
+    p.add_argument("host")
+    p.add_argument("--set", action="store_true", help="Set the clock to this computer's local time first")
+
+    p = sub.add_parser("soak", parents=[common], help="Poll hosts repeatedly and report latency and failures")
+    p.add_argument("hosts", nargs="+")
+    p.add_argument("--duration", type=float, default=60.0, help="Seconds to run")
+    p.add_argument("--interval", type=float, default=1.0, help="Seconds between polls per host (0 = back to back)")
+    p.add_argument("--concurrency", type=int, default=8, help="Requests in flight at the same time")
+    p.add_argument("--keep-alive", action="store_true", help="Reuse one connection per host")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.ERROR)
+    handler = {"discover": cmd_discover, "scan": cmd_scan, "status": cmd_status, "send": cmd_send, "clock": cmd_clock, "soak": cmd_soak}[args.action]
+    return asyncio.run(handler(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,36 @@
+import asyncio
 import logging
 from homeassistant.components.climate import (
     ClimateEntity, ClimateEntityFeature, HVACMode, HVACAction
 )
-from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE
+from homeassistant.const import UnitOfTemperature, ATTR_TEMPERATURE, STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
-from .const import DOMAIN
+from .const import (
+    DOMAIN, STATE_POWER, STATE_FLAME, STATE_AUX, CAP_AUX, CONF_TEMPERATURE_SENSOR, EXTERNAL_SENSOR_COOLDOWN,
+    CONF_GROUP_MEMBERS, GROUP_STEPS_PER_DEGREE
+)
+from .group import split_heat_demand
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     dataservice = hass.data[DOMAIN].get(entry.entry_id)
-    async_add_entities([MertikClimate(dataservice, entry.entry_id, entry.data["name"])])
+    entities = [MertikClimate(
+        dataservice, entry.entry_id, entry.data["name"],
+        entry.options.get(CONF_TEMPERATURE_SENSOR)
+    )]
+    if entry.options.get(CONF_GROUP_MEMBERS):
+        entities.append(MertikGroupClimate(
+            dataservice, entry.entry_id, entry.data["name"], entry.options[CONF_GROUP_MEMBERS]
+        ))
+    async_add_entities(entities)
 
 class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
-    def __init__(self, dataservice, entry_id, name):
+    def __init__(self, dataservice, entry_id, name, temperature_sensor=None):
         super().__init__(dataservice)
         self._dataservice = dataservice
         self._attr_name = name + " Thermostat"
@@ -28,6 +44,14 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         self._was_available = False
         self._was_on = False
 
+        # Optimal start: flame level held until the target is reached (None = normal control)
+        self._boost_level = None
+
+        # Optional external room sensor: its state changes drive the control loop
+        self._temperature_sensor = temperature_sensor
+        self._external_temp = None
+        self._sensor_debouncer = None
+
     @property
     def device_info(self): return self._dataservice.device_info
 
@@ -46,6 +70,38 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         self._was_on = self._dataservice.is_on
         self._update_lock_status()
 
+        # Optimal start learns from, and starts heating through, this entity
+        self._dataservice.climate = self
+        self.async_on_remove(lambda: setattr(self._dataservice, "climate", None))
+
+        if self._temperature_sensor:
+            self._sensor_debouncer = Debouncer(
+                self.hass, _LOGGER, cooldown=EXTERNAL_SENSOR_COOLDOWN,
+                immediate=False, function=self._control_heating,
+            )
+            self.async_on_remove(self._sensor_debouncer.async_cancel)
+            self.async_on_remove(async_track_state_change_event(
+                self.hass, [self._temperature_sensor], self._async_sensor_changed
+            ))
+            self._update_external_temp(self.hass.states.get(self._temperature_sensor))
+
+    def _update_external_temp(self, state):
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            self._external_temp = None
+            return
+        try:
+            self._external_temp = float(state.state)
+        except (ValueError, TypeError):
+            self._external_temp = None
+
+    @callback
+    def _async_sensor_changed(self, event):
+        previous = self._external_temp
+        self._update_external_temp(event.data.get("new_state"))
+        if self._external_temp == previous: return
+        self.async_write_ha_state()
+        self.hass.async_create_task(self._sensor_debouncer.async_call())
+
     def _update_lock_status(self):
         """Update global lock status and force other entities to refresh."""
         is_active = (self._attr_hvac_mode == HVACMode.HEAT)
@@ -57,7 +113,19 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
              self.coordinator.async_update_listeners()
 
     @property
-    def current_temperature(self): return self._dataservice.ambient_temperature
+    def current_temperature(self):
+        # Fall back to the fireplace's own reading while the external sensor is unavailable
+        if self._external_temp is not None: return self._external_temp
+        return self._dataservice.ambient_temperature
+
+    @property
+    def extra_state_attributes(self):
+        attrs = {}
+        if self._temperature_sensor: attrs["temperature_sensor"] = self._temperature_sensor
+        schedule = self._dataservice.comfort_plan
+        if schedule: attrs["optimal_start"] = schedule
+        if self._boost_level is not None: attrs["comfort_boost_level"] = self._boost_level
+        return attrs or None
     @property
     def hvac_mode(self): return self._attr_hvac_mode
     @property
@@ -70,22 +138,39 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
     def target_temperature(self): return self._target_temp
 
     async def async_set_hvac_mode(self, hvac_mode):
+        self._boost_level = None
+        await self._async_apply_hvac_mode(hvac_mode)
+
+    async def _async_apply_hvac_mode(self, hvac_mode):
         self._attr_hvac_mode = hvac_mode
         self._update_lock_status() # <--- Triggers update for Eco Switch
         
         if hvac_mode == HVACMode.OFF:
+            self._dataservice.clear_desired(STATE_POWER, STATE_FLAME)
             if self._dataservice.keep_pilot_on:
                  if self._dataservice.get_flame_height() > 0:
-                     await self._dataservice.async_set_flame_height(0)
+                     await self._dataservice.async_request(STATE_FLAME, 0)
             else:
-                 await self._dataservice.async_guard_flame_off()
+                 await self._dataservice.async_request(STATE_POWER, False)
         elif hvac_mode == HVACMode.HEAT:
             await self._control_heating()
         self.async_write_ha_state()
 
+    async def async_start_comfort(self, target):
+        """Called by the optimal start schedule when it is time to heat.
+
+        The start time was planned with the fastest learned flame level, so
+        that level is held until the target is reached instead of the
+        proportional flame, which would warm the room slower than planned.
+        """
+        self._target_temp = target
+        self._boost_level = max(1, self._dataservice.preheat.best_level()[0])
+        await self._async_apply_hvac_mode(HVACMode.HEAT)
+
     async def async_set_temperature(self, **kwargs):
         if ATTR_TEMPERATURE in kwargs:
             self._target_temp = kwargs[ATTR_TEMPERATURE]
+            self._boost_level = None
             if self._attr_hvac_mode == HVACMode.HEAT:
                 await self._control_heating()
             self.async_write_ha_state()
@@ -103,6 +188,7 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
                 else: 
                     if self._attr_hvac_mode == HVACMode.HEAT:
                         self._attr_hvac_mode = HVACMode.OFF
+                        self._boost_level = None
         
         elif not self._was_available and is_available:
             if smart_sync:
@@ -115,33 +201,193 @@ class MertikClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         self._was_available = is_available
         self._was_on = is_on
         self._update_lock_status()
-        self.hass.async_create_task(self._control_heating())
+        # Only state the demand here; the coordinator's reconcile pass that
+        # follows this update sends whatever commands are needed.
+        self._update_heating_demand()
         super()._handle_coordinator_update()
 
     async def _control_heating(self):
+        self._update_heating_demand()
+        await self._dataservice.async_reconcile()
+
+    def _update_heating_demand(self):
+        """Translate the temperature error into desired power/flame on the coordinator."""
         if not self.coordinator.last_update_success: return
         if self._attr_hvac_mode == HVACMode.OFF: return 
+        if self._dataservice.group is not None: return  # The group thermostat decides
         
         current_temp = self.current_temperature
         delta = self._target_temp - current_temp
         hysteresis = self._dataservice.thermostat_deadzone
         
         if self._attr_hvac_mode == HVACMode.HEAT:
+            if self._boost_level is not None:
+                if delta > 0:
+                    if not self._dataservice.is_on: self._dataservice.set_desired(STATE_POWER, True)
+                    else: self._dataservice.set_desired(STATE_FLAME, self._boost_level)
+                    return
+                self._boost_level = None  # Target reached: back to normal control
             if delta <= 0:
                 if self._dataservice.get_flame_height() > 0:
                     if self._dataservice.keep_pilot_on:
-                        await self._dataservice.async_set_flame_height(0)
+                        self._dataservice.set_desired(STATE_FLAME, 0)
                     else:
                         if delta <= -0.5 and not self._dataservice.keep_pilot_on:
-                             await self._dataservice.async_guard_flame_off()
+                             self._dataservice.set_desired(STATE_POWER, False)
                         else:
-                             await self._dataservice.async_set_flame_height(0)
+                             self._dataservice.set_desired(STATE_FLAME, 0)
+                else:
+                    # Warm enough: drop heating demand that was not carried out yet
+                    self._dataservice.clear_desired(STATE_FLAME)
+                    if self._dataservice.desired.get(STATE_POWER):
+                        self._dataservice.clear_desired(STATE_POWER)
             elif delta > hysteresis:
                 if not self._dataservice.is_on:
-                    await self._dataservice.async_ignite_fireplace()
+                    self._dataservice.set_desired(STATE_POWER, True)
                     return 
                 raw_height = int(delta * 6)
                 target_height = max(1, min(12, raw_height))
-                current_height = self._dataservice.get_flame_height()
-                if current_height != target_height:
-                    await self._dataservice.async_set_flame_height(target_height)
+                self._dataservice.set_desired(STATE_FLAME, target_height)
+
+
+class MertikGroupClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
+    """One thermostat for this fireplace and the member entries heating the same room."""
+
+    def __init__(self, dataservice, entry_id, name, member_ids):
+        super().__init__(dataservice)
+        self._dataservice = dataservice
+        self._member_ids = list(member_ids)
+        self._attr_name = name + " Group Thermostat"
+        self._attr_unique_id = entry_id + "-GroupClimate"
+        self._attr_temperature_unit = UnitOfTemperature.CELSIUS
+        self._attr_hvac_modes = [HVACMode.OFF, HVACMode.HEAT]
+        self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
+        self._attr_hvac_mode = HVACMode.OFF
+        self._target_temp = 21.0
+        self._control_task = None
+        self.member_errors = {}
+
+    @property
+    def device_info(self): return self._dataservice.device_info
+
+    @property
+    def members(self):
+        """Coordinators of the group, this entry first; entries not loaded are left out."""
+        loaded = self.hass.data.get(DOMAIN, {})
+        return [self._dataservice] + [loaded[i] for i in self._member_ids if i in loaded]
+
+    def _claim_members(self):
+        """While heating, the members' own thermostats leave the demand to this entity."""
+        for member in self.members:
+            if self._attr_hvac_mode == HVACMode.HEAT: member.group = self
+            elif member.group is self: member.group = None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state:
+            if last_state.state in [HVACMode.HEAT, HVACMode.OFF]:
+                self._attr_hvac_mode = last_state.state
+            try:
+                self._target_temp = float(last_state.attributes.get(ATTR_TEMPERATURE, self._target_temp))
+            except (ValueError, TypeError):
+                pass
+        self._claim_members()
+        self.async_on_remove(self._release_members)
+
+    def _release_members(self):
+        for member in self.members:
+            if member.group is self: member.group = None
+
+    @property
+    def current_temperature(self):
+        readings = [m.room_temperature for m in self.members if m.last_update_success and m.room_temperature]
+        return round(sum(readings) / len(readings), 1) if readings else None
+
+    @property
+    def hvac_mode(self): return self._attr_hvac_mode
+    @property
+    def hvac_action(self):
+        if self._attr_hvac_mode == HVACMode.OFF: return HVACAction.OFF
+        if any(m.is_on and m.get_flame_height() > 0 for m in self.members): return HVACAction.HEATING
+        return HVACAction.IDLE
+    @property
+    def target_temperature(self): return self._target_temp
+
+    @property
+    def extra_state_attributes(self):
+        return {
+            "members": [m.device_name for m in self.members],
+            "member_errors": self.member_errors,
+        }
+
+    async def async_set_hvac_mode(self, hvac_mode):
+        self._attr_hvac_mode = hvac_mode
+        self._claim_members()
+        if hvac_mode == HVACMode.OFF:
+            members = self.members
+            for member in members:
+                member.clear_desired(STATE_POWER, STATE_FLAME, STATE_AUX)
+                if member.keep_pilot_on:
+                    if member.get_flame_height() > 0: member.set_desired(STATE_FLAME, 0)
+                else:
+                    member.set_desired(STATE_POWER, False)
+            await self._async_dispatch(members)
+        else:
+            await self._async_control()
+        self.async_write_ha_state()
+
+    async def async_set_temperature(self, **kwargs):
+        if ATTR_TEMPERATURE in kwargs:
+            self._target_temp = kwargs[ATTR_TEMPERATURE]
+            if self._attr_hvac_mode == HVACMode.HEAT:
+                await self._async_control()
+            self.async_write_ha_state()
+
+    def _handle_coordinator_update(self) -> None:
+        if self._attr_hvac_mode == HVACMode.HEAT and (self._control_task is None or self._control_task.done()):
+            self._control_task = self.hass.async_create_task(self._async_control())
+        super()._handle_coordinator_update()
+
+    async def _async_control(self):
+        """One control pass: split the demand, then send to all members at once."""
+        self._claim_members()  # Picks up member entries loaded after this entity
+        members = [m for m in self.members if m.last_update_success]
+        current = self.current_temperature
+        if not members or current is None: return
+        delta = self._target_temp - current
+
+        if delta <= 0:
+            for member in members:
+                member.clear_desired(STATE_AUX)
+                if member.is_aux_on: member.set_desired(STATE_AUX, False)
+                if member.get_flame_height() > 0:
+                    if delta <= -0.5 and not member.keep_pilot_on: member.set_desired(STATE_POWER, False)
+                    else: member.set_desired(STATE_FLAME, 0)
+                else:
+                    member.clear_desired(STATE_FLAME)
+                    if member.desired.get(STATE_POWER): member.clear_desired(STATE_POWER)
+        elif delta > self._dataservice.thermostat_deadzone:
+            demand = int(delta * GROUP_STEPS_PER_DEGREE * len(members))
+            plan = split_heat_demand(demand, [CAP_AUX in m.capabilities for m in members])
+            for member, (flame, aux) in zip(members, plan):
+                if flame == 0:
+                    if member.is_on and member.get_flame_height() > 0: member.set_desired(STATE_FLAME, 0)
+                elif not member.is_on:
+                    member.set_desired(STATE_POWER, True)
+                else:
+                    member.set_desired(STATE_FLAME, flame)
+                if CAP_AUX in member.capabilities and member.is_on and (aux or member.is_aux_on):
+                    member.set_desired(STATE_AUX, aux)
+        await self._async_dispatch(members)
+
+    async def _async_dispatch(self, members):
+        """Reconcile all members concurrently; one failing fireplace does not stop the others."""
+        results = await asyncio.gather(*(m.async_reconcile() for m in members), return_exceptions=True)
+        for member, result in zip(members, results):
+            entry_id = member.entry_id
+            if isinstance(result, Exception):
+                _LOGGER.error(f"Group thermostat could not update {member.device_name}: {result}")
+                self.member_errors[entry_id] = str(result)
+            else:
+                self.member_errors.pop(entry_id, None)
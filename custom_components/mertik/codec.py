@@ -0,0 +1,307 @@
+"""Protocol codec for the Mertik WiFi module.
+
+Every fixed command is encoded once at import time into an immutable ``bytes``
+frame, and the flame / light brightness commands come from lookup tables, so
+nothing is built at send time. The decoders turn raw responses into typed,
+immutable frames (see PROTOCOL.md for the payload layouts).
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional, Union
+
+from .const import (
+    CMD_PREFIX,
+    RESPONSE_PREFIX_1,
+    RESPONSE_PREFIX_2,
+    CMD_STATUS_POLL,
+    CMD_IGNITE,
+    CMD_SHUTDOWN,
+    CMD_PILOT_STANDBY,
+    CMD_AUX_ON,
+    CMD_AUX_OFF,
+    CMD_LIGHT_ON,
+    CMD_LIGHT_OFF,
+    CMD_FAN_ON,
+    CMD_FAN_OFF,
+    CMD_ECO_MODE,
+    CMD_MANUAL_MODE,
+    CMD_DATETIME_GET,
+    CMD_DATETIME_SET_PREFIX,
+    CMD_DATETIME_SET_SUFFIX,
+    CMD_FLAME_PREFIX,
+    CMD_FLAME_SUFFIX,
+    FLAME_STEPS,
+    CMD_LIGHT_SET_PREFIX,
+    CMD_LIGHT_SET_SUFFIX,
+    CAP_FAN,
+    CAP_LIGHT,
+    CAP_AUX
+)
+
+# Responses (ASCII decoded, STX stripped) start with this header followed by
+# the two character command code, e.g. "03" for status or "30" for light.
+RESPONSE_HEADER = "0303000000"
+RESPONSE_CMD_LIGHT = "30"
+RESPONSE_CMD_SETTINGS = "D1"
+RESPONSE_CMD_DATETIME = "06"  # By analogy with 33 30 -> "30" and 44 31 -> "D1"
+
+# Feature bits in the low nibble of the second FEATURES character
+FEATURE_FAN = 0x1
+FEATURE_LIGHT = 0x2
+FEATURE_AUX = 0x4
+
+
+def encode_command(msg: str) -> bytes:
+    """Frame a hex command string (without prefix) for the wire."""
+    return bytes.fromhex(CMD_PREFIX + msg)
+
+# --- Fixed Command Frames ---
+FRAME_STATUS_POLL = encode_command(CMD_STATUS_POLL)
+FRAME_IGNITE = encode_command(CMD_IGNITE)
+FRAME_SHUTDOWN = encode_command(CMD_SHUTDOWN)
+FRAME_PILOT_STANDBY = encode_command(CMD_PILOT_STANDBY)
+FRAME_AUX_ON = encode_command(CMD_AUX_ON)
+FRAME_AUX_OFF = encode_command(CMD_AUX_OFF)
+FRAME_LIGHT_ON = encode_command(CMD_LIGHT_ON)
+FRAME_LIGHT_OFF = encode_command(CMD_LIGHT_OFF)
+FRAME_FAN_ON = encode_command(CMD_FAN_ON)
+FRAME_FAN_OFF = encode_command(CMD_FAN_OFF)
+FRAME_ECO_MODE = encode_command(CMD_ECO_MODE)
+FRAME_MANUAL_MODE = encode_command(CMD_MANUAL_MODE)
+FRAME_DATETIME_GET = encode_command(CMD_DATETIME_GET)
+
+# --- Flame Height (Levels 0 - 12) ---
+FLAME_FRAMES = tuple(
+    encode_command(CMD_FLAME_PREFIX + step + CMD_FLAME_SUFFIX) for step in FLAME_STEPS
+)
+
+# --- Light Brightness (Home Assistant 0 - 255) ---
+def _light_brightness_code(brightness: int) -> str:
+    normalized_brightness = (brightness - 1) / 254 * 100
+    if normalized_brightness == 100: return "4642"
+    if normalized_brightness == 0: return "3633"
+    l = 36 + round(normalized_brightness / 100 * 8)
+    if l >= 40: l += 1
+    return f"{l:02d}{l:02d}"
+
+LIGHT_BRIGHTNESS_CODES = tuple(_light_brightness_code(b) for b in range(256))
+LIGHT_BRIGHTNESS_FRAMES = tuple(
+    encode_command(CMD_LIGHT_SET_PREFIX + code + CMD_LIGHT_SET_SUFFIX)
+    for code in LIGHT_BRIGHTNESS_CODES
+)
+
+
+def light_transition_steps(start: int, target: int):
+    """Brightness steps from start to target, one per distinct frame.
+
+    Neighbouring brightness values often map to the same device code, so only
+    the first value of each code not sent yet is kept. The target is always last.
+    """
+    start = max(0, min(255, round(start)))
+    target = max(0, min(255, round(target)))
+    step = 1 if target >= start else -1
+    steps = []
+    seen = {LIGHT_BRIGHTNESS_FRAMES[start]}
+    for brightness in range(start + step, target + step, step):
+        frame = LIGHT_BRIGHTNESS_FRAMES[brightness]
+        if frame not in seen:
+            steps.append((brightness, frame))
+            seen.add(frame)
+    if not steps or steps[-1][0] != target:
+        if steps and steps[-1][1] == LIGHT_BRIGHTNESS_FRAMES[target]: steps.pop()
+        steps.append((target, LIGHT_BRIGHTNESS_FRAMES[target]))
+    return steps
+
+
+def datetime_frame(when: datetime) -> bytes:
+    """Return the frame setting the device clock.
+
+    Each value is written as two hex digits, sent as their ASCII codes
+    (e.g. 23 -> "17" -> 31 37), see PROTOCOL.md.
+    """
+    values = (when.year % 100, when.month, when.day, when.isoweekday(), when.hour, when.minute, when.second)
+    payload = "".join(f"{v:02X}" for v in values).encode("ascii").hex()
+    return encode_command(CMD_DATETIME_SET_PREFIX + payload + CMD_DATETIME_SET_SUFFIX)
+
+
+def flame_frame(flame_height: int) -> Optional[bytes]:
+    """Return the frame for a flame level, or None when out of range."""
+    if 0 <= flame_height < len(FLAME_FRAMES):
+        return FLAME_FRAMES[flame_height]
+    return None
+
+
+def light_brightness_frame(brightness) -> bytes:
+    """Return the frame setting the light to a Home Assistant brightness (0-255)."""
+    return LIGHT_BRIGHTNESS_FRAMES[max(0, min(255, round(brightness)))]
+
+
+# --- Decoded Frames ---
+class StatusFrame(NamedTuple):
+    on: bool
+    flame_height: int
+    mode: str
+    shutting_down: bool
+    guard_flame_on: bool
+    igniting: bool
+    aux_on: bool
+    light_on: bool
+    light_brightness: int
+    low_battery: bool
+    fan_on: bool
+    rf_signal_level: int
+    raw_temperature: float
+
+    @property
+    def lit(self) -> bool:
+        """Main burner or pilot burning (what ``Mertik.is_on`` reports)."""
+        return self.on or self.guard_flame_on
+
+
+class LightFrame(NamedTuple):
+    on: bool
+    brightness_raw: int
+    brightness: int
+
+
+class SettingsFrame(NamedTuple):
+    setting: str
+    features_raw: str
+    has_fan: bool
+    has_light: bool
+    has_aux: bool
+
+
+class DateTimeFrame(NamedTuple):
+    year: int
+    month: int
+    day: int
+    weekday: int  # 1 (Monday) - 7 (Sunday)
+    hour: int
+    minute: int
+    second: int
+
+    def as_datetime(self) -> datetime:
+        return datetime(2000 + self.year, self.month, self.day, self.hour, self.minute, self.second)
+
+
+def _hex2bin(hex_val): return format(int(hex_val, 16), "b").zfill(8)
+def _from_bit_status(hex_val, index): return _hex2bin(hex_val)[index : index + 1] == "1"
+
+def _brightness_from_raw(raw: int) -> int:
+    """Map the reported brightness byte (0x64 - 0xFB) onto 0 - 255."""
+    return max(0, round(((raw - 100) / 151) * 255))
+
+
+def response_text(data: bytes) -> str:
+    """ASCII decode a raw response, dropping STX and marking line ends with ';'."""
+    text = data.decode("ascii", errors='ignore')
+    if len(text) > 0: text = text[1:]
+    return text.replace('\r', ';')
+
+
+def split_frames(buffer: bytes):
+    """Split the complete frames (ending in ETX or CR) off a byte stream.
+
+    A line feed right after the end byte (the aux frames have one) stays with
+    its frame. Returns (frames, rest), rest being the start of a frame still
+    to arrive.
+    """
+    frames = []
+    start = 0
+    index = 0
+    while index < len(buffer):
+        if buffer[index] in (0x03, 0x0D):
+            end = index + 2 if buffer[index + 1:index + 2] == b"\n" else index + 1
+            frame = buffer[start:end].lstrip(b"\n")
+            if frame: frames.append(frame)
+            start = index = end
+        else:
+            index += 1
+    return frames, buffer[start:]
+
+
+def decode_status(text: str) -> StatusFrame:
+    """Decode a status response. Raises ValueError on malformed input."""
+    flame_raw = int(text[14:16], 16)
+    if flame_raw <= 123:
+        flame_height, on = 0, False
+    else:
+        flame_height, on = min(12, round(((flame_raw - 128) / 128) * 12) + 1), True
+    bits = text[16:20]
+    light_on = _from_bit_status(bits, 13)
+    try: rf_signal_level = int(text[12:14], 16)
+    except ValueError: rf_signal_level = 0
+    light_brightness = _brightness_from_raw(int(text[20:22], 16)) if light_on else 0
+    return StatusFrame(
+        on=on,
+        flame_height=flame_height,
+        mode=text[24:25],
+        shutting_down=_from_bit_status(bits, 7),
+        guard_flame_on=_from_bit_status(bits, 8),
+        igniting=_from_bit_status(bits, 11),
+        aux_on=flame_height != 0 and _from_bit_status(bits, 12),
+        light_on=light_on,
+        light_brightness=light_brightness,
+        low_battery=_from_bit_status(bits, 9),
+        fan_on=_from_bit_status(bits, 14),
+        rf_signal_level=rf_signal_level,
+        raw_temperature=int(text[30:32], 16) / 10,
+    )
+
+
+def decode_light(payload: str) -> LightFrame:
+    """Decode a light payload: [STATUS] [BRIGHTNESS]."""
+    on = payload[0:2] == "01"
+    raw = int(payload[2:4], 16)
+    return LightFrame(on=on, brightness_raw=raw, brightness=_brightness_from_raw(raw) if on else 0)
+
+
+def decode_settings(payload: str) -> SettingsFrame:
+    """Decode a settings payload: [SETTING] [???] [FEATURES] [xx xx xx xx]."""
+    features = payload[3:5]
+    if len(features) != 2: raise ValueError(f"Settings payload too short: {payload!r}")
+    mask = int(features[1], 16)
+    return SettingsFrame(
+        setting=payload[0:2],
+        features_raw=features,
+        has_fan=bool(mask & FEATURE_FAN),
+        has_light=bool(mask & FEATURE_LIGHT),
+        has_aux=bool(mask & FEATURE_AUX),
+    )
+
+
+def decode_datetime(payload: str) -> DateTimeFrame:
+    """Decode a date time payload: seven values of two hex digits each."""
+    if len(payload) < 14: raise ValueError(f"Date time payload too short: {payload!r}")
+    return DateTimeFrame(*(int(payload[i:i + 2], 16) for i in range(0, 14, 2)))
+
+
+def decode_response(data: bytes) -> Optional[Union[StatusFrame, LightFrame, SettingsFrame, DateTimeFrame]]:
+    """Decode a raw response into a typed frame, or None if it is not understood."""
+    text = response_text(data)
+    if text.startswith((RESPONSE_PREFIX_1, RESPONSE_PREFIX_2)):
+        return decode_status(text)
+    if text.startswith(RESPONSE_HEADER):
+        cmd = text[len(RESPONSE_HEADER):len(RESPONSE_HEADER) + 2]
+        payload = text[len(RESPONSE_HEADER) + 2:].rstrip(';')
+        if cmd == RESPONSE_CMD_LIGHT: return decode_light(payload)
+        if cmd == RESPONSE_CMD_SETTINGS: return decode_settings(payload)
+        if cmd == RESPONSE_CMD_DATETIME: return decode_datetime(payload)
+    return None
+
+
+def observed_capabilities(status: StatusFrame) -> set:
+    """Optional parts (fan, light, secondary burner) a status frame shows in use."""
+    active = {CAP_FAN: status.fan_on, CAP_LIGHT: status.light_on, CAP_AUX: status.aux_on}
+    return {cap for cap, on in active.items() if on}
+
+
+# Named states for async_wait_for and the wait_for_state service, judged on decoded
+# status frames. ``on`` is only set for a real flame; the pilot alone shows as the
+# guard flame bit.
+WAIT_STATES = {
+    "ignited": lambda s: (s.on or s.guard_flame_on) and not s.igniting,
+    "flame_on": lambda s: s.on and not s.igniting and s.flame_height > 0,
+    "pilot": lambda s: s.guard_flame_on and not s.on and not s.igniting,
+    "off": lambda s: not s.on and not s.guard_flame_on and not s.igniting and not s.shutting_down,
+}
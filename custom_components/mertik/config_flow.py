@@ -3,28 +3,90 @@ import logging
 from typing import Any, Dict, Optional
 
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import CONF_NAME, CONF_HOST
+from homeassistant.core import callback
+from homeassistant.helpers import selector
 import voluptuous as vol
 
-from .const import DOMAIN
-
-from .mertik import Mertik
+from .const import (
+    DOMAIN,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_GROUP_MEMBERS,
+    CONF_BURNER_POWER,
+    CONF_AUX_POWER,
+    CONF_CALORIFIC_VALUE,
+    DEFAULT_BURNER_POWER,
+    DEFAULT_AUX_POWER,
+    DEFAULT_CALORIFIC_VALUE,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TEMPERATURE_MIN_INTERVAL,
+    CONF_TEMPERATURE_MAX_INTERVAL,
+    CONF_SIGNAL_DEADBAND,
+    CONF_SIGNAL_MIN_INTERVAL,
+    CONF_SIGNAL_MAX_INTERVAL,
+    CONF_STATUS_MIN_INTERVAL,
+    CONF_STATUS_MAX_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TEMPERATURE_MIN_INTERVAL,
+    DEFAULT_TEMPERATURE_MAX_INTERVAL,
+    DEFAULT_SIGNAL_DEADBAND,
+    DEFAULT_SIGNAL_MIN_INTERVAL,
+    DEFAULT_SIGNAL_MAX_INTERVAL,
+    DEFAULT_STATUS_MIN_INTERVAL,
+    DEFAULT_STATUS_MAX_INTERVAL,
+    CONF_PROXY_PORT,
+    CONF_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_PROXY_HOST,
+    CONF_MQTT_PREFIX,
+    DEFAULT_MQTT_PREFIX,
+    CONF_CAPABILITIES,
+    ALL_CAPABILITIES,
+    HOST_CHECK_TIMEOUT
+)
+from .runtime import parse_power_table
+from .scan import async_probe_host, async_scan
+from .throttle import parse_deadband
 
 _LOGGER = logging.getLogger(__name__)
 
+INTERVAL = vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+
 
 class MertikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Mertik config flow."""
 
     data: Optional[Dict[str, Any]]
+    found: Optional[Dict[str, Any]] = None
 
     async def async_step_user(self, device_input: Optional[Dict[str, Any]] = None):
-        """Invoked when a user initiates a flow via the user interface."""
+        """Invoked when a user initiates a flow via the user interface.
+
+        The host may be a single address, which is checked with a status poll,
+        or a CIDR range (e.g. 192.168.20.0/24), which is scanned for fireplaces.
+        """
         errors: Dict[str, str] = {}
         if device_input is not None:
             self.data = device_input
-
-            return self.async_create_entry(title="Mertik Maxitrol", data=self.data)
+            host = device_input[CONF_HOST].strip()
+            if "/" in host:
+                try:
+                    self.found = await async_scan(host)
+                except ValueError:
+                    errors[CONF_HOST] = "invalid_range"
+                else:
+                    if len(self.found) == 1:
+                        return await self._async_create_entry(next(iter(self.found)))
+                    if self.found: return await self.async_step_pick()
+                    errors[CONF_HOST] = "no_devices_found"
+            else:
+                await self._async_claim(host)
+                # One quick poll: the form waits for it
+                if await async_probe_host(host, timeout=HOST_CHECK_TIMEOUT) is None:
+                    errors[CONF_HOST] = "cannot_connect"
+                else:
+                    return await self._async_create_entry(host)
 
         DEVICE_SCHEMA = vol.Schema(
             {vol.Required(CONF_NAME): str, vol.Required(CONF_HOST): str}
@@ -33,3 +95,147 @@ class MertikConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=DEVICE_SCHEMA, errors=errors
         )
+
+    async def async_step_pick(self, device_input: Optional[Dict[str, Any]] = None):
+        """Choose one of several fireplaces found by a range scan."""
+        if device_input is not None:
+            return await self._async_create_entry(device_input[CONF_HOST])
+
+        PICK_SCHEMA = vol.Schema({vol.Required(CONF_HOST): vol.In(list(self.found))})
+
+        return self.async_show_form(step_id="pick", data_schema=PICK_SCHEMA)
+
+    async def _async_claim(self, host):
+        """Abort the flow if this module is already set up (entries before unique IDs by host)."""
+        await self.async_set_unique_id(host)
+        self._abort_if_unique_id_configured()
+        self._async_abort_entries_match({CONF_HOST: host})
+
+    async def _async_create_entry(self, host):
+        await self._async_claim(host)
+        # Optional parts are added as status frames show them (or in the options)
+        self.data = {**self.data, CONF_HOST: host, CONF_CAPABILITIES: []}
+        return self.async_create_entry(title="Mertik Maxitrol", data=self.data)
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry):
+        return MertikOptionsFlow()
+
+
+class MertikOptionsFlow(config_entries.OptionsFlow):
+    """Mertik options flow."""
+
+    async def async_step_init(self, user_input: Optional[Dict[str, Any]] = None):
+        """Manage the options."""
+        errors: Dict[str, str] = {}
+        if user_input is not None:
+            try:
+                parse_power_table(user_input.get(CONF_BURNER_POWER, DEFAULT_BURNER_POWER))
+            except ValueError:
+                errors[CONF_BURNER_POWER] = "invalid_power_table"
+            for key, default in ((CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+                                 (CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND)):
+                try:
+                    parse_deadband(user_input.get(key, default))
+                except ValueError:
+                    errors[key] = "invalid_deadband"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        OPTIONS_SCHEMA = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_CAPABILITIES,
+                    default=options.get(
+                        CONF_CAPABILITIES, self.config_entry.data.get(CONF_CAPABILITIES, ALL_CAPABILITIES)
+                    ),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=ALL_CAPABILITIES,
+                        multiple=True,
+                        translation_key=CONF_CAPABILITIES,
+                    )
+                ),
+                vol.Optional(
+                    CONF_TEMPERATURE_SENSOR,
+                    description={"suggested_value": options.get(CONF_TEMPERATURE_SENSOR)},
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(
+                        domain="sensor", device_class=SensorDeviceClass.TEMPERATURE
+                    )
+                ),
+                vol.Optional(
+                    CONF_GROUP_MEMBERS,
+                    default=options.get(CONF_GROUP_MEMBERS, []),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=[
+                            selector.SelectOptionDict(value=entry.entry_id, label=entry.data.get(CONF_NAME, entry.title))
+                            for entry in self.hass.config_entries.async_entries(DOMAIN)
+                            if entry.entry_id != self.config_entry.entry_id
+                        ],
+                        multiple=True,
+                    )
+                ),
+                vol.Optional(
+                    CONF_BURNER_POWER,
+                    default=options.get(CONF_BURNER_POWER, DEFAULT_BURNER_POWER),
+                ): str,
+                vol.Optional(
+                    CONF_AUX_POWER,
+                    default=options.get(CONF_AUX_POWER, DEFAULT_AUX_POWER),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_CALORIFIC_VALUE,
+                    default=options.get(CONF_CALORIFIC_VALUE, DEFAULT_CALORIFIC_VALUE),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                vol.Optional(
+                    CONF_TEMPERATURE_DEADBAND,
+                    default=options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+                ): str,
+                vol.Optional(
+                    CONF_TEMPERATURE_MIN_INTERVAL,
+                    default=options.get(CONF_TEMPERATURE_MIN_INTERVAL, DEFAULT_TEMPERATURE_MIN_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_TEMPERATURE_MAX_INTERVAL,
+                    default=options.get(CONF_TEMPERATURE_MAX_INTERVAL, DEFAULT_TEMPERATURE_MAX_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_SIGNAL_DEADBAND,
+                    default=options.get(CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+                ): str,
+                vol.Optional(
+                    CONF_SIGNAL_MIN_INTERVAL,
+                    default=options.get(CONF_SIGNAL_MIN_INTERVAL, DEFAULT_SIGNAL_MIN_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_SIGNAL_MAX_INTERVAL,
+                    default=options.get(CONF_SIGNAL_MAX_INTERVAL, DEFAULT_SIGNAL_MAX_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_STATUS_MIN_INTERVAL,
+                    default=options.get(CONF_STATUS_MIN_INTERVAL, DEFAULT_STATUS_MIN_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_STATUS_MAX_INTERVAL,
+                    default=options.get(CONF_STATUS_MAX_INTERVAL, DEFAULT_STATUS_MAX_INTERVAL),
+                ): INTERVAL,
+                vol.Optional(
+                    CONF_PROXY_PORT,
+                    default=options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=65535)),
+                vol.Optional(
+                    CONF_PROXY_HOST,
+                    default=options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+                ): str,
+                vol.Optional(
+                    CONF_MQTT_PREFIX,
+                    default=options.get(CONF_MQTT_PREFIX, DEFAULT_MQTT_PREFIX),
+                ): str,
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=OPTIONS_SCHEMA, errors=errors)
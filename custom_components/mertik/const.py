@@ -7,6 +7,58 @@ UDP_PORT_DISCOVERY = 30719
 UDP_PORT_TARGET = 30718
 DISCOVERY_PAYLOAD = "000100f6"
 
+# TCP probe used by the subnet scan and to validate a manually entered host
+SCAN_TIMEOUT = 1.5        # Seconds for connect and for the status reply
+SCAN_CONCURRENCY = 64     # Hosts probed at the same time
+SCAN_MAX_HOSTS = 1024     # Largest range accepted (a /22)
+HOST_CHECK_TIMEOUT = 2.5  # Single status poll of a host entered in the config flow
+
+# Finding a module again after its DHCP address changed
+CONF_IDENTITY = "identity"  # Discovery response of the module, stored in the entry
+REDISCOVERY_FAILURES = 3    # Unanswered frames in a row before broadcasting
+REDISCOVERY_INTERVAL = 300  # Seconds between two discovery broadcasts
+REDISCOVERY_TIMEOUT = 2.0   # Seconds to collect discovery answers
+
+# --- TIMEOUTS ---
+# Connect and read timeouts follow the measured round-trip time within these bounds
+CONNECT_TIMEOUT_FLOOR = 0.5
+READ_TIMEOUT_FLOOR = 0.5
+TIMEOUT_CEILING = 10.0
+
+# --- HISTORY ---
+HISTORY_SIZE = 5760             # Snapshots kept in memory (24 h at the 15 s poll)
+HISTORY_HOURS_KEPT = 48         # Completed hourly aggregates kept for diagnostics
+
+# --- DEVICE CLOCK ---
+CLOCK_CACHE_TTL = 300           # Seconds a read back device time is reused
+CLOCK_SYNC_INTERVAL = 86400     # Seconds between clock checks
+CLOCK_MAX_DRIFT = 60            # Seconds of drift tolerated before the clock is set
+
+# --- READ CACHE ---
+# Seconds each readable payload is reused by Mertik.async_read
+READ_TTL_STATUS = 5
+READ_TTL_DATETIME = CLOCK_CACHE_TTL
+
+POLL_INTERVAL = 15             # Seconds between regular status polls
+
+# --- WAIT FOR STATE ---
+WAIT_POLL_INTERVAL = 5          # Seconds between polls while something waits for a state
+WAIT_DEFAULT_TIMEOUT = 60       # Seconds the wait_for_state service waits by default
+IGNITION_TIMEOUT = 90           # Longest ignition cycle waited for before dropping to pilot
+
+# --- HEALTH ---
+# A lock held longer than this is reported with the stack of the task holding it
+SLOW_OPERATION_THRESHOLD = 10.0
+WATCHDOG_INTERVAL = 1.0
+LOOP_LAG_THRESHOLD = 0.5        # Seconds a watchdog tick may run late before warning
+PROFILE_DEFAULT_CYCLES = 5
+
+# --- DIAGNOSTICS ---
+# Number of raw TX/RX frames kept in memory for the diagnostics download
+FRAME_CAPTURE_SIZE = 256
+# Events buffered per live frame subscriber; the oldest are dropped beyond this
+STREAM_QUEUE_SIZE = 256
+
 # --- COMMAND PREFIXES ---
 # This strange prefix precedes almost every command sent to the device
 CMD_PREFIX = "0233303330333033303830"
@@ -34,6 +86,110 @@ CMD_FAN_OFF       = "3430303003"  # Fan Off
 CMD_ECO_MODE      = "4233303103"  # Wave pattern
 CMD_MANUAL_MODE   = "423003"      # Static flame
 
+# Date and time (30 36): get (46 46), or set (46 45) followed by the date time payload
+CMD_DATETIME_GET  = "3036464603"
+CMD_DATETIME_SET_PREFIX = "30364645"
+CMD_DATETIME_SET_SUFFIX = "03"
+
+# --- CAPABILITIES ---
+# Optional hardware: all assumed present unless overridden in the options
+CONF_CAPABILITIES = "capabilities"
+CAP_FAN = "fan"
+CAP_LIGHT = "light"
+CAP_AUX = "aux"
+ALL_CAPABILITIES = [CAP_AUX, CAP_FAN, CAP_LIGHT]
+
+# --- DESIRED STATE RECONCILER ---
+# Keys are enforced in this order: power first, flame only once lit.
+STATE_POWER = "power"
+STATE_FLAME = "flame"
+STATE_AUX = "aux"
+STATE_LIGHT = "light"
+STATE_FAN = "fan"
+STATE_ECO = "eco"
+RECONCILE_ORDER = [STATE_POWER, STATE_FLAME, STATE_AUX, STATE_LIGHT, STATE_FAN, STATE_ECO]
+RECONCILE_BACKOFF_BASE = 30     # Seconds before the first resend
+RECONCILE_BACKOFF_MAX = 900     # Resends are never spaced more than this
+
+# Optimistic values shown while a command is in flight. Polls sent before the
+# command was answered never override them; later polls confirm them, or refute
+# them once the grace period (e.g. flame motor travel) has passed.
+INTENT_GRACE = 20
+INTENT_TTL = 60
+INTENT_BRIGHTNESS_TOLERANCE = 16  # Brightness round trips through the device lose precision
+
+# --- OPTIONS ---
+# Home Assistant temperature sensor driving the thermostat instead of the
+# fireplace's own (poll based, 0.1 degree byte) ambient reading
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
+EXTERNAL_SENSOR_COOLDOWN = 10   # Seconds; sensor changes are coalesced and rate limited
+
+# Other Mertik entries driven together with this one by a group thermostat
+CONF_GROUP_MEMBERS = "group_members"
+GROUP_STEPS_PER_DEGREE = 6      # Flame steps of demand per degree below target, per fireplace
+GROUP_AUX_STEPS = 6             # Flame steps of demand covered by one secondary burner
+
+# Gas consumption estimate
+CONF_BURNER_POWER = "burner_power"        # kW per flame level, pilot first
+CONF_AUX_POWER = "aux_power"              # kW added by the secondary burner
+CONF_CALORIFIC_VALUE = "calorific_value"  # kWh per m³ of gas
+DEFAULT_BURNER_POWER = "0.15, 2.0, 2.4, 2.9, 3.3, 3.8, 4.2, 4.7, 5.1, 5.6, 6.0, 6.5, 7.0"
+DEFAULT_AUX_POWER = 1.5
+DEFAULT_CALORIFIC_VALUE = 10.55
+
+# Publication deadbands ("0.2" absolute or "5%" relative) and intervals in seconds
+CONF_TEMPERATURE_DEADBAND = "temperature_deadband"
+CONF_TEMPERATURE_MIN_INTERVAL = "temperature_min_interval"
+CONF_TEMPERATURE_MAX_INTERVAL = "temperature_max_interval"
+CONF_SIGNAL_DEADBAND = "signal_deadband"
+CONF_SIGNAL_MIN_INTERVAL = "signal_min_interval"
+CONF_SIGNAL_MAX_INTERVAL = "signal_max_interval"
+CONF_STATUS_MIN_INTERVAL = "status_min_interval"
+CONF_STATUS_MAX_INTERVAL = "status_max_interval"
+DEFAULT_TEMPERATURE_DEADBAND = "0.2"
+DEFAULT_TEMPERATURE_MIN_INTERVAL = 60
+DEFAULT_TEMPERATURE_MAX_INTERVAL = 900
+DEFAULT_SIGNAL_DEADBAND = "5"
+DEFAULT_SIGNAL_MIN_INTERVAL = 300
+DEFAULT_SIGNAL_MAX_INTERVAL = 3600
+DEFAULT_STATUS_MIN_INTERVAL = 300
+DEFAULT_STATUS_MAX_INTERVAL = 3600
+
+# Local multiplexing proxy (0 = disabled). An empty host binds the address
+# Home Assistant uses on the LAN.
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_HOST = "proxy_host"
+DEFAULT_PROXY_PORT = 0
+DEFAULT_PROXY_HOST = ""
+PROXY_STATUS_TTL = POLL_INTERVAL + 5  # One poll plus slack, so HA's polling keeps the cache warm
+PROXY_MAX_FRAME = 1024          # Bytes buffered without a frame end before a client is dropped
+PROXY_QUEUE_SIZE = 32           # Pending downstream frames before clients are held back
+
+# MQTT bridge: state under <prefix>/<device>/..., commands on .../<command>/set ("" = disabled)
+CONF_MQTT_PREFIX = "mqtt_prefix"
+DEFAULT_MQTT_PREFIX = ""
+MQTT_MIN_INTERVAL = 1.0         # Seconds between publish batches; changes in between are coalesced
+
+# --- RUNTIME COUNTERS ---
+RUNTIME_STORAGE_VERSION = 1
+RUNTIME_SAVE_DELAY = 60         # Seconds between writes of the persisted totals
+MAX_INTEGRATION_GAP = 120       # Longest interval credited between two snapshots
+
+# --- COMMAND JOURNAL ---
+JOURNAL_STORAGE_VERSION = 1
+JOURNAL_SAVE_DELAY = 1          # Seconds; undelivered commands are written almost at once
+JOURNAL_TTL = 900               # Seconds an undelivered command stays worth replaying
+JOURNAL_IGNITION_TTL = 60       # Lighting the fire much later than asked would surprise whoever is in the room
+
+# --- OPTIMAL START ---
+PREHEAT_STORAGE_VERSION = 1
+PREHEAT_ALPHA = 0.3             # Weight of a new measurement in the learned rates
+PREHEAT_MIN_SEGMENT = 600       # Seconds of constant burner state needed for a measurement
+PREHEAT_MAX_SEGMENT = 1800      # Longer stretches are split into several measurements
+PREHEAT_DEFAULT_HEAT_RATE = 2.0 # °C per hour assumed until a rate was learned
+PREHEAT_DEFAULT_COOL_RATE = 0.5 # °C per hour assumed until a rate was learned
+PREHEAT_MARGIN = 300            # Seconds added for ignition
+
 # --- FLAME HEIGHT LOGIC ---
 # The command structure for flame is: 3136 + [STEP_CODE] + 03
 CMD_FLAME_PREFIX = "3136"
@@ -60,3 +216,4 @@ FLAME_STEPS = [
 # The command structure is: 33304645 + [BRIGHTNESS_CODE] + 03
 CMD_LIGHT_SET_PREFIX = "33304645"
 CMD_LIGHT_SET_SUFFIX = "03"
+LIGHT_TRANSITION_MAX = 60       # Seconds; longer fades are clamped
@@ -0,0 +1,82 @@
+"""Home Assistant free API of the Mertik client.
+
+    from custom_components.mertik.core import Mertik, decode_response
+
+Only the transport, codec and constants are imported up front. The proxy,
+replay tools and counters are loaded on first access.
+"""
+from .const import *  # noqa: F401,F403
+from .codec import (  # noqa: F401
+    FRAME_STATUS_POLL,
+    FRAME_IGNITE,
+    FRAME_SHUTDOWN,
+    FRAME_PILOT_STANDBY,
+    FRAME_AUX_ON,
+    FRAME_AUX_OFF,
+    FRAME_LIGHT_ON,
+    FRAME_LIGHT_OFF,
+    FRAME_FAN_ON,
+    FRAME_FAN_OFF,
+    FRAME_ECO_MODE,
+    FRAME_MANUAL_MODE,
+    FRAME_DATETIME_GET,
+    StatusFrame,
+    LightFrame,
+    SettingsFrame,
+    DateTimeFrame,
+    encode_command,
+    flame_frame,
+    light_brightness_frame,
+    datetime_frame,
+    decode_response,
+    decode_status,
+    decode_light,
+    decode_settings,
+    decode_datetime,
+)
+from .mertik import Mertik  # noqa: F401
+from .rtt import RttEstimator  # noqa: F401
+
+def describe(device):
+    """The state of a ``Mertik`` as plain values, as printed and published."""
+    return {
+        "on": device.is_on,
+        "mode": device.mode,
+        "flame": device.flameHeight,
+        "aux": device.is_aux_on,
+        "igniting": device.is_igniting,
+        "shutting_down": device.is_shutting_down,
+        "guard_flame": device._guard_flame_on,
+        "light": device.is_light_on,
+        "brightness": device.light_brightness,
+        "fan": device._fan_on,
+        "low_battery": device._low_battery,
+        "rf": device._rf_signal_level,
+        "temp": device.ambient_temperature,
+    }
+
+
+# Optional parts: attribute -> submodule, imported on first use
+_LAZY = {
+    "MertikProxy": "proxy",
+    "MertikSimulator": "replay",
+    "load_capture": "replay",
+    "BurnerRuntime": "runtime",
+    "parse_power_table": "runtime",
+    "SnapshotHistory": "history",
+    "HourlyAggregator": "history",
+    "PublishThrottle": "throttle",
+    "parse_deadband": "throttle",
+    "MertikMqttBridge": "mqtt_bridge",
+    "LocalBroker": "mqtt_bridge",
+    "FrameSubscription": "stream",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from importlib import import_module
+        value = getattr(import_module(f".{_LAZY[name]}", __package__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
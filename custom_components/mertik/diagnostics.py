@@ -0,0 +1,52 @@
+"""Diagnostics support for Mertik."""
+import time
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN, CONF_IDENTITY
+
+TO_REDACT = {CONF_HOST, CONF_IDENTITY}
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry, including the raw frame capture."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    m = coordinator.mertik
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "state": {
+            "on": m.is_on,
+            "mode": m.mode,
+            "flame_height": m.flameHeight,
+            "aux_on": m.is_aux_on,
+            "igniting": m.is_igniting,
+            "shutting_down": m.is_shutting_down,
+            "guard_flame_on": m._guard_flame_on,
+            "light_on": m.is_light_on,
+            "light_brightness": m.light_brightness,
+            "fan_on": m._fan_on,
+            "low_battery": m._low_battery,
+            "rf_signal_level": m._rf_signal_level,
+            "ambient_temperature": m.ambient_temperature,
+        },
+        "timing": {
+            "connect": m.connect_rtt.as_dict(),
+            "read": m.read_rtt.as_dict(),
+        },
+        "reconciler": coordinator.reconcile_metrics,
+        "intents": m.intent_metrics,
+        "rediscovery": coordinator.rediscovery,
+        "read_cache_age": m.read_ages(),
+        "journal": {**coordinator.journal.metrics(time.time()), "entries": coordinator.journal.entries},
+        "clock": coordinator.clock,
+        "history": {**coordinator.history_summary, "last_hour": coordinator.history.since(time.time() - 3600)},
+        "preheat": coordinator.preheat_plan,
+        "health": coordinator.health,
+        "publication": {
+            unique_id: throttle.as_dict()
+            for unique_id, throttle in coordinator.publish_throttles.items()
+        },
+        "proxy": coordinator.proxy.stats if coordinator.proxy else None,
+        "mqtt": coordinator.mqtt_bridge.stats if coordinator.mqtt_bridge else None,
+        "frames": m.get_frame_capture(),
+    }
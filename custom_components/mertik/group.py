@@ -0,0 +1,22 @@
+"""Heat demand of a group of fireplaces heating the same room."""
+from .const import GROUP_AUX_STEPS
+
+
+def split_heat_demand(demand, has_aux):
+    """Stage demand (in flame steps) over the fireplaces in order.
+
+    Each burner is filled up to level 12 before the next one is lit; secondary
+    burners only come on once every main burner is at 12. Returns one
+    (flame, aux) pair per fireplace.
+    """
+    plan = []
+    for _ in has_aux:
+        flame = max(0, min(12, demand))
+        demand -= flame
+        plan.append([flame, False])
+    for unit, aux in zip(plan, has_aux):
+        if demand <= 0: break
+        if aux:
+            unit[1] = True
+            demand -= GROUP_AUX_STEPS
+    return [tuple(unit) for unit in plan]
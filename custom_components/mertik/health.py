@@ -0,0 +1,140 @@
+"""Event loop and lock health monitoring.
+
+``LockMonitor`` wraps an ``asyncio.Lock`` and measures how long callers wait
+for it and how long it is held, and which tasks are queued behind it.
+``LoopWatchdog`` ticks on a timer callback (no task of its own), measures how
+late each tick runs (event loop lag) and asks the monitors to report a lock
+held for too long, with the stack of the task holding it.
+"""
+import asyncio
+import io
+import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _task_name(task):
+    if task is None: return "?"
+    coro = task.get_coro()
+    return getattr(coro, "__qualname__", None) or task.get_name()
+
+
+class LockMonitor:
+    def __init__(self, name, lock, slow_threshold):
+        self.name = name
+        self.lock = lock
+        self.slow_threshold = slow_threshold
+        self.acquisitions = 0
+        self.slow_holds = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.waiting = Counter()  # coroutine name -> tasks queued for the lock
+        self._holder = None
+        self._held_since = None
+        self._warned = False
+
+    @asynccontextmanager
+    async def hold(self):
+        task = asyncio.current_task()
+        name = _task_name(task)
+        self.waiting[name] += 1
+        start = time.monotonic()
+        try:
+            await self.lock.acquire()
+        finally:
+            self.waiting[name] -= 1
+            if not self.waiting[name]: del self.waiting[name]
+        acquired = time.monotonic()
+        wait = acquired - start
+        self.acquisitions += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        self._holder, self._held_since, self._warned = task, acquired, False
+        try:
+            yield
+        finally:
+            held = time.monotonic() - acquired
+            self.hold_total += held
+            self.hold_max = max(self.hold_max, held)
+            if held > self.slow_threshold:
+                self.slow_holds += 1
+                if not self._warned:
+                    _LOGGER.warning(f"{self.name} lock was held for {held:.1f}s by {name}")
+            self._holder = self._held_since = None
+            self.lock.release()
+
+    def check(self, now) -> None:
+        """Warn (once per hold) when the lock has been held longer than the threshold."""
+        if self._held_since is None or self._warned: return
+        held = now - self._held_since
+        if held <= self.slow_threshold: return
+        self._warned = True
+        stack = io.StringIO()
+        if self._holder is not None: self._holder.print_stack(limit=20, file=stack)
+        _LOGGER.warning(
+            f"{self.name} lock held for {held:.1f}s by {_task_name(self._holder)}, "
+            f"{sum(self.waiting.values())} task(s) waiting: {dict(self.waiting)}\n{stack.getvalue()}"
+        )
+
+    def as_dict(self) -> dict:
+        held = time.monotonic() - self._held_since if self._held_since is not None else None
+        return {
+            "acquisitions": self.acquisitions,
+            "slow_holds": self.slow_holds,
+            "wait_avg": round(self.wait_total / self.acquisitions, 4) if self.acquisitions else None,
+            "wait_max": round(self.wait_max, 4),
+            "hold_avg": round(self.hold_total / self.acquisitions, 4) if self.acquisitions else None,
+            "hold_max": round(self.hold_max, 4),
+            "held_for": None if held is None else round(held, 2),
+            "holder": _task_name(self._holder) if self._holder is not None else None,
+            "waiting": dict(self.waiting),
+        }
+
+
+class LoopWatchdog:
+    def __init__(self, monitors, interval, lag_threshold):
+        self.monitors = monitors
+        self.interval = interval
+        self.lag_threshold = lag_threshold
+        self.ticks = 0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+        self.slow_ticks = 0
+        self._handle = None
+        self._expected = None
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._expected = loop.time() + self.interval
+        self._handle = loop.call_at(self._expected, self._tick)
+
+    def stop(self) -> None:
+        if self._handle is not None: self._handle.cancel()
+        self._handle = None
+
+    def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        lag = max(0.0, loop.time() - self._expected)
+        self.ticks += 1
+        self.lag_last = lag
+        self.lag_max = max(self.lag_max, lag)
+        if lag > self.lag_threshold:
+            self.slow_ticks += 1
+            _LOGGER.warning(f"Event loop was blocked for {lag:.2f}s")
+        now = time.monotonic()
+        for monitor in self.monitors: monitor.check(now)
+        self._expected = loop.time() + self.interval
+        self._handle = loop.call_at(self._expected, self._tick)
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "lag_last": round(self.lag_last, 4),
+            "lag_max": round(self.lag_max, 4),
+            "slow_ticks": self.slow_ticks,
+        }
@@ -0,0 +1,122 @@
+"""In-memory history of decoded status snapshots.
+
+``SnapshotHistory`` stores one column per field in fixed size ``array``
+buffers (about 16 bytes per snapshot) and overwrites the oldest entries once
+full. ``HourlyAggregator`` folds each snapshot into running figures for the
+current hour and hands back the completed hour when a new one starts, so
+nothing ever needs to scan the buffer.
+"""
+from array import array
+
+# Status flags packed into one column
+FLAG_ON = 0x01
+FLAG_AUX = 0x02
+FLAG_LIGHT = 0x04
+FLAG_FAN = 0x08
+FLAG_IGNITING = 0x10
+FLAG_SHUTTING_DOWN = 0x20
+FLAG_GUARD_FLAME = 0x40
+FLAG_LOW_BATTERY = 0x80
+
+
+def pack_flags(status) -> int:
+    """Flags of a decoded StatusFrame as one byte."""
+    flags = 0
+    if status.lit: flags |= FLAG_ON
+    if status.aux_on: flags |= FLAG_AUX
+    if status.light_on: flags |= FLAG_LIGHT
+    if status.fan_on: flags |= FLAG_FAN
+    if status.igniting: flags |= FLAG_IGNITING
+    if status.shutting_down: flags |= FLAG_SHUTTING_DOWN
+    if status.guard_flame_on: flags |= FLAG_GUARD_FLAME
+    if status.low_battery: flags |= FLAG_LOW_BATTERY
+    return flags
+
+
+class SnapshotHistory:
+    COLUMNS = ("ts", "flame", "temperature", "flags", "rf")
+
+    def __init__(self, size):
+        self.size = size
+        self.ts = array("d", bytes(8 * size))           # Unix time
+        self.flame = array("b", bytes(size))            # Flame level 0 - 12
+        self.temperature = array("f", bytes(4 * size))  # Ambient °C
+        self.flags = array("H", bytes(2 * size))        # FLAG_* bits
+        self.rf = array("B", bytes(size))               # RF signal level
+        self._next = 0
+        self.count = 0
+
+    def __len__(self): return self.count
+
+    def append(self, ts, flame, temperature, flags, rf) -> None:
+        i = self._next
+        self.ts[i] = ts
+        self.flame[i] = flame
+        self.temperature[i] = temperature
+        self.flags[i] = flags
+        self.rf[i] = max(0, min(255, rf))
+        self._next = (i + 1) % self.size
+        if self.count < self.size: self.count += 1
+
+    def column(self, name):
+        """One column as a list, oldest first."""
+        data = getattr(self, name)
+        if self.count < self.size: return data[:self.count].tolist()
+        return data[self._next:].tolist() + data[:self._next].tolist()
+
+    def since(self, ts):
+        """Rows newer than ts as dicts, oldest first."""
+        columns = [self.column(name) for name in self.COLUMNS]
+        return [dict(zip(self.COLUMNS, row)) for row in zip(*columns) if row[0] > ts]
+
+
+class HourlyAggregator:
+    """Mean/min/max of temperature and flame level for the current hour."""
+
+    def __init__(self):
+        self.hour = None
+        self._reset()
+
+    def _reset(self):
+        self.samples = 0
+        self.temp_sum = 0.0
+        self.temp_min = None
+        self.temp_max = None
+        self.flame_sum = 0
+        self.flame_min = None
+        self.flame_max = None
+        self.burning = 0
+
+    def add(self, ts, flame, temperature, on):
+        """Fold in one snapshot; returns the completed previous hour, if one just ended."""
+        hour = int(ts // 3600) * 3600
+        done = None
+        if self.hour is not None and hour != self.hour and self.samples:
+            done = self.as_dict()
+        if hour != self.hour:
+            self.hour = hour
+            self._reset()
+        self.samples += 1
+        self.temp_sum += temperature
+        self.temp_min = temperature if self.temp_min is None else min(self.temp_min, temperature)
+        self.temp_max = temperature if self.temp_max is None else max(self.temp_max, temperature)
+        level = flame if on else 0
+        self.flame_sum += level
+        self.flame_min = level if self.flame_min is None else min(self.flame_min, level)
+        self.flame_max = level if self.flame_max is None else max(self.flame_max, level)
+        if on and flame > 0: self.burning += 1
+        return done
+
+    def as_dict(self) -> dict:
+        if not self.samples: return {"start": self.hour, "samples": 0}
+        return {
+            "start": self.hour,
+            "samples": self.samples,
+            "temperature": {
+                "mean": round(self.temp_sum / self.samples, 2), "min": self.temp_min, "max": self.temp_max,
+            },
+            "flame": {
+                "mean": round(self.flame_sum / self.samples, 2), "min": self.flame_min, "max": self.flame_max,
+            },
+            "burning_ratio": round(self.burning / self.samples, 3),
+        }
@@ -0,0 +1,232 @@
+"""Home Assistant setup for Mertik config entries (loaded lazily by the package)."""
+import logging
+import asyncio
+import time
+from datetime import timedelta
+from homeassistant.components import mqtt, persistent_notification
+from homeassistant.components.network import async_get_source_ip
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.util import dt as dt_util, slugify
+from .const import (
+    DOMAIN,
+    CONF_CAPABILITIES,
+    CONF_IDENTITY,
+    ALL_CAPABILITIES,
+    CAP_FAN,
+    CAP_LIGHT,
+    CONF_PROXY_PORT,
+    CONF_PROXY_HOST,
+    DEFAULT_PROXY_PORT,
+    DEFAULT_PROXY_HOST,
+    CONF_MQTT_PREFIX,
+    DEFAULT_MQTT_PREFIX,
+    PROFILE_DEFAULT_CYCLES,
+    WAIT_DEFAULT_TIMEOUT
+)
+from .mertik import Mertik
+from .codec import WAIT_STATES
+from .mertikdatacoordinator import MertikDataCoordinator
+from .mqtt_bridge import MertikMqttBridge
+from .proxy import MertikProxy
+from .websocket import async_register as async_register_websocket
+
+_LOGGER = logging.getLogger(__name__)
+
+PLATFORMS = ["climate", "number", "switch", "binary_sensor", "sensor"]
+
+# Platforms only set up when the device has the matching option
+CAPABILITY_PLATFORMS = {CAP_FAN: "fan", CAP_LIGHT: "light"}
+
+def _platforms_for(capabilities):
+    return PLATFORMS + [p for cap, p in CAPABILITY_PLATFORMS.items() if cap in capabilities]
+
+def _capabilities_for(entry):
+    """Options chosen by the user, else the ones seen in status frames.
+
+    Entries created before options were observed have no list and keep all.
+    """
+    return set(entry.options.get(CONF_CAPABILITIES, entry.data.get(CONF_CAPABILITIES, ALL_CAPABILITIES)))
+
+async def async_setup(hass: HomeAssistant, config) -> bool:
+    """Register the services and websocket commands once for all entries."""
+    hass.data.setdefault(DOMAIN, {})
+    async_register_websocket(hass)
+
+    # Raw developer command
+    async def handle_send_command(call):
+        cmd = call.data.get("command")
+        coord = _coordinator_for(hass, call)
+        _LOGGER.info(f"Service called: Sending raw command '{cmd}'")
+        await coord.mertik._async_send_command(cmd)
+
+    hass.services.async_register(DOMAIN, "send_command", handle_send_command)
+
+    # Profile N poll cycles of a fireplace
+    async def handle_profile(call):
+        coord = _coordinator_for(hass, call)
+        cycles = int(call.data.get("cycles", PROFILE_DEFAULT_CYCLES))
+        use_cprofile = call.data.get("mode", "cprofile") == "cprofile"
+        path = hass.config.path(f"mertik_profile_{int(time.time())}.{'prof' if use_cprofile else 'json'}")
+        _LOGGER.info(f"Profiling {cycles} poll cycles to {path}")
+        await coord.async_profile(cycles, path, use_cprofile)
+        persistent_notification.async_create(
+            hass, f"Profile of {cycles} poll cycles written to {path}", title="Mertik profile"
+        )
+
+    hass.services.async_register(DOMAIN, "profile", handle_profile)
+
+    # Set the module clock to Home Assistant's local time
+    async def handle_sync_clock(call):
+        coord = _coordinator_for(hass, call)
+        await coord.async_sync_clock(force=True)
+
+    hass.services.async_register(DOMAIN, "sync_clock", handle_sync_clock)
+
+    # Reach a temperature by a given time, igniting as late as the learned model allows
+    async def handle_schedule_comfort(call):
+        coord = _coordinator_for(hass, call)
+        when = dt_util.parse_datetime(str(call.data["at"]))
+        if when is None:
+            at = dt_util.parse_time(str(call.data["at"]))
+            if at is None: raise ValueError(f"Invalid time: {call.data['at']}")
+            when = dt_util.now().replace(hour=at.hour, minute=at.minute, second=at.second, microsecond=0)
+            if when <= dt_util.now(): when += timedelta(days=1)
+        elif when.tzinfo is None:
+            when = when.replace(tzinfo=dt_util.get_default_time_zone())
+        coord.schedule_comfort(call.data["target_temperature"], when.timestamp())
+        _LOGGER.info(f"Comfort {call.data['target_temperature']}°C scheduled for {when}")
+
+    async def handle_cancel_comfort(call):
+        _coordinator_for(hass, call).comfort_schedule = None
+
+    hass.services.async_register(DOMAIN, "schedule_comfort", handle_schedule_comfort)
+    hass.services.async_register(DOMAIN, "cancel_comfort", handle_cancel_comfort)
+
+    # Resume a script as soon as the fireplace reports a state (instead of a fixed delay)
+    async def handle_wait_for_state(call):
+        coord = _coordinator_for(hass, call)
+        state = call.data["state"]
+        if state not in WAIT_STATES: raise ValueError(f"Unknown state: {state}")
+        timeout = float(call.data.get("timeout", WAIT_DEFAULT_TIMEOUT))
+        reached = await coord.async_wait_for(WAIT_STATES[state], timeout)
+        if not reached: _LOGGER.info(f"State '{state}' not reached within {timeout}s")
+        return {"reached": reached}
+
+    hass.services.async_register(
+        DOMAIN, "wait_for_state", handle_wait_for_state, supports_response=SupportsResponse.OPTIONAL
+    )
+
+    return True
+
+def _coordinator_for(hass, call):
+    """Coordinator of the call's entry_id; may be left out while only one fireplace is set up."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("entry_id")
+    if entry_id is None:
+        if len(coordinators) != 1: raise ValueError("entry_id is required when more than one fireplace is set up")
+        return next(iter(coordinators.values()))
+    if entry_id not in coordinators: raise ValueError(f"Unknown or unloaded Mertik entry: {entry_id}")
+    return coordinators[entry_id]
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up Mertik from a config entry."""
+    hass.data.setdefault(DOMAIN, {})
+
+    device_ip = entry.data["host"]
+    mertik_device = Mertik(device_ip)
+
+    coordinator = MertikDataCoordinator(
+        hass, 
+        mertik_device, 
+        entry.entry_id, 
+        entry.data["name"]
+    )
+    
+    # --- SHARED STATE INITIALIZATION ---
+    # We initialize these flags here so they exist for all platforms
+    coordinator.smart_sync_enabled = True
+    coordinator.is_thermostat_active = False  # <--- CRITICAL FIX for Eco Mode
+    coordinator.identity = entry.data.get(CONF_IDENTITY)
+    coordinator.options = dict(entry.options)
+
+    # Restore the runtime counters before the first snapshot is integrated
+    await coordinator.async_setup_runtime(entry.options)
+
+    await coordinator.async_config_entry_first_refresh()
+
+    # --- CAPABILITIES ---
+    # The module has no documented read for its installed options: their
+    # entities appear once a status frame shows them active, or when the
+    # user ticks them in the options.
+    coordinator.capabilities = _capabilities_for(entry)
+    coordinator.platforms = _platforms_for(coordinator.capabilities)
+
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    # --- OPTIONAL LOCAL PROXY ---
+    proxy_port = entry.options.get(CONF_PROXY_PORT, DEFAULT_PROXY_PORT)
+    if proxy_port:
+        # No authentication, so only the chosen address is bound, not every interface
+        proxy_host = entry.options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST) or await async_get_source_ip(hass)
+        proxy = MertikProxy(mertik_device, proxy_port, proxy_host)
+        try:
+            await proxy.async_start()
+            coordinator.proxy = proxy
+        except OSError as e:
+            _LOGGER.error(f"Could not start proxy on {proxy_host}:{proxy_port}: {e}")
+            await proxy.async_stop()
+
+    # --- OPTIONAL MQTT BRIDGE ---
+    mqtt_prefix = entry.options.get(CONF_MQTT_PREFIX, DEFAULT_MQTT_PREFIX).strip("/")
+    if mqtt_prefix:
+        if await mqtt.async_wait_for_mqtt_client(hass):
+            coordinator.mqtt_bridge = _create_mqtt_bridge(hass, coordinator, f"{mqtt_prefix}/{slugify(entry.data['name'])}")
+            await coordinator.mqtt_bridge.async_start()
+            coordinator.mqtt_bridge.update(coordinator.last_update_success)
+        else:
+            _LOGGER.error("MQTT bridge enabled but the MQTT integration is not available")
+
+    coordinator.watchdog.start()
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    return True
+
+def _create_mqtt_bridge(hass, coordinator, base_topic):
+    """MertikMqttBridge wired to Home Assistant's MQTT client."""
+    async def publish(topic, payload, retain):
+        await mqtt.async_publish(hass, topic, payload, qos=0, retain=retain)
+
+    async def subscribe(topic, handler):
+        @callback
+        def message_received(msg): handler(msg.topic, msg.payload)
+        return await mqtt.async_subscribe(hass, topic, message_received)
+
+    return MertikMqttBridge(coordinator, base_topic, publish, subscribe)
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry when its options or optional parts change."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    # A new host or identity is already in use by the running coordinator
+    if coordinator is not None and entry.options == coordinator.options:
+        if _capabilities_for(entry) == coordinator.capabilities: return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    platforms = hass.data[DOMAIN][entry.entry_id].platforms
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator.watchdog.stop()
+        if coordinator.proxy is not None:
+            await coordinator.proxy.async_stop()
+        if coordinator.mqtt_bridge is not None:
+            await coordinator.mqtt_bridge.async_stop()
+        await coordinator.mertik.async_close()
+        await coordinator.async_save_runtime()
+
+    return unload_ok
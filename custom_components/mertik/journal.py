@@ -0,0 +1,125 @@
+"""Journal of commands that could not be delivered to the module.
+
+Each entry names the ``Mertik`` action and its arguments, the actuator it
+drives and when it expires. Entries are kept in order of arrival; ``pending``
+collapses them to the latest one per actuator and sorts them so the burner
+state is replayed before anything that depends on it. ``desired_change``
+turns an entry back into the reconciler state it asked for, so a replay goes
+through the same path as a new request. The journal is a plain list of
+dicts, so it can be stored as is.
+"""
+from .const import (
+    JOURNAL_TTL,
+    JOURNAL_IGNITION_TTL,
+    STATE_POWER,
+    STATE_FLAME,
+    STATE_AUX,
+    STATE_LIGHT,
+    STATE_FAN,
+    STATE_ECO,
+)
+
+# Mertik action -> actuator it drives
+COMMAND_ACTUATORS = {
+    "async_ignite_fireplace": "power",
+    "async_guard_flame_off": "power",
+    "async_standBy": "power",
+    "async_set_flame_height": "flame",
+    "async_aux_on": "aux",
+    "async_aux_off": "aux",
+    "async_light_on": "light",
+    "async_light_off": "light",
+    "async_set_light_brightness": "light",
+    "async_fan_on": "fan",
+    "async_fan_off": "fan",
+    "async_set_eco": "mode",
+    "async_set_manual": "mode",
+}
+
+# Replay order: power first, burner settings next, comfort features last
+REPLAY_ORDER = ["power", "flame", "aux", "light", "fan", "mode"]
+BURNER_ACTUATORS = ("flame", "aux")
+
+# Mertik action -> (reconciler key, value); None takes the value from the first argument
+DESIRED_CHANGES = {
+    "async_ignite_fireplace": (STATE_POWER, True),
+    "async_guard_flame_off": (STATE_POWER, False),
+    "async_standBy": (STATE_FLAME, 0),
+    "async_set_flame_height": (STATE_FLAME, None),
+    "async_aux_on": (STATE_AUX, True),
+    "async_aux_off": (STATE_AUX, False),
+    "async_light_on": (STATE_LIGHT, True),
+    "async_light_off": (STATE_LIGHT, False),
+    "async_set_light_brightness": (STATE_LIGHT, True),
+    "async_fan_on": (STATE_FAN, True),
+    "async_fan_off": (STATE_FAN, False),
+    "async_set_eco": (STATE_ECO, True),
+    "async_set_manual": (STATE_ECO, False),
+}
+
+
+def desired_change(entry):
+    """(reconciler key, value) that replays entry."""
+    key, value = DESIRED_CHANGES[entry["command"]]
+    return key, entry["args"][0] if value is None else value
+
+
+class CommandJournal:
+    def __init__(self, ttl=JOURNAL_TTL, ignition_ttl=JOURNAL_IGNITION_TTL):
+        self.ttl = ttl
+        self.ignition_ttl = ignition_ttl
+        self.entries = []
+        self.stats = {"queued": 0, "replayed": 0, "expired": 0, "collapsed": 0}
+
+    def __len__(self): return len(self.entries)
+
+    def add(self, command, args, now) -> None:
+        ttl = self.ignition_ttl if command == "async_ignite_fireplace" else self.ttl
+        self.entries.append({
+            "actuator": COMMAND_ACTUATORS[command], "command": command, "args": list(args),
+            "queued": now, "expires": now + ttl,
+        })
+        self.stats["queued"] += 1
+
+    def expire(self, now) -> None:
+        kept = [e for e in self.entries if e["expires"] > now]
+        self.stats["expired"] += len(self.entries) - len(kept)
+        self.entries = kept
+
+    def pending(self, now) -> list:
+        """Latest live entry per actuator, in replay order.
+
+        A pending shutdown also drops flame and aux entries, which would only
+        relight the burner.
+        """
+        self.expire(now)
+        latest = {}
+        for entry in self.entries: latest[entry["actuator"]] = entry
+        power = latest.get("power")
+        if power is not None and power["command"] == "async_guard_flame_off":
+            for actuator in BURNER_ACTUATORS: latest.pop(actuator, None)
+        return sorted(latest.values(), key=lambda e: REPLAY_ORDER.index(e["actuator"]))
+
+    def done(self, entry) -> None:
+        """Entry was delivered: drop it and every older entry it made obsolete."""
+        actuators = [entry["actuator"]]
+        if entry["command"] == "async_guard_flame_off": actuators += BURNER_ACTUATORS
+        kept = [e for e in self.entries if e["actuator"] not in actuators or e["queued"] > entry["queued"]]
+        self.stats["collapsed"] += len(self.entries) - len(kept) - 1
+        self.stats["replayed"] += 1
+        self.entries = kept
+
+    def discard(self, actuators) -> None:
+        self.entries = [e for e in self.entries if e["actuator"] not in actuators]
+
+    def metrics(self, now) -> dict:
+        oldest = min((e["queued"] for e in self.entries), default=None)
+        return {
+            **self.stats,
+            "length": len(self.entries),
+            "oldest_age": None if oldest is None else round(now - oldest, 1),
+        }
+
+    def restore(self, data) -> None:
+        if not data: return
+        self.entries = [dict(e) for e in data if e.get("command") in COMMAND_ACTUATORS]
@@ -1,8 +1,8 @@
 import logging
-from homeassistant.components.light import LightEntity, ColorMode
+from homeassistant.components.light import LightEntity, LightEntityFeature, ColorMode
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
-from .const import DOMAIN
+from .const import DOMAIN, STATE_LIGHT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,9 +19,8 @@ class MertikLight(CoordinatorEntity, LightEntity, RestoreEntity):
         self._attr_icon = "mdi:lightbulb"
         self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
         self._attr_color_mode = ColorMode.BRIGHTNESS
+        self._attr_supported_features = LightEntityFeature.TRANSITION
         
-        self._was_available = False
-        self._is_on_local = False
         self._brightness_local = 255  # Default to max brightness
 
     @property
@@ -32,66 +31,32 @@ class MertikLight(CoordinatorEntity, LightEntity, RestoreEntity):
         await super().async_added_to_hass()
         last_state = await self.async_get_last_state()
         if last_state:
-            self._is_on_local = (last_state.state == "on")
             # FIX 1: Check for valid brightness in restore
             if "brightness" in last_state.attributes:
                 restored_b = last_state.attributes["brightness"]
                 if restored_b is not None:
                     self._brightness_local = restored_b
-        
-        self._was_available = self.coordinator.last_update_success
+        self._dataservice.light_brightness_target = self._brightness_local
         self._handle_coordinator_update()
 
     def _handle_coordinator_update(self) -> None:
-        is_available = self.coordinator.last_update_success
-        device_is_on = self._dataservice.is_light_on
         device_brightness = self._dataservice.light_brightness
-        smart_sync = getattr(self._dataservice, "smart_sync_enabled", True)
-
-        if self._was_available and is_available:
-            self._is_on_local = device_is_on
-            # FIX 2: Only update local brightness if device reports a valid value (not None)
-            if device_is_on and device_brightness is not None:
-                self._brightness_local = device_brightness
-        
-        elif not self._was_available and is_available:
-            if smart_sync:
-                _LOGGER.warning(f"Light recovered. Enforcing HA State: {self._is_on_local}")
-            else:
-                _LOGGER.info(f"Light recovered. Smart Sync OFF. Accepting device state: {device_is_on}")
-                self._is_on_local = device_is_on
-                if device_is_on and device_brightness is not None:
-                     self._brightness_local = device_brightness
-
-        self._was_available = is_available
-        self.async_write_ha_state()
-        
-        if smart_sync:
-            self.hass.async_create_task(self._sync_hardware())
-
-    async def _sync_hardware(self):
-        if not self.coordinator.last_update_success: return
-        device_is_on = self._dataservice.is_light_on
-        
-        if self._is_on_local and not device_is_on:
-            # FIX 3: Ensure we never send None to the hardware
-            if self._brightness_local is None:
-                self._brightness_local = 255
-            await self._dataservice.async_set_light_brightness(self._brightness_local)
-        elif not self._is_on_local and device_is_on:
-            await self._dataservice.async_light_off()
+        # FIX 2: Only update local brightness if device reports a valid value (not None),
+        # and not while a brightness change is still pending on the reconciler
+        if (self._dataservice.is_light_on and device_brightness is not None
+                and STATE_LIGHT not in self._dataservice.desired):
+            self._brightness_local = device_brightness
+        super()._handle_coordinator_update()
 
     @property
     def is_on(self):
-        return self._is_on_local
+        return self._dataservice.desired_state(STATE_LIGHT)
 
     @property
     def brightness(self):
         return self._brightness_local
 
     async def async_turn_on(self, **kwargs):
-        self._is_on_local = True
-        
         if "brightness" in kwargs:
             self._brightness_local = kwargs["brightness"]
         
@@ -99,10 +64,18 @@ class MertikLight(CoordinatorEntity, LightEntity, RestoreEntity):
         if self._brightness_local is None:
              self._brightness_local = 255
 
-        await self._dataservice.async_set_light_brightness(self._brightness_local)
+        if kwargs.get("transition"):
+            self._dataservice.start_light_transition(self._brightness_local, kwargs["transition"])
+        else:
+            self._dataservice.cancel_light_transition()
+            self._dataservice.light_brightness_target = self._brightness_local
+            await self._dataservice.async_request(STATE_LIGHT, True)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs):
-        self._is_on_local = False
-        await self._dataservice.async_light_off()
+        if kwargs.get("transition"):
+            self._dataservice.start_light_transition(0, kwargs["transition"])
+        else:
+            self._dataservice.cancel_light_transition()
+            await self._dataservice.async_request(STATE_LIGHT, False)
         self.async_write_ha_state()
@@ -1,39 +1,115 @@
 import logging
 import asyncio
 import socket 
+import time
+from collections import deque
+from datetime import timedelta
+from contextlib import asynccontextmanager
+from typing import NamedTuple, Optional
 from .const import (
     UDP_PORT_DISCOVERY,
     UDP_PORT_TARGET,
     DISCOVERY_PAYLOAD,
-    CMD_PREFIX,
-    RESPONSE_PREFIX_1,
-    RESPONSE_PREFIX_2,
-    CMD_STATUS_POLL,
-    CMD_IGNITE,
-    CMD_SHUTDOWN,
-    CMD_PILOT_STANDBY,
-    CMD_AUX_ON,
-    CMD_AUX_OFF,
-    CMD_LIGHT_ON,
-    CMD_LIGHT_OFF,
-    CMD_FAN_ON,
-    CMD_FAN_OFF,
-    CMD_ECO_MODE,
-    CMD_MANUAL_MODE,
-    CMD_FLAME_PREFIX,
-    CMD_FLAME_SUFFIX,
-    FLAME_STEPS,
-    CMD_LIGHT_SET_PREFIX,
-    CMD_LIGHT_SET_SUFFIX
+    FRAME_CAPTURE_SIZE,
+    SLOW_OPERATION_THRESHOLD,
+    CONNECT_TIMEOUT_FLOOR,
+    READ_TIMEOUT_FLOOR,
+    TIMEOUT_CEILING,
+    INTENT_GRACE,
+    INTENT_TTL,
+    INTENT_BRIGHTNESS_TOLERANCE,
+    CLOCK_CACHE_TTL,
+    READ_TTL_STATUS,
+    READ_TTL_DATETIME
 )
+from .codec import (
+    FRAME_STATUS_POLL,
+    FRAME_IGNITE,
+    FRAME_SHUTDOWN,
+    FRAME_PILOT_STANDBY,
+    FRAME_AUX_ON,
+    FRAME_AUX_OFF,
+    FRAME_LIGHT_ON,
+    FRAME_LIGHT_OFF,
+    FRAME_FAN_ON,
+    FRAME_FAN_OFF,
+    FRAME_ECO_MODE,
+    FRAME_MANUAL_MODE,
+    FRAME_DATETIME_GET,
+    StatusFrame,
+    LightFrame,
+    SettingsFrame,
+    DateTimeFrame,
+    datetime_frame,
+    encode_command,
+    flame_frame,
+    light_brightness_frame,
+    decode_response,
+    decode_status,
+)
+from .health import LockMonitor
+from .rtt import RttEstimator
 
 _LOGGER = logging.getLogger(__name__)
 
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.found = {}
+
+    def datagram_received(self, data, addr):
+        self.found.setdefault(addr[0], data)
+
+# Payloads that can be read back, with their request frame and cache lifetime
+READ_FRAMES = {"status": FRAME_STATUS_POLL, "datetime": FRAME_DATETIME_GET}
+READ_TTL = {"status": READ_TTL_STATUS, "datetime": READ_TTL_DATETIME}
+_REQUEST_KINDS = {frame: kind for kind, frame in READ_FRAMES.items()}
+_FRAME_KINDS = {StatusFrame: "status", SettingsFrame: "settings", DateTimeFrame: "datetime", LightFrame: "light"}
+
+class ReplyTimeout(asyncio.TimeoutError):
+    """A frame went out but its reply did not come in time; the module may have acted on it."""
+
+class Intent(NamedTuple):
+    id: int
+    value: object
+    seq: Optional[int]   # Frame sequence number of the answered command, None while in flight
+    sent_at: float
+    expires: float
+
 class Mertik:
-    def __init__(self, ip, port=2000):
+    def __init__(self, ip, port=2000, capture_size=FRAME_CAPTURE_SIZE):
         self.ip = ip
         self.port = port
         self._lock = asyncio.Lock()
+        self.lock_monitor = LockMonitor("Device", self._lock, SLOW_OPERATION_THRESHOLD)
+        self.failures = 0  # Frames in a row that got no answer
+
+        # Raw traffic capture (fixed size ring buffer of (timestamp, direction, bytes))
+        self._frames = deque(maxlen=capture_size)
+        # Live subscribers, called with (direction, data, decoded frame); see stream.py
+        self.frame_listeners = []
+
+        # Transport: one connection per command, or a persistent session when keep_alive
+        # is set or while a session() block is open
+        self.keep_alive = False
+        self._session_users = 0
+        self._reader = None
+        self._writer = None
+        self.connect_rtt = RttEstimator(CONNECT_TIMEOUT_FLOOR, TIMEOUT_CEILING)
+        self.read_rtt = RttEstimator(READ_TIMEOUT_FLOOR, TIMEOUT_CEILING)
+
+        # Frames sent so far; a reply belongs to the frame numbered _tx_seq
+        self._tx_seq = 0
+
+        # Optimistic intents by attribute name, kept over stale polls
+        self._intents = {}
+        self._intent_id = 0
+        self.intent_stats = {"confirmed": 0, "refuted": 0, "expired": 0, "failed": 0, "superseded": 0}
+
+        # Last raw status reply (used by the proxy to answer polls from cache)
+        self.last_status_response = None
+        self.last_status_time = 0.0
+        # Last decoded frame per payload kind: kind -> (monotonic time, frame)
+        self._read_cache = {}
         
         # State variables
         self.on = False 
@@ -46,6 +122,9 @@ class Mertik:
         self._light_on = False
         self._light_brightness = 0
         self._ambient_temperature = 0.0
+        self.settings = None
+        self.device_clock = None   # Last DateTimeFrame read from (or written to) the module
+        self._clock_read_at = 0.0
         
         # New Feature States
         self._fan_on = False
@@ -75,6 +154,23 @@ class Mertik:
     def get_mode(self): return self.mode
     def get_flame_height(self) -> int: return self.flameHeight
 
+    # --- Frame Capture ---
+    def _record_frame(self, direction, data):
+        self._frames.append((time.time(), direction, bytes(data)))
+        if self.frame_listeners: self._notify(direction, data)
+
+    def _notify(self, direction, data, frame=None):
+        for listener in list(self.frame_listeners):
+            try: listener(direction, data, frame)
+            except Exception as e: _LOGGER.error(f"Frame listener failed: {e}")
+
+    def get_frame_capture(self):
+        """Return the captured frames, oldest first, in a JSON friendly format."""
+        return [
+            {"time": ts, "direction": direction, "data": data.hex()}
+            for ts, direction, data in self._frames
+        ]
+
     # --- Discovery ---
     @staticmethod
     def get_devices():
@@ -92,19 +188,63 @@ class Mertik:
         finally:
             sock.close()
 
+    @staticmethod
+    async def async_discover(timeout=3.0):
+        """Broadcast a discovery request and collect every module answering within timeout."""
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+            _DiscoveryProtocol, local_addr=("0.0.0.0", UDP_PORT_DISCOVERY), allow_broadcast=True
+        )
+        try:
+            transport.sendto(bytes.fromhex(DISCOVERY_PAYLOAD), ("<broadcast>", UDP_PORT_TARGET))
+            await asyncio.sleep(timeout)
+        finally:
+            transport.close()
+        return [{"ip": ip, "response": data.hex()} for ip, data in protocol.found.items()]
+
     # --- Async Actions ---
-    async def async_standBy(self): await self._async_send_command(CMD_PILOT_STANDBY)
-    async def async_aux_on(self): await self._async_send_command(CMD_AUX_ON)
-    async def async_aux_off(self): await self._async_send_command(CMD_AUX_OFF)
-    async def async_ignite_fireplace(self): await self._async_send_command(CMD_IGNITE)
-    async def async_refresh_status(self): await self._async_send_command(CMD_STATUS_POLL)
-    async def async_guard_flame_off(self): await self._async_send_command(CMD_SHUTDOWN)
-    async def async_light_on(self): await self._async_send_command(CMD_LIGHT_ON)
-    async def async_light_off(self): await self._async_send_command(CMD_LIGHT_OFF)
-    async def async_fan_on(self): await self._async_send_command(CMD_FAN_ON)
-    async def async_fan_off(self): await self._async_send_command(CMD_FAN_OFF)
-    async def async_set_eco(self): await self._async_send_command(CMD_ECO_MODE)
-    async def async_set_manual(self): await self._async_send_command(CMD_MANUAL_MODE)
+    async def async_standBy(self): return await self._async_send_frame(FRAME_PILOT_STANDBY)
+    async def async_aux_on(self): return await self._async_send_frame(FRAME_AUX_ON)
+    async def async_aux_off(self): return await self._async_send_frame(FRAME_AUX_OFF)
+    async def async_ignite_fireplace(self): return await self._async_send_frame(FRAME_IGNITE)
+    async def async_refresh_status(self): return await self._async_send_frame(FRAME_STATUS_POLL)
+    async def async_guard_flame_off(self): return await self._async_send_frame(FRAME_SHUTDOWN)
+    async def async_light_on(self): return await self._async_send_frame(FRAME_LIGHT_ON)
+    async def async_light_off(self): return await self._async_send_frame(FRAME_LIGHT_OFF)
+    async def async_fan_on(self): return await self._async_send_frame(FRAME_FAN_ON)
+    async def async_fan_off(self): return await self._async_send_frame(FRAME_FAN_OFF)
+    async def async_set_eco(self): return await self._async_send_frame(FRAME_ECO_MODE)
+    async def async_set_manual(self): return await self._async_send_frame(FRAME_MANUAL_MODE)
+
+    # --- Cached Reads ---
+    async def async_read(self, payloads=("status",), max_age=None) -> dict:
+        """Decoded frames for payloads ("status", "datetime"); None if not answered.
+
+        A payload is only requested again once it is older than its READ_TTL
+        (or max_age[payload]); the stale ones are requested together.
+        """
+        start = time.monotonic()
+        ttl = {**READ_TTL, **(max_age or {})}
+        stale = [p for p in payloads if p not in self._read_cache or start - self._read_cache[p][0] > ttl[p]]
+        if stale:
+            replies = await self._async_send_frames([READ_FRAMES[p] for p in stale])
+            if any(replies):
+                # The module is reachable but did not answer these: do not ask again before their TTL
+                for p, data in zip(stale, replies):
+                    if data is None or self._read_cache.get(p, (0.0,))[0] < start: self._read_cache[p] = (start, None)
+        result = {}
+        for p in payloads:
+            read_at, frame = self._read_cache.get(p, (0.0, None))
+            result[p] = frame if p not in stale or read_at >= start else None
+        return result
+
+    def read_cache(self, kind):
+        """Last decoded frame of a payload kind, however old; None if never read."""
+        return self._read_cache.get(kind, (0.0, None))[1]
+
+    def read_ages(self) -> dict:
+        now = time.monotonic()
+        return {kind: round(now - read_at, 1) for kind, (read_at, _) in self._read_cache.items()}
 
     # --- SAFE STUB ---
     # This ensures calls from fan.py don't crash, but it falls back to basic ON
@@ -113,90 +253,323 @@ class Mertik:
         _LOGGER.warning(f"Speed control not yet supported. Defaulting to Fan ON.")
         await self.async_fan_on()
 
-    async def async_set_light_brightness(self, brightness) -> None:
-        normalized_brightness = (brightness - 1) / 254 * 100
-        if normalized_brightness == 100: device_code = "4642"
-        elif normalized_brightness == 0: device_code = "3633"
-        else:
-            l = 36 + round(normalized_brightness / 100 * 8)
-            if l >= 40: l += 1
-            device_code = f"{l:02d}{l:02d}"
-        msg = f"{CMD_LIGHT_SET_PREFIX}{device_code}{CMD_LIGHT_SET_SUFFIX}"
-        await self._async_send_command(msg)
-
-    async def async_set_flame_height(self, flame_height) -> None:
-        if 0 <= flame_height < len(FLAME_STEPS):
-            l = FLAME_STEPS[flame_height]
-            msg = CMD_FLAME_PREFIX + l + CMD_FLAME_SUFFIX
-            await self._async_send_command(msg)
+    async def async_set_light_brightness(self, brightness):
+        return await self._async_send_frame(light_brightness_frame(brightness))
+
+    async def async_set_flame_height(self, flame_height):
+        frame = flame_frame(flame_height)
+        if frame is not None:
+            return await self._async_send_frame(frame)
+        return None
+
+    # --- Device Clock ---
+    async def async_get_clock(self, max_age=CLOCK_CACHE_TTL):
+        """Device time as a naive datetime, read back at most every max_age seconds; None if unknown."""
+        if self.device_clock is None or time.monotonic() - self._clock_read_at > max_age:
+            self.device_clock = None
+            await self._async_send_frame(FRAME_DATETIME_GET)
+        if self.device_clock is None: return None
+        try:
+            return self.device_clock.as_datetime() + timedelta(seconds=time.monotonic() - self._clock_read_at)
+        except ValueError:
+            return None
+
+    async def async_set_clock(self, when) -> bool:
+        if await self._async_send_frame(datetime_frame(when)) is None: return False
+        self.device_clock = DateTimeFrame(
+            when.year % 100, when.month, when.day, when.isoweekday(), when.hour, when.minute, when.second
+        )
+        self._clock_read_at = time.monotonic()
+        return True
+
+    # --- Optimistic Intents ---
+    def set_intent(self, attr, value) -> int:
+        """Show value for attr right away; returns the intent's sequence number."""
+        now = time.monotonic()
+        if attr in self._intents: self.intent_stats["superseded"] += 1
+        self._intent_id += 1
+        self._intents[attr] = Intent(self._intent_id, value, None, now, now + INTENT_TTL)
+        setattr(self, attr, value)
+        return self._intent_id
+
+    def intent_sent(self, ids, ok) -> None:
+        """Record that the command behind these intents was answered, or failed."""
+        now = time.monotonic()
+        for attr, intent in list(self._intents.items()):
+            if intent.id not in ids: continue
+            if ok:
+                self._intents[attr] = intent._replace(seq=self._tx_seq, sent_at=now)
+            else:
+                del self._intents[attr]
+                self.intent_stats["failed"] += 1
+
+    def has_intent(self, attr) -> bool: return attr in self._intents
+
+    @property
+    def intent_metrics(self) -> dict:
+        now = time.monotonic()
+        return {
+            **self.intent_stats,
+            "unconfirmed": len(self._intents),
+            "pending": {
+                attr: {"value": i.value, "id": i.id, "in_flight": i.seq is None, "age": round(now - i.sent_at, 1)}
+                for attr, i in self._intents.items()
+            },
+        }
+
+    def _overlay_intents(self) -> None:
+        """Resolve intents against a freshly decoded status; unresolved ones win over it."""
+        now = time.monotonic()
+        for attr, intent in list(self._intents.items()):
+            decoded = getattr(self, attr)
+            if now > intent.expires: outcome = "expired"
+            elif intent.seq is None or self._tx_seq <= intent.seq: outcome = None  # Poll predates the answer
+            elif self._intent_matches(attr, decoded, intent.value): outcome = "confirmed"
+            elif now - intent.sent_at > INTENT_GRACE: outcome = "refuted"
+            else: outcome = None
+            if outcome:
+                del self._intents[attr]
+                self.intent_stats[outcome] += 1
+            else:
+                setattr(self, attr, intent.value)
+
+    @staticmethod
+    def _intent_matches(attr, decoded, value) -> bool:
+        if attr == "_light_brightness": return abs(decoded - value) <= INTENT_BRIGHTNESS_TOLERANCE
+        return decoded == value
 
     # --- Core Communication ---
     async def _async_send_command(self, msg):
+        """Send a raw hex command (without prefix), e.g. from the send_command service."""
+        if not isinstance(msg, str): msg = str(msg)
+        await self._async_send_frame(encode_command(msg))
+
+    async def _async_open(self):
+        if self._writer is not None and not self._writer.is_closing(): return
+        future = asyncio.open_connection(self.ip, self.port)
+        start = time.monotonic()
+        try:
+            self._reader, self._writer = await asyncio.wait_for(future, timeout=self.connect_rtt.timeout)
+        except asyncio.TimeoutError:
+            self.connect_rtt.on_timeout()
+            raise
+        self.connect_rtt.sample(time.monotonic() - start)
+
+    async def _async_close(self):
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except Exception: pass
+
+    async def _async_exchange(self, full_payload: bytes) -> bytes:
+        """One request/response on the current session. Caller holds the lock."""
+        if self._writer is not None:
+            try:
+                return await self._async_exchange_once(full_payload)
+            except (OSError, asyncio.TimeoutError, ConnectionError) as e:
+                if not self._may_resend(full_payload, e): raise
+                # The module may have dropped an idle session; reconnect once right away
+                _LOGGER.debug(f"Reused session failed: {repr(e)}")
+                await self._async_close()
+        return await self._async_exchange_once(full_payload)
+
+    async def _async_exchange_once(self, full_payload: bytes) -> bytes:
+        await self._async_open()
+        self._record_frame("tx", full_payload)
+        start = time.monotonic()
+        self._writer.write(full_payload)
+        await self._writer.drain()
+        try:
+            data = await asyncio.wait_for(self._reader.read(1024), timeout=self.read_rtt.timeout)
+        except asyncio.TimeoutError:
+            self.read_rtt.on_timeout()
+            raise ReplyTimeout("No reply") from None
+        if not data: raise ConnectionError("Empty response")
+        self.read_rtt.sample(time.monotonic() - start)
+        self._record_frame("rx", data)
+        return data
+
+    async def _async_exchange_many(self, frames) -> list:
+        """Write all frames at once, then split the replies (STX ... ETX or CR). Caller holds the lock."""
+        await self._async_open()
+        for frame in frames: self._record_frame("tx", frame)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + self.read_rtt.timeout * len(frames)
+        self._writer.write(b"".join(frames))
+        await self._writer.drain()
+        buffer = b""
+        replies = []
+        while len(replies) < len(frames):
+            try:
+                chunk = await asyncio.wait_for(self._reader.read(1024), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+            if not chunk: break
+            buffer += chunk
+            parts = [b"\x02" + part for part in buffer.split(b"\x02")[1:]]
+            # Frames end with ETX; status replies end with CR instead
+            complete = parts[:-1] if parts and not parts[-1].rstrip(b"\n").endswith((b"\x03", b"\r")) else parts
+            for data in complete[len(replies):]: self._record_frame("rx", data)
+            replies = complete
+        if not replies: raise ConnectionError("No response")
+        if len(replies) == len(frames): self.read_rtt.sample((loop.time() - start) / len(frames))
+        return replies
+
+    async def async_close(self):
         async with self._lock:
+            await self._async_close()
+
+    async def async_rebind(self, ip):
+        """Talk to the module at a new address from the next frame on."""
+        async with self._lock:
+            await self._async_close()
+            self.ip = ip
+            self.failures = 0
+
+    @property
+    def _persistent(self) -> bool: return self.keep_alive or self._session_users > 0
+
+    @asynccontextmanager
+    async def session(self):
+        """Keep one connection open for every frame sent inside the block."""
+        self._session_users += 1
+        try:
+            yield self
+        finally:
+            self._session_users -= 1
+            if not self._persistent:
+                async with self._lock:
+                    await self._async_close()
+
+    async def _async_send_frames(self, frames):
+        """Send frames back to back on one connection and return their replies in order.
+
+        If nothing usable came back, the frames are sent again one by one
+        (with the usual retries) until the module stops answering. Once any
+        reply arrived the module is known to be up: frames it left unanswered
+        are skipped (None) rather than retried, and do not count as a failure.
+        """
+        if len(frames) == 1: return [await self._async_send_frame(frames[0])]
+        replies = [None] * len(frames)
+        async with self.lock_monitor.hold():
+            self._tx_seq += 1
+            try:
+                received = await self._async_exchange_many(frames)
+                if not self._persistent: await self._async_close()
+            except (OSError, asyncio.TimeoutError, ConnectionError) as e:
+                _LOGGER.debug(f"Pipelined read failed: {repr(e)}")
+                await self._async_close()
+                received = []
+            for i, data in enumerate(received):
+                try: frame = decode_response(data)
+                except (ValueError, IndexError): frame = None
+                expected = _REQUEST_KINDS.get(frames[i])
+                if frame is None or (expected and _FRAME_KINDS.get(type(frame)) != expected): break
+                replies[i] = data
+            await asyncio.sleep(0.25)
+        alive = any(replies)
+        for i, frame in enumerate(frames):
+            if replies[i] is not None:
+                self.failures = 0
+                if frame == FRAME_STATUS_POLL:
+                    self.last_status_response = replies[i]
+                    self.last_status_time = time.monotonic()
+                self._handle_response(replies[i])
+            elif alive:
+                _LOGGER.debug(f"No reply to {frame!r} in a pipelined read, skipping it")
+            else:
+                replies[i] = await self._async_send_frame(frame)
+                if replies[i] is None: break
+        return replies
+
+    async def _async_send_frame(self, full_payload: bytes):
+        """Send a frame with retries. Returns the raw reply, or None if unreachable."""
+        async with self.lock_monitor.hold():
+            self._tx_seq += 1
             MAX_RETRIES = 3
             RETRY_DELAY = 2.0 
-            if not isinstance(msg, str): msg = str(msg)
-            full_payload = bytearray.fromhex(CMD_PREFIX + msg)
-            process_status_prefixes = (RESPONSE_PREFIX_1, RESPONSE_PREFIX_2)
             last_error = None
             try:
                 for attempt in range(1, MAX_RETRIES + 1):
-                    writer = None
                     try:
-                        future = asyncio.open_connection(self.ip, self.port)
-                        reader, writer = await asyncio.wait_for(future, timeout=10.0)
-                        writer.write(full_payload)
-                        await writer.drain()
-                        data = await asyncio.wait_for(reader.read(1024), timeout=10.0)
-                        if not data: raise ConnectionError("Empty response")
-                        temp_data = data.decode("ascii", errors='ignore')
-                        if len(temp_data) > 0: temp_data = temp_data[1:]
-                        temp_data = temp_data.replace('\r', ';')
-                        if temp_data.startswith(process_status_prefixes):
-                            self._process_status(temp_data)
-                        return 
+                        data = await self._async_exchange(full_payload)
+                        if not self._persistent: await self._async_close()
+                        if full_payload == FRAME_STATUS_POLL:
+                            self.last_status_response = data
+                            self.last_status_time = time.monotonic()
+                        self.failures = 0
+                        self._handle_response(data)
+                        return data
                     except (OSError, asyncio.TimeoutError, ConnectionError) as e:
                         last_error = e
                         _LOGGER.warning(f"Attempt {attempt} failed: {repr(e)}")
-                        if writer:
-                            try:
-                                writer.close()
-                                await writer.wait_closed()
-                            except Exception: pass
+                        await self._async_close()
+                        if not self._may_resend(full_payload, e):
+                            _LOGGER.error(f"No reply to command, not resending it: {repr(e)}")
+                            break
                         if attempt < MAX_RETRIES:
                             sleep_time = RETRY_DELAY * attempt
                             await asyncio.sleep(sleep_time)
                         else:
                             _LOGGER.error(f"Unreachable: {repr(last_error)}")
+                self.failures += 1
+                return None
             finally:
                 await asyncio.sleep(0.25) 
 
+    @staticmethod
+    def _may_resend(full_payload: bytes, error) -> bool:
+        """Whether a frame may be sent again after error.
+
+        Reads always may. A command only may if it never reached the module,
+        so a lost reply does not make an ignition or shutdown happen twice.
+        """
+        return full_payload in _REQUEST_KINDS or not isinstance(error, ReplyTimeout)
+
+    def _handle_response(self, data):
+        try:
+            frame = decode_response(data)
+        except (ValueError, IndexError) as e:
+            _LOGGER.error(f"Error parsing response: {e}")
+            return
+        if isinstance(frame, StatusFrame):
+            self._apply_status(frame)
+        elif isinstance(frame, LightFrame):
+            self._light_on = frame.on
+            self._light_brightness = frame.brightness
+        elif isinstance(frame, SettingsFrame):
+            self.settings = frame
+        elif isinstance(frame, DateTimeFrame):
+            self.device_clock = frame
+            self._clock_read_at = time.monotonic()
+        kind = _FRAME_KINDS.get(type(frame))
+        if kind is not None: self._read_cache[kind] = (time.monotonic(), frame)
+        if self.frame_listeners: self._notify("decoded", data, frame)
+
     def _process_status(self, statusStr):
         try:
-            flameHeightRaw = int("0x" + statusStr[14:16], 0)
-            if flameHeightRaw <= 123:
-                self.flameHeight = 0
-                self.on = False 
-            else:
-                calc_height = round(((flameHeightRaw - 128) / 128) * 12) + 1
-                self.flameHeight = min(12, calc_height)
-                self.on = True
-            self.mode = statusStr[24:25]
-            statusBits = statusStr[16:20]
-            self._shutting_down = self._from_bit_status(statusBits, 7)
-            self._guard_flame_on = self._from_bit_status(statusBits, 8) 
-            self._igniting = self._from_bit_status(statusBits, 11)
-            raw_aux_on = self._from_bit_status(statusBits, 12)
-            self._light_on = self._from_bit_status(statusBits, 13)
-            self._low_battery = self._from_bit_status(statusBits, 9) 
-            self._fan_on = self._from_bit_status(statusBits, 14)       
-            try: self._rf_signal_level = int("0x" + statusStr[12:14], 0)
-            except ValueError: self._rf_signal_level = 0
-            if self.flameHeight == 0: self._aux_on = False
-            else: self._aux_on = raw_aux_on
-            self._light_brightness = round(((int("0x" + statusStr[20:22], 0) - 100) / 151) * 255)
-            if self._light_brightness < 0 or not self._light_on: self._light_brightness = 0
-            raw_temp = int("0x" + statusStr[30:32], 0) / 10
+            self._apply_status(decode_status(statusStr))
+        except (ValueError, IndexError) as e: _LOGGER.error(f"Error parsing status: {e}")
+
+    def _apply_status(self, status: StatusFrame):
+        try:
+            self.on = status.on
+            self.flameHeight = status.flame_height
+            self.mode = status.mode
+            self._shutting_down = status.shutting_down
+            self._guard_flame_on = status.guard_flame_on
+            self._igniting = status.igniting
+            self._aux_on = status.aux_on
+            self._light_on = status.light_on
+            self._light_brightness = status.light_brightness
+            self._low_battery = status.low_battery
+            self._fan_on = status.fan_on
+            self._rf_signal_level = status.rf_signal_level
+            self._overlay_intents()
+            raw_temp = status.raw_temperature
             if self._ambient_temperature == 0.0:
                  if 0.0 < raw_temp < 60.0:
                       self._ambient_temperature = raw_temp
@@ -213,6 +586,3 @@ class Mertik:
                     self._temp_glitch_count = 0
                     self._ambient_temperature = raw_temp
         except Exception as e: _LOGGER.error(f"Error parsing status: {e}")
-
-    def _hex2bin(self, hex_val): return format(int(hex_val, 16), "b").zfill(8)
-    def _from_bit_status(self, hex_val, index): return self._hex2bin(hex_val)[index : index + 1] == "1"
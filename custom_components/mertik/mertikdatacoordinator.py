@@ -1,11 +1,79 @@
 import logging
 import asyncio
+import cProfile
+import json
+import time
+from collections import deque
 from datetime import timedelta
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import CONF_HOST, UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from .const import DOMAIN
+from homeassistant.util import dt as dt_util, slugify
+from .const import (
+    DOMAIN,
+    CONF_CAPABILITIES,
+    CONF_IDENTITY,
+    REDISCOVERY_FAILURES,
+    REDISCOVERY_INTERVAL,
+    REDISCOVERY_TIMEOUT,
+    POLL_INTERVAL,
+    WAIT_POLL_INTERVAL,
+    IGNITION_TIMEOUT,
+    ALL_CAPABILITIES,
+    CAP_FAN,
+    CAP_LIGHT,
+    CAP_AUX,
+    STATE_POWER,
+    STATE_FLAME,
+    STATE_AUX,
+    STATE_LIGHT,
+    STATE_FAN,
+    STATE_ECO,
+    RECONCILE_BACKOFF_BASE,
+    CONF_BURNER_POWER,
+    CONF_AUX_POWER,
+    CONF_CALORIFIC_VALUE,
+    DEFAULT_BURNER_POWER,
+    DEFAULT_AUX_POWER,
+    DEFAULT_CALORIFIC_VALUE,
+    RUNTIME_STORAGE_VERSION,
+    RUNTIME_SAVE_DELAY,
+    LIGHT_TRANSITION_MAX,
+    SLOW_OPERATION_THRESHOLD,
+    WATCHDOG_INTERVAL,
+    LOOP_LAG_THRESHOLD,
+    CLOCK_SYNC_INTERVAL,
+    CLOCK_MAX_DRIFT,
+    HISTORY_SIZE,
+    HISTORY_HOURS_KEPT,
+    PREHEAT_STORAGE_VERSION,
+    JOURNAL_STORAGE_VERSION,
+    JOURNAL_SAVE_DELAY
+)
+from .codec import WAIT_STATES, StatusFrame, light_transition_steps, observed_capabilities
+from .health import LockMonitor, LoopWatchdog
+from .history import HourlyAggregator, SnapshotHistory, pack_flags
+from .journal import BURNER_ACTUATORS, COMMAND_ACTUATORS, CommandJournal, desired_change
+from .preheat import PreheatModel
+from .reconciler import Reconciler
+from .runtime import BurnerRuntime, parse_power_table
+from .scan import find_moved_device
 
 _LOGGER = logging.getLogger(__name__)
 
+# Read on every poll; the date/time comes from the cache most of the time
+POLL_PAYLOADS = ("status", "datetime")
+
+# Device attributes that carry optimistic intents, by reconciler key
+INTENT_ATTRS = {STATE_POWER: "on", STATE_FLAME: "flameHeight", STATE_AUX: "_aux_on", STATE_LIGHT: "_light_on"}
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
 class MertikDataCoordinator(DataUpdateCoordinator):
     """Mertik custom coordinator."""
 
@@ -14,7 +82,7 @@ class MertikDataCoordinator(DataUpdateCoordinator):
             hass,
             _LOGGER,
             name="Mertik",
-            update_interval=timedelta(seconds=15),
+            update_interval=timedelta(seconds=POLL_INTERVAL),
         )
         self.mertik = mertik
         self.entry_id = entry_id
@@ -28,6 +96,79 @@ class MertikDataCoordinator(DataUpdateCoordinator):
         # The Number entity will update this, the Climate entity will read this.
         self.thermostat_deadzone = 0.5
 
+        # Optional hardware present on this unit (set up from the entry options)
+        self.capabilities = set(ALL_CAPABILITIES)
+        self.platforms = []
+
+        # Desired State Reconciler
+        # desired holds what HA wants but the device has not confirmed yet;
+        # entries are dropped once a poll shows the device agrees.
+        self.reconciler = Reconciler(self._actual, self._async_send_desired, self._can_enforce, self._has_pending)
+        self.desired = self.reconciler.desired
+        self.reconcile_stats = self.reconciler.stats
+        self.light_brightness_target = 255
+        self._reconcile_lock = asyncio.Lock()
+        self._reconcile_monitor = LockMonitor("Reconcile", self._reconcile_lock, SLOW_OPERATION_THRESHOLD)
+        self._reconcile_task = None
+        self._fresh_status = False
+
+        # async_wait_for: (predicate, event) per waiter, and the normal poll interval
+        self._waiters = []
+        self._poll_interval = self.update_interval
+        self._was_available = False
+        self._outage_snapshot = None
+
+        # Light fades: bumping the generation stops the running fade at its next step
+        self._light_transition = None
+        self._light_transition_gen = 0
+
+        # Burner runtime / gas counters, persisted per entry
+        self.runtime = BurnerRuntime(
+            parse_power_table(DEFAULT_BURNER_POWER), DEFAULT_AUX_POWER, DEFAULT_CALORIFIC_VALUE
+        )
+        self._runtime_store = Store(hass, RUNTIME_STORAGE_VERSION, f"{DOMAIN}.runtime.{entry_id}")
+
+        # Sensor publication throttles by unique_id (for suppressed-update diagnostics)
+        self.publish_throttles = {}
+
+        # Snapshot history and hourly aggregates (imported as long-term statistics)
+        self.history = SnapshotHistory(HISTORY_SIZE)
+        self.hourly = HourlyAggregator()
+        self.completed_hours = deque(maxlen=HISTORY_HOURS_KEPT)
+        self._last_recorded = 0.0
+        self._last_integrated = 0.0
+
+        # Device clock, checked after the first poll and then daily
+        self._next_clock_sync = 0.0
+        self.clock = {"device_time": None, "drift": None, "last_set": None}
+
+        # Optimal start: learned heating model, persisted per entry. The climate
+        # entity registers itself so the room temperature it uses is learned from.
+        self.preheat = PreheatModel()
+        self._preheat_store = Store(hass, PREHEAT_STORAGE_VERSION, f"{DOMAIN}.preheat.{entry_id}")
+        self.climate = None
+        self.group = None             # Group thermostat currently heating with this fireplace
+        self.comfort_schedule = None  # {"target": °C, "at": Unix time}
+
+        # Identity (discovery response) used to find the module after an address change
+        self.identity = None
+        self._next_discovery = 0.0
+        self.rediscovery = {"broadcasts": 0, "rebinds": 0, "last_rebind": None}
+
+        # Commands the module did not answer, replayed once it is reachable again
+        self.journal = CommandJournal()
+        self._journal_store = Store(hass, JOURNAL_STORAGE_VERSION, f"{DOMAIN}.journal.{entry_id}")
+
+        # Optional local multiplexing proxy (started by __init__)
+        self.proxy = None
+        # Optional MQTT bridge (started by __init__)
+        self.mqtt_bridge = None
+
+        # Lock and event loop health (the watchdog is started by __init__)
+        self.watchdog = LoopWatchdog(
+            [mertik.lock_monitor, self._reconcile_monitor], WATCHDOG_INTERVAL, LOOP_LAG_THRESHOLD
+        )
+
     @property
     def device_info(self):
         return {
@@ -39,15 +180,435 @@ class MertikDataCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         try:
-            await self.mertik.async_refresh_status()
+            reachable = (await self.mertik.async_read(POLL_PAYLOADS, max_age={"status": 0}))["status"] is not None
+            if not reachable and self.mertik.failures >= REDISCOVERY_FAILURES and time.monotonic() >= self._next_discovery:
+                if await self._async_rediscover():
+                    reachable = await self.mertik.async_refresh_status() is not None
+            elif reachable and self.identity is None and time.monotonic() >= self._next_discovery:
+                self.hass.async_create_background_task(self._async_learn_identity(), f"{DOMAIN} identify {self.entry_id}")
+            if reachable and self.journal.entries: self._replay_journal()
 
             if self.mertik.is_on and self.mertik.get_flame_height() == 0:
                 self.keep_pilot_on = True
+
+            self._check_observed_capabilities()
+            if reachable: self._update_runtime()
+            else: self.runtime.reset_baseline()
+            self._record_history()
+            self._update_preheat()
+            self._fresh_status = True
+
+            if time.monotonic() >= self._next_clock_sync:
+                self._next_clock_sync = time.monotonic() + CLOCK_SYNC_INTERVAL
+                await self.async_sync_clock()
             
             return self.mertik
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
 
+    def _check_observed_capabilities(self):
+        """Add an optional part as soon as a status frame reports it active."""
+        status = self.mertik.read_cache("status")
+        if status is None: return
+        missing = observed_capabilities(status) - self.capabilities
+        if not missing: return
+        entry = self.hass.config_entries.async_get_entry(self.entry_id)
+        if entry is None: return
+        _LOGGER.info(f"Device reported options {sorted(missing)} active. Adding their entities.")
+        self.capabilities |= missing
+        # The entry's update listener reloads it with the new platforms
+        if CONF_CAPABILITIES in entry.options:
+            self.hass.config_entries.async_update_entry(
+                entry, options={**entry.options, CONF_CAPABILITIES: sorted(self.capabilities)}
+            )
+        else:
+            self._update_entry(**{CONF_CAPABILITIES: sorted(self.capabilities)})
+
+    # --- Runtime Counters ---
+    async def async_setup_runtime(self, options) -> None:
+        """Apply the consumption options and restore the persisted totals."""
+        try:
+            table = parse_power_table(options.get(CONF_BURNER_POWER, DEFAULT_BURNER_POWER))
+        except ValueError as e:
+            _LOGGER.warning(f"Invalid burner power table, using defaults: {e}")
+            table = parse_power_table(DEFAULT_BURNER_POWER)
+        self.runtime.power_table = table
+        self.runtime.aux_power = float(options.get(CONF_AUX_POWER, DEFAULT_AUX_POWER))
+        self.runtime.calorific_value = float(options.get(CONF_CALORIFIC_VALUE, DEFAULT_CALORIFIC_VALUE))
+        self.runtime.restore(await self._runtime_store.async_load())
+        self.preheat.restore(await self._preheat_store.async_load())
+        self.journal.restore(await self._journal_store.async_load())
+
+    def _update_runtime(self) -> None:
+        # Decoded replies only, not unconfirmed commands; a failed poll resets the baseline instead
+        status = self.mertik.read_cache("status")
+        if status is None or self.mertik.last_status_time == self._last_integrated: return
+        self._last_integrated = self.mertik.last_status_time
+        self.runtime.update(time.time(), status.lit, status.flame_height, status.aux_on)
+        self._runtime_store.async_delay_save(self.runtime.as_dict, RUNTIME_SAVE_DELAY)
+
+    async def async_save_runtime(self) -> None:
+        await self._runtime_store.async_save(self.runtime.as_dict())
+        await self._preheat_store.async_save(self.preheat.as_dict())
+        await self._journal_store.async_save(self.journal.entries)
+
+    # --- Waiting for States ---
+    async def async_wait_for(self, predicate, timeout) -> bool:
+        """Wait until predicate(StatusFrame) holds; False if timeout seconds pass first.
+
+        Judged on the statuses the device reports (polls and command replies),
+        not on optimistic values. Polls are faster while anyone waits.
+        """
+        last = self.mertik.read_cache("status")
+        if last is not None and predicate(last): return True
+        waiter = (predicate, asyncio.Event())
+        if not self._waiters:
+            self.mertik.frame_listeners.append(self._on_status_frame)
+            self.update_interval = timedelta(seconds=WAIT_POLL_INTERVAL)
+            self.hass.async_create_task(self.async_request_refresh())
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiters.remove(waiter)
+            if not self._waiters:
+                self.mertik.frame_listeners.remove(self._on_status_frame)
+                self.update_interval = self._poll_interval
+
+    def _on_status_frame(self, direction, data, frame) -> None:
+        if not isinstance(frame, StatusFrame): return
+        for predicate, event in self._waiters:
+            if predicate(frame): event.set()
+
+    # --- Rediscovery ---
+    async def _async_discover(self):
+        self._next_discovery = time.monotonic() + REDISCOVERY_INTERVAL
+        self.rediscovery["broadcasts"] += 1
+        try:
+            return await self.mertik.async_discover(REDISCOVERY_TIMEOUT)
+        except OSError as e:
+            # The discovery port is taken, e.g. by another entry broadcasting
+            _LOGGER.debug(f"Discovery failed: {e}")
+            return []
+
+    def _update_entry(self, **data) -> None:
+        entry = self.hass.config_entries.async_get_entry(self.entry_id)
+        if entry is None: return
+        # The unique ID follows the host, so the module cannot be added again at its new address
+        unique_id = data.get(CONF_HOST, entry.unique_id)
+        self.hass.config_entries.async_update_entry(entry, data={**entry.data, **data}, unique_id=unique_id)
+
+    async def _async_learn_identity(self) -> None:
+        """Remember the discovery response of the module at the configured address."""
+        for device in await self._async_discover():
+            if device["ip"] == self.mertik.ip:
+                self.identity = device["response"]
+                self._update_entry(**{CONF_IDENTITY: self.identity})
+                return
+
+    def _find_moved_device(self, found):
+        claimed = {c.mertik.ip for c in self.hass.data.get(DOMAIN, {}).values()}
+        return find_moved_device(found, self.identity, claimed)
+
+    async def _async_rediscover(self) -> bool:
+        """Look for the module on the network; rebind if it answers at a new address."""
+        found = await self._async_discover()
+        ip = self._find_moved_device(found)
+        if ip is None or ip == self.mertik.ip: return False
+        old = self.mertik.ip
+        _LOGGER.warning(f"Device not answering at {old} but found at {ip}. Switching to the new address.")
+        await self.mertik.async_rebind(ip)
+        self.rediscovery["rebinds"] += 1
+        self.rediscovery["last_rebind"] = dt_util.utcnow().isoformat()
+        if self.identity is None:
+            self.identity = next(d["response"] for d in found if d["ip"] == ip)
+        self._update_entry(**{CONF_HOST: ip, CONF_IDENTITY: self.identity})
+        return True
+
+    # --- Command Journal ---
+    async def _async_send(self, command, *args):
+        """Run a Mertik action; if the module does not answer, journal it for replay."""
+        result = await getattr(self.mertik, command)(*args)
+        if result is None:
+            _LOGGER.warning(f"{command}{tuple(args)} not delivered. Queued for replay when the device is back.")
+            self.journal.add(command, args, time.time())
+            self._save_journal()
+        elif self.journal.entries:
+            # Delivered now: older undelivered commands for the same actuator are obsolete
+            self.journal.discard([COMMAND_ACTUATORS[command]])
+            self._save_journal()
+        return result
+
+    def _replay_journal(self) -> None:
+        """Hand the latest undelivered command per actuator back to the reconciler.
+
+        The reconcile pass after this poll sends them, in its usual order and
+        with its usual checks; a send that fails again is journaled again.
+        """
+        pending = self.journal.pending(time.time())
+        relight = any(desired_change(e) == (STATE_POWER, True) for e in pending)
+        for entry in pending:
+            # Flame and aux only make sense once the burner is (being) lit
+            if entry["actuator"] in BURNER_ACTUATORS and not (self.mertik.is_on or relight): continue
+            key, value = desired_change(entry)
+            if entry["command"] == "async_set_light_brightness": self.light_brightness_target = entry["args"][0]
+            self.set_desired(key, value)
+            _LOGGER.info(f"Replaying {key}={value} queued {time.time() - entry['queued']:.0f}s ago.")
+            self.journal.done(entry)
+        self._save_journal()
+
+    def _save_journal(self) -> None:
+        self._journal_store.async_delay_save(lambda: self.journal.entries, JOURNAL_SAVE_DELAY)
+
+    # --- Optimal Start ---
+    @property
+    def room_temperature(self) -> float:
+        if self.climate is not None and self.climate.current_temperature: return self.climate.current_temperature
+        return self.mertik.ambient_temperature
+
+    def _update_preheat(self) -> None:
+        temperature = self.room_temperature
+        status = self.mertik.read_cache("status")
+        now = time.time()
+        if temperature and status is not None:
+            # Learn from what the device reports, not from commands it may not have taken
+            self.preheat.update(now, temperature, status.lit, status.flame_height)
+            self._preheat_store.async_delay_save(self.preheat.as_dict, RUNTIME_SAVE_DELAY)
+        schedule = self.comfort_schedule
+        action = self.preheat.schedule_action(now, temperature, schedule)
+        if action == "expire":
+            _LOGGER.warning(f"Comfort time {dt_util.utc_from_timestamp(schedule['at'])} passed before heating started. Dropping the schedule.")
+            self.comfort_schedule = None
+        elif action == "start" and self.climate is not None:
+            _LOGGER.info(f"Optimal start: heating to {schedule['target']}°C for {dt_util.utc_from_timestamp(schedule['at'])}")
+            self.comfort_schedule = None
+            self.hass.async_create_task(self.climate.async_start_comfort(schedule["target"]))
+
+    def schedule_comfort(self, target, at) -> None:
+        """Reach target (°C) by at (Unix time), igniting as late as the learned model allows."""
+        self.comfort_schedule = {"target": float(target), "at": float(at)}
+
+    @property
+    def comfort_plan(self):
+        """The pending comfort schedule with its currently planned start, or None."""
+        schedule, temperature = self.comfort_schedule, self.room_temperature
+        if schedule is None or not temperature or time.time() >= schedule["at"]: return None
+        start = self.preheat.plan(time.time(), temperature, schedule["target"], schedule["at"])
+        return {
+            "target": schedule["target"],
+            "at": dt_util.utc_from_timestamp(schedule["at"]).isoformat(),
+            "start": dt_util.utc_from_timestamp(start).isoformat(),
+        }
+
+    @property
+    def preheat_plan(self) -> dict:
+        return {**self.preheat.as_dict(), "schedule": self.comfort_plan}
+
+    # --- History ---
+    def _record_history(self) -> None:
+        m = self.mertik
+        status = m.read_cache("status")
+        # Only new decoded replies, and only once the ambient temperature is known
+        if status is None or m.last_status_time == self._last_recorded or not m.ambient_temperature: return
+        self._last_recorded = m.last_status_time
+        now = time.time()
+        flame = status.flame_height if status.lit else 0
+        self.history.append(now, flame, m.ambient_temperature, pack_flags(status), status.rf_signal_level)
+        done = self.hourly.add(now, flame, m.ambient_temperature, status.lit)
+        if done is not None:
+            self.completed_hours.append(done)
+            self._import_statistics(done)
+
+    def _import_statistics(self, hour) -> None:
+        if "recorder" not in self.hass.config.components: return
+        start = dt_util.utc_from_timestamp(hour["start"])
+        for key, name, unit in (
+            ("temperature", "Ambient temperature", UnitOfTemperature.CELSIUS),
+            ("flame", "Flame level", None),
+        ):
+            values = hour[key]
+            metadata = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=f"{self.device_name} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(self.entry_id)}_{key}",
+                unit_of_measurement=unit,
+            )
+            statistic = StatisticData(start=start, mean=values["mean"], min=values["min"], max=values["max"])
+            async_add_external_statistics(self.hass, metadata, [statistic])
+
+    @property
+    def history_summary(self) -> dict:
+        return {
+            "snapshots": len(self.history),
+            "size": self.history.size,
+            "current_hour": self.hourly.as_dict(),
+            "hours": list(self.completed_hours),
+        }
+
+    # --- Device Clock ---
+    async def async_sync_clock(self, force=False) -> None:
+        """Set the module clock to local time when it drifted (or always, if forced)."""
+        local = dt_util.now().replace(tzinfo=None, microsecond=0)
+        # Reuses the date/time the poll read moments before, if any
+        device = await self.mertik.async_get_clock()
+        if device is None:
+            _LOGGER.debug("Device clock not readable.")
+        else:
+            self.clock["device_time"] = device.isoformat()
+            self.clock["drift"] = round((device - local).total_seconds())
+        if force or (device is not None and abs(self.clock["drift"]) > CLOCK_MAX_DRIFT):
+            _LOGGER.info(f"Setting device clock to {local} (drift {self.clock['drift']}s)")
+            if await self.mertik.async_set_clock(local):
+                self.clock.update(device_time=local.isoformat(), drift=0, last_set=local.isoformat())
+
+    # --- Health & Profiling ---
+    @property
+    def health(self) -> dict:
+        return {
+            "loop": self.watchdog.as_dict(),
+            "device_lock": self.mertik.lock_monitor.as_dict(),
+            "reconcile_lock": self._reconcile_monitor.as_dict(),
+            "reconcile_running": self._reconcile_task is not None and not self._reconcile_task.done(),
+            "light_transition_running": self.light_transition_running,
+        }
+
+    async def async_profile(self, cycles, path, use_cprofile) -> None:
+        """Force cycles poll cycles and write a cProfile dump, or a JSON timing trace, to path."""
+        lock = self.mertik.lock_monitor
+        profiler = cProfile.Profile() if use_cprofile else None
+        trace = []
+        if profiler: profiler.enable()
+        try:
+            for cycle in range(cycles):
+                before = (lock.acquisitions, lock.wait_total, lock.hold_total)
+                started = time.monotonic()
+                await self.async_refresh()
+                trace.append({
+                    "cycle": cycle,
+                    "duration": round(time.monotonic() - started, 4),
+                    "success": self.last_update_success,
+                    "frames": lock.acquisitions - before[0],
+                    "lock_wait": round(lock.wait_total - before[1], 4),
+                    "lock_hold": round(lock.hold_total - before[2], 4),
+                    "loop_lag_max": round(self.watchdog.lag_max, 4),
+                })
+        finally:
+            if profiler: profiler.disable()
+        if profiler: await self.hass.async_add_executor_job(profiler.dump_stats, path)
+        else: await self.hass.async_add_executor_job(_write_json, path, trace)
+
+    # --- Desired State Reconciler ---
+    def _actual(self, key):
+        if key == STATE_POWER: return self.is_on
+        if key == STATE_FLAME: return self.mertik.get_flame_height()
+        if key == STATE_AUX: return self.mertik.is_aux_on
+        if key == STATE_LIGHT: return self.mertik.is_light_on
+        if key == STATE_FAN: return self.mertik._fan_on
+        if key == STATE_ECO: return self.mertik.mode == "2"
+        return None
+
+    @property
+    def smart_sync_enabled(self) -> bool:
+        return self.reconciler.smart_sync_enabled
+
+    @smart_sync_enabled.setter
+    def smart_sync_enabled(self, value: bool) -> None:
+        self.reconciler.smart_sync_enabled = value
+
+    def desired_state(self, key):
+        """State shown to HA: the pending desired value, else what the device reports."""
+        return self.reconciler.desired_state(key)
+
+    def set_desired(self, key, value) -> None:
+        """Record a wish without sending anything; the next reconcile pass enforces it."""
+        self.reconciler.set_desired(key, value)
+
+    def clear_desired(self, *keys) -> None:
+        self.reconciler.clear_desired(*keys)
+
+    async def async_request(self, key, value) -> None:
+        """Explicit user request: record it and send the command right away."""
+        async with self._reconcile_monitor.hold():
+            await self.reconciler.async_request(key, value)
+
+    async def async_reconcile(self) -> None:
+        """Run one reconcile pass now."""
+        async with self._reconcile_monitor.hold():
+            await self.reconciler.async_reconcile()
+
+    def _has_pending(self, key) -> bool:
+        return self.mertik.has_intent(INTENT_ATTRS.get(key))
+
+    def _can_enforce(self, key) -> bool:
+        m = self.mertik
+        if key == STATE_POWER:
+            # Let a running ignition or shutdown cycle finish first
+            return not (m.is_igniting or m.is_shutting_down)
+        if key in (STATE_FLAME, STATE_AUX):
+            return self.is_on and not m.is_igniting and self.desired.get(STATE_POWER, True)
+        if key == STATE_LIGHT: return not self.light_transition_running
+        return True
+
+    async def _async_send_desired(self, key, value) -> None:
+        if key == STATE_POWER:
+            if value: await self.async_ignite_fireplace()
+            else: await self.async_guard_flame_off()
+        elif key == STATE_FLAME: await self.async_set_flame_height(value)
+        elif key == STATE_AUX:
+            if value: await self.async_aux_on()
+            else: await self.async_aux_off()
+        elif key == STATE_LIGHT:
+            if value: await self.async_set_light_brightness(self.light_brightness_target or 255)
+            else: await self.async_light_off()
+        elif key == STATE_FAN:
+            if value: await self._async_send("async_fan_on")
+            else: await self._async_send("async_fan_off")
+        elif key == STATE_ECO:
+            if value: await self._async_send("async_set_eco")
+            else: await self._async_send("async_set_manual")
+
+    @property
+    def reconcile_metrics(self) -> dict:
+        return self.reconciler.metrics
+
+    def _snapshot_state(self) -> dict:
+        keys = [STATE_POWER, STATE_ECO]
+        if CAP_AUX in self.capabilities: keys.append(STATE_AUX)
+        if CAP_LIGHT in self.capabilities: keys.append(STATE_LIGHT)
+        if CAP_FAN in self.capabilities: keys.append(STATE_FAN)
+        return {key: self.desired_state(key) for key in keys}
+
+    def _track_availability(self) -> None:
+        is_available = self.last_update_success
+        if self._was_available and not is_available:
+            self._outage_snapshot = self._snapshot_state()
+        elif not self._was_available and is_available and self._outage_snapshot is not None:
+            if self.smart_sync_enabled:
+                _LOGGER.warning(f"Device recovered. Enforcing HA State: {self._outage_snapshot}")
+                for key, value in self._outage_snapshot.items(): self.set_desired(key, value)
+            else:
+                _LOGGER.info("Device recovered. Accepting device state.")
+                self.reconciler.clear()
+            self._outage_snapshot = None
+        self._was_available = is_available
+
+    @callback
+    def async_update_listeners(self) -> None:
+        self._track_availability()
+        super().async_update_listeners()
+        if self.mqtt_bridge is not None: self.mqtt_bridge.update(self.last_update_success)
+        # Entities (e.g. the thermostat) have now stated their demand for this
+        # poll; one reconcile pass per fresh status enforces all of it.
+        if self._fresh_status and self.last_update_success:
+            self._fresh_status = False
+            if self._reconcile_task is None or self._reconcile_task.done():
+                self._reconcile_task = self.hass.async_create_task(self.async_reconcile())
+
     # --- Properties ---
     @property
     def is_on(self) -> bool:
@@ -84,14 +645,15 @@ class MertikDataCoordinator(DataUpdateCoordinator):
         if enable:
             if not self.mertik.is_on:
                 _LOGGER.info("Pilot Switch ON: Sending Ignite Signal.")
-                await self.mertik.async_ignite_fireplace()
+                await self._async_send("async_ignite_fireplace")
                 
-                # Wait 40s to ensure motor is finished moving
-                _LOGGER.info("Waiting 40s for hardware ignition cycle...")
-                await asyncio.sleep(40)
+                # Wait until the device reports the ignition cycle done (motor finished moving)
+                _LOGGER.info("Waiting for hardware ignition cycle...")
+                if not await self.async_wait_for(WAIT_STATES["ignited"], IGNITION_TIMEOUT):
+                    _LOGGER.warning(f"Ignition not reported done after {IGNITION_TIMEOUT}s. Dropping to pilot anyway.")
                 
                 _LOGGER.info("Dropping flame to Pilot (Level 0).")
-                await self.mertik.async_set_flame_height(0)
+                await self._async_send("async_set_flame_height", 0)
                 
             else:
                 _LOGGER.info("Fire is already ON. Updating Pilot Preference to TRUE.")
@@ -101,57 +663,106 @@ class MertikDataCoordinator(DataUpdateCoordinator):
                 _LOGGER.info("Fire is HEATING. Updating Pilot Preference to FALSE.")
             else:
                 _LOGGER.info("Fire is at PILOT/OFF. Shutting down.")
-                await self.mertik.async_guard_flame_off()
+                await self._async_send("async_guard_flame_off")
         
     async def async_ignite_fireplace(self):
-        await self.mertik.async_ignite_fireplace()
+        await self._async_send("async_ignite_fireplace")
 
     async def async_guard_flame_off(self):
-        await self.mertik.async_guard_flame_off()
-        
         # Local State Reset
         self.keep_pilot_on = False
-        self.mertik.on = False
-        self.mertik._light_on = False
-        self.mertik._aux_on = False
-        self.mertik.flameHeight = 0
-        
-        self.async_update_listeners()
+        await self._async_optimistic(
+            {"on": False, "_light_on": False, "_aux_on": False, "flameHeight": 0}, "async_guard_flame_off"
+        )
 
     async def async_set_flame_height(self, flame_height) -> None:
         if flame_height == 0 and self.mertik.is_aux_on:
             _LOGGER.info("Flame set to 0 (Pilot). Auto-turning OFF Secondary Burner.")
-            self.mertik._aux_on = False 
-            await self.mertik.async_aux_off() 
+            await self._async_optimistic({"_aux_on": False}, "async_aux_off")
             await asyncio.sleep(0.5)
 
-        self.mertik.flameHeight = flame_height
-        self.async_update_listeners()
-        await self.mertik.async_set_flame_height(flame_height)
+        await self._async_optimistic({"flameHeight": flame_height}, "async_set_flame_height", flame_height)
 
     # --- GENTLE MODE COMMANDS ---
-    
-    async def async_aux_on(self):
-        self.mertik._aux_on = True 
+    # Values are shown right away as intents; polls that were already in flight
+    # cannot flip them back (see Mertik.set_intent).
+
+    async def _async_optimistic(self, values, command, *args) -> bool:
+        """Show values as intents, send the command and settle the intents; True if delivered."""
+        ids = [self.mertik.set_intent(attr, value) for attr, value in values.items()]
         self.async_update_listeners()
-        await self.mertik.async_aux_on()
+        delivered = await self._async_send(command, *args) is not None
+        self.mertik.intent_sent(ids, delivered)
+        return delivered
+
+    async def async_aux_on(self):
+        await self._async_optimistic({"_aux_on": True}, "async_aux_on")
 
     async def async_aux_off(self):
-        self.mertik._aux_on = False
-        self.async_update_listeners()
-        await self.mertik.async_aux_off()
+        await self._async_optimistic({"_aux_on": False}, "async_aux_off")
 
     async def async_light_on(self):
-        self.mertik._light_on = True
-        self.async_update_listeners()
-        await self.mertik.async_light_on()
+        await self._async_optimistic({"_light_on": True}, "async_light_on")
 
     async def async_light_off(self):
-        self.mertik._light_on = False
-        self.async_update_listeners()
-        await self.mertik.async_light_off()
+        await self._async_optimistic({"_light_on": False}, "async_light_off")
 
-    async def async_set_light_brightness(self, brightness) -> None:
-        self.mertik._light_brightness = brightness
-        self.async_update_listeners()
-        await self.mertik.async_set_light_brightness(brightness)
+    async def async_set_light_brightness(self, brightness) -> bool:
+        # The brightness frame also switches the light on
+        return await self._async_optimistic(
+            {"_light_brightness": brightness, "_light_on": True}, "async_set_light_brightness", brightness
+        )
+
+    # --- Light Transitions ---
+    @property
+    def light_transition_running(self) -> bool:
+        return self._light_transition is not None and not self._light_transition.done()
+
+    def cancel_light_transition(self) -> None:
+        self._light_transition_gen += 1
+
+    def start_light_transition(self, target: int, duration: float) -> None:
+        """Fade the light to target brightness (0 = off) over duration seconds.
+
+        A running fade is superseded and the new one continues from wherever
+        it got to. The desired light state is recorded up front so HA shows
+        the target straight away.
+        """
+        self.cancel_light_transition()
+        if target: self.light_brightness_target = target
+        self.desired[STATE_LIGHT] = bool(target)
+        self.reconciler.backoff.pop(STATE_LIGHT, None)
+        self._light_transition = self.hass.async_create_task(self._async_run_light_transition(
+            self._light_transition, self._light_transition_gen, target, min(duration, LIGHT_TRANSITION_MAX)
+        ))
+
+    async def _async_run_light_transition(self, previous, gen, target, duration) -> None:
+        # Let the superseded fade finish its in-flight frame, so frames never interleave
+        if previous is not None: await asyncio.wait([previous])
+        if gen != self._light_transition_gen: return
+        start = self.mertik.light_brightness if self.mertik.is_light_on else 0
+        steps = light_transition_steps(start, max(target, 1))
+        spacing = duration / (len(steps) - 1) if len(steps) > 1 else 0.0
+        began = time.monotonic()
+        index = 0
+        async with self.mertik.session():
+            while index < len(steps) and gen == self._light_transition_gen:
+                # Fall forward to the latest due step when the link is slower than the fade
+                if spacing: index = max(index, min(len(steps) - 1, int((time.monotonic() - began) / spacing)))
+                brightness, _ = steps[index]
+                if not await self.async_set_light_brightness(brightness):
+                    # The failed step was journaled; replay where the fade was going instead
+                    if target: self.journal.add("async_set_light_brightness", [target], time.time())
+                    else: self.journal.add("async_light_off", [], time.time())
+                    self._save_journal()
+                    break
+                index += 1
+                if index < len(steps):
+                    delay = began + index * spacing - time.monotonic()
+                    if delay > 0: await asyncio.sleep(delay)
+            else:
+                if not target and gen == self._light_transition_gen: await self.async_light_off()
+        if gen == self._light_transition_gen:
+            # Leave the final check to the reconciler after the next poll
+            self.reconciler.defer(STATE_LIGHT, RECONCILE_BACKOFF_BASE)
+            self.async_update_listeners()
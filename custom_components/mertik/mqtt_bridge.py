@@ -0,0 +1,203 @@
+"""MQTT bridge for a Mertik fireplace.
+
+Publishes the decoded state as one retained topic per field, only for fields
+that changed, and turns command topics into requests on the coordinator, so
+they go through the same reconciler, optimistic state and command journal as
+the entities:
+
+    <base>/available          online | offline
+    <base>/<field>            ON | OFF, or a number / text
+    <base>/<command>/set      see COMMANDS
+
+Changes are not queued: they overwrite the pending value of their field and a
+single worker publishes whatever is pending, then waits ``min_interval``
+before the next batch. A burst of snapshots therefore costs at most one
+message per field per interval, however slow the broker is.
+
+The MQTT client is injected as two coroutines, ``publish(topic, payload,
+retain)`` and ``subscribe(topic, callback) -> unsubscribe``, so the bridge runs
+against Home Assistant's MQTT integration or against ``LocalBroker``.
+"""
+import asyncio
+import logging
+
+from .const import MQTT_MIN_INTERVAL, STATE_POWER, STATE_FLAME, STATE_AUX, STATE_LIGHT, STATE_FAN, STATE_ECO
+from .core import describe
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _on_off(payload) -> bool:
+    value = payload.strip().upper()
+    if value in ("ON", "1", "TRUE"): return True
+    if value in ("OFF", "0", "FALSE"): return False
+    raise ValueError(f"Expected ON or OFF, got {payload!r}")
+
+
+async def _power(c, payload):
+    await c.async_request(STATE_POWER, _on_off(payload))
+
+async def _flame(c, payload):
+    level = int(payload)
+    if not 0 <= level <= 12: raise ValueError(f"Flame level out of range: {level}")
+    await c.async_request(STATE_FLAME, level)
+
+async def _light(c, payload):
+    c.cancel_light_transition()
+    await c.async_request(STATE_LIGHT, _on_off(payload))
+
+async def _brightness(c, payload):
+    brightness = int(payload)
+    c.cancel_light_transition()
+    if brightness > 0: c.light_brightness_target = min(255, brightness)
+    await c.async_request(STATE_LIGHT, brightness > 0)
+
+async def _mode(c, payload):
+    value = payload.strip().lower()
+    if value not in ("eco", "manual"): raise ValueError(f"Expected eco or manual, got {payload!r}")
+    await c.async_request(STATE_ECO, value == "eco")
+
+
+def _make_switch(key):
+    async def handler(c, payload):
+        await c.async_request(key, _on_off(payload))
+    return handler
+
+
+COMMANDS = {
+    "power": _power,                    # ON | OFF (flame 0 for pilot)
+    "flame": _flame,                    # 0 - 12
+    "aux": _make_switch(STATE_AUX),     # ON | OFF
+    "light": _light,
+    "brightness": _brightness,          # 0 - 255 (0 = off)
+    "fan": _make_switch(STATE_FAN),
+    "mode": _mode,                      # eco | manual
+}
+
+
+def _format(value) -> str:
+    if isinstance(value, bool): return "ON" if value else "OFF"
+    if value is None: return ""
+    return str(value)
+
+
+class MertikMqttBridge:
+    def __init__(self, coordinator, base_topic, publish, subscribe, min_interval=MQTT_MIN_INTERVAL):
+        self._coordinator = coordinator  # Needs mertik, async_request(key, value) and the light target
+        self.base_topic = base_topic.rstrip("/")
+        self._publish = publish
+        self._subscribe = subscribe
+        self._min_interval = min_interval
+        self._published = {}            # topic -> payload last handed to the broker
+        self._pending = {}              # topic -> payload waiting for the worker
+        self._wakeup = asyncio.Event()
+        self._worker = None
+        self._commands = set()          # Running command tasks, kept so they are not collected
+        self._unsubscribe = None
+        self.stats = {"published": 0, "coalesced": 0, "commands": 0, "rejected": 0, "failed": 0, "failed_commands": 0}
+
+    async def async_start(self):
+        self._worker = asyncio.create_task(self._async_worker())
+        self._unsubscribe = await self._subscribe(f"{self.base_topic}/+/set", self.handle_message)
+
+    async def async_stop(self, publish_offline=True):
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._worker is not None:
+            self._worker.cancel()
+            try: await self._worker
+            except asyncio.CancelledError: pass
+            self._worker = None
+        if publish_offline:
+            try: await self._publish(f"{self.base_topic}/available", "offline", True)
+            except Exception as e: _LOGGER.debug(f"Could not publish offline state: {e}")
+
+    # --- State ---
+    def update(self, available) -> None:
+        """Queue the fields that differ from what was last published."""
+        state = {"available": "online" if available else "offline"}
+        if available: state.update({k: _format(v) for k, v in describe(self._coordinator.mertik).items()})
+        for field, payload in state.items():
+            topic = f"{self.base_topic}/{field}"
+            if topic in self._pending:
+                if self._pending[topic] != payload: self.stats["coalesced"] += 1
+                if self._published.get(topic) == payload: del self._pending[topic]
+                else: self._pending[topic] = payload
+            elif self._published.get(topic) != payload:
+                self._pending[topic] = payload
+        if self._pending: self._wakeup.set()
+
+    async def _async_worker(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            batch, self._pending = self._pending, {}
+            for topic, payload in batch.items():
+                try:
+                    await self._publish(topic, payload, True)
+                    self._published[topic] = payload
+                    self.stats["published"] += 1
+                except Exception as e:
+                    # Keep it pending unless a newer value arrived meanwhile
+                    self._pending.setdefault(topic, payload)
+                    self.stats["failed"] += 1
+                    _LOGGER.warning(f"MQTT publish to {topic} failed: {e}")
+            if self._pending: self._wakeup.set()
+            await asyncio.sleep(self._min_interval)
+
+    # --- Commands ---
+    def handle_message(self, topic, payload) -> None:
+        """Subscription callback for <base>/<command>/set."""
+        if isinstance(payload, bytes): payload = payload.decode("utf-8", errors="replace")
+        command = topic[len(self.base_topic) + 1:].split("/")[0]
+        handler = COMMANDS.get(command)
+        if handler is None:
+            self.stats["rejected"] += 1
+            _LOGGER.warning(f"Unknown MQTT command topic {topic}")
+            return
+        task = asyncio.get_running_loop().create_task(self._async_command(command, handler, payload))
+        self._commands.add(task)
+        task.add_done_callback(self._commands.discard)
+
+    async def _async_command(self, command, handler, payload):
+        # Runs as a detached task: nothing else would see an exception
+        try:
+            await handler(self._coordinator, payload)
+        except ValueError as e:
+            self.stats["rejected"] += 1
+            _LOGGER.warning(f"Rejected MQTT {command} command: {e}")
+            return
+        except Exception:
+            self.stats["failed_commands"] += 1
+            _LOGGER.exception(f"MQTT {command} command failed")
+            return
+        self.stats["commands"] += 1
+
+
+class LocalBroker:
+    """In-memory stand-in for an MQTT broker (retained messages, + and # wildcards)."""
+
+    def __init__(self):
+        self.retained = {}
+        self.messages = []
+        self._subscriptions = []
+
+    @staticmethod
+    def _matches(pattern, topic) -> bool:
+        p, t = pattern.split("/"), topic.split("/")
+        for i, part in enumerate(p):
+            if part == "#": return True
+            if i >= len(t) or (part != "+" and part != t[i]): return False
+        return len(p) == len(t)
+
+    async def publish(self, topic, payload, retain=False):
+        self.messages.append((topic, payload, retain))
+        if retain: self.retained[topic] = payload
+        for pattern, callback in list(self._subscriptions):
+            if self._matches(pattern, topic): callback(topic, payload)
+
+    async def subscribe(self, pattern, callback):
+        entry = (pattern, callback)
+        self._subscriptions.append(entry)
+        return lambda: self._subscriptions.remove(entry)
@@ -0,0 +1,103 @@
+"""Learned heat-up / cool-down model for optimal start.
+
+Temperature readings only move in 0.1 °C steps, so rates are measured over
+segments of constant burner state (several minutes long) rather than between
+consecutive polls. Each finished segment updates an exponential moving
+average: one heat-up rate per flame level, one cool-down rate while the burner
+is off or at pilot.
+"""
+from .const import (
+    MAX_INTEGRATION_GAP,
+    PREHEAT_ALPHA,
+    PREHEAT_MIN_SEGMENT,
+    PREHEAT_MAX_SEGMENT,
+    PREHEAT_DEFAULT_HEAT_RATE,
+    PREHEAT_DEFAULT_COOL_RATE,
+    PREHEAT_MARGIN
+)
+
+COOLING = 0
+
+
+class PreheatModel:
+    def __init__(self, levels=13):
+        self.heat_rates = [None] * levels  # °C per hour at each flame level (index 0 unused)
+        self.heat_samples = [0] * levels
+        self.cool_rate = None              # °C per hour lost while not burning
+        self.cool_samples = 0
+        # Current segment (not persisted): (mode, start ts, start temperature, last ts)
+        self._segment = None
+
+    def update(self, ts, temperature, on, flame) -> None:
+        mode = flame if on and flame > 0 else COOLING
+        seg = self._segment
+        if seg is not None and ts - seg[3] > MAX_INTEGRATION_GAP:
+            seg = None  # Outage: the temperature change is not attributable
+        if seg is not None:
+            duration = ts - seg[1]
+            if mode != seg[0] or duration >= PREHEAT_MAX_SEGMENT:
+                if duration >= PREHEAT_MIN_SEGMENT:
+                    self._learn(seg[0], (temperature - seg[2]) / duration * 3600)
+                seg = None
+        if seg is None:
+            self._segment = (mode, ts, temperature, ts)
+        else:
+            self._segment = (seg[0], seg[1], seg[2], ts)
+
+    def _learn(self, mode, rate) -> None:
+        if mode == COOLING:
+            rate = max(0.0, -rate)
+            self.cool_rate = rate if self.cool_rate is None else self.cool_rate + PREHEAT_ALPHA * (rate - self.cool_rate)
+            self.cool_samples += 1
+        else:
+            old = self.heat_rates[mode]
+            self.heat_rates[mode] = rate if old is None else old + PREHEAT_ALPHA * (rate - old)
+            self.heat_samples[mode] += 1
+
+    def best_level(self):
+        """Flame level with the fastest learned heat-up, and its rate."""
+        learned = [(rate, level) for level, rate in enumerate(self.heat_rates) if rate is not None and rate > 0]
+        if not learned: return len(self.heat_rates) - 1, PREHEAT_DEFAULT_HEAT_RATE
+        rate, level = max(learned)
+        return level, rate
+
+    def plan(self, now, temperature, target, deadline) -> float:
+        """Latest start time (Unix time) that reaches target by deadline.
+
+        Waiting w hours lets the room cool by c*w first; heating at rate r then
+        takes (target - T + c*w) / r hours, so w = (H - (target - T) / r) / (1 + c / r).
+        A room already above target gives w > H, so the start is capped at the
+        deadline (less the ignition margin).
+        """
+        _, r = self.best_level()
+        c = self.cool_rate if self.cool_rate is not None else PREHEAT_DEFAULT_COOL_RATE
+        hours = (deadline - now) / 3600
+        wait = (hours - (target - temperature) / r) / (1 + c / r)
+        return max(now, min(deadline, now + wait * 3600) - PREHEAT_MARGIN)
+
+    def schedule_action(self, now, temperature, schedule):
+        """What a comfort schedule ({"target", "at"}) needs now: "expire", "start" or None."""
+        if schedule is None: return None
+        if now >= schedule["at"]: return "expire"
+        if temperature and now >= self.plan(now, temperature, schedule["target"], schedule["at"]): return "start"
+        return None
+
+    def as_dict(self) -> dict:
+        return {
+            "heat_rates": [None if r is None else round(r, 3) for r in self.heat_rates],
+            "heat_samples": list(self.heat_samples),
+            "cool_rate": None if self.cool_rate is None else round(self.cool_rate, 3),
+            "cool_samples": self.cool_samples,
+        }
+
+    def restore(self, data) -> None:
+        if not data: return
+        rates = data.get("heat_rates", [])
+        samples = data.get("heat_samples", [])
+        for level in range(min(len(rates), len(self.heat_rates))):
+            self.heat_rates[level] = None if rates[level] is None else float(rates[level])
+        for level in range(min(len(samples), len(self.heat_samples))):
+            self.heat_samples[level] = int(samples[level])
+        cool = data.get("cool_rate")
+        self.cool_rate = None if cool is None else float(cool)
+        self.cool_samples = int(data.get("cool_samples", 0))
@@ -0,0 +1,132 @@
+"""Local multiplexing proxy for the Mertik WiFi module.
+
+The module copes badly with several simultaneous TCP clients. The proxy
+listens on a local port, accepts any number of downstream clients (vendor app,
+scripts, ...) and pushes their frames through one ordered queue onto the single
+upstream session owned by ``Mertik``. Status polls are answered from a cache
+lasting about one poll interval, which Home Assistant's own polling keeps warm.
+
+Like the module itself, the proxy has no authentication: anyone who can reach
+the port can ignite or shut down the fireplace. It therefore binds a single
+address (loopback unless told otherwise) rather than every interface.
+"""
+import asyncio
+import logging
+import time
+
+from .codec import FRAME_STATUS_POLL, split_frames
+from .const import PROXY_MAX_FRAME, PROXY_QUEUE_SIZE, PROXY_STATUS_TTL
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MertikProxy:
+    def __init__(self, mertik, port, host="127.0.0.1", status_ttl=PROXY_STATUS_TTL):
+        self._mertik = mertik
+        self._host = host
+        self._port = port
+        self._status_ttl = status_ttl
+        self._queue = asyncio.Queue(maxsize=PROXY_QUEUE_SIZE)
+        self._server = None
+        self._worker = None
+        self._clients = set()
+        self._stopping = False
+        self.stats = {"clients": 0, "forwarded": 0, "cache_hits": 0, "failed": 0}
+
+    @property
+    def port(self):
+        if self._server and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def async_start(self):
+        # Downstream traffic shares one persistent upstream session
+        self._mertik.keep_alive = True
+        self._worker = asyncio.create_task(self._async_worker())
+        self._server = await asyncio.start_server(self._handle_client, self._host, self._port)
+        _LOGGER.info(f"Mertik proxy listening on {self._host}:{self.port}")
+
+    async def async_stop(self):
+        self._stopping = True
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for writer in list(self._clients): writer.close()
+        if self._worker:
+            self._worker.cancel()
+            try: await self._worker
+            except asyncio.CancelledError: pass
+            self._worker = None
+        # Release clients still waiting for a reply
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            self._fail(future)
+        self._mertik.keep_alive = False
+        await self._mertik.async_close()
+
+    async def _handle_client(self, reader, writer):
+        self._clients.add(writer)
+        self.stats["clients"] += 1
+        try:
+            buffer = b""
+            while True:
+                chunk = await reader.read(1024)
+                if not chunk: break
+                # Frames end with ETX (CR for some replies); a read may hold several or part of one
+                requests, buffer = split_frames(buffer + chunk)
+                if len(buffer) > PROXY_MAX_FRAME: break
+                for request in requests:
+                    response = await self.async_forward(request)
+                    if response is None: return
+                    writer.write(response)
+                    await writer.drain()
+        except (OSError, ConnectionError) as e:
+            _LOGGER.debug(f"Proxy client error: {repr(e)}")
+        finally:
+            self._clients.discard(writer)
+            self.stats["clients"] -= 1
+            writer.close()
+
+    async def async_forward(self, request: bytes):
+        """Queue a downstream frame for the upstream session and wait for its reply.
+
+        Raises ConnectionError once the proxy is stopping.
+        """
+        if self._stopping: raise ConnectionError("Proxy stopped")
+        if request == FRAME_STATUS_POLL:
+            cached = self._mertik.last_status_response
+            if cached and time.monotonic() - self._mertik.last_status_time < self._status_ttl:
+                self.stats["cache_hits"] += 1
+                return cached
+        future = asyncio.get_running_loop().create_future()
+        # A full queue blocks the client (backpressure) instead of growing without bound
+        await self._queue.put((request, future))
+        # The queue had room again only because async_stop drained it
+        if self._stopping: self._fail(future)
+        return await future
+
+    @staticmethod
+    def _fail(future):
+        if not future.done(): future.set_exception(ConnectionError("Proxy stopped"))
+
+    async def _async_worker(self):
+        while True:
+            request, future = await self._queue.get()
+            try:
+                if request == FRAME_STATUS_POLL and self._mertik.last_status_response \
+                        and time.monotonic() - self._mertik.last_status_time < self._status_ttl:
+                    # Another client's poll refreshed the cache while this one waited
+                    response = self._mertik.last_status_response
+                    self.stats["cache_hits"] += 1
+                else:
+                    response = await self._mertik._async_send_frame(request)
+                    self.stats["forwarded" if response is not None else "failed"] += 1
+                if not future.done(): future.set_result(response)
+            except asyncio.CancelledError:
+                self._fail(future)
+                raise
+            except Exception as e:
+                if not future.done(): future.set_exception(e)
+            finally:
+                self._queue.task_done()
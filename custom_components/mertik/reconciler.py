@@ -0,0 +1,141 @@
+"""Desired-state reconciler.
+
+Holds what Home Assistant wants per key (power, flame, aux, light, fan, eco)
+until the device reports the same, and sends the command for each key that
+still differs, in RECONCILE_ORDER, with exponential backoff between retries.
+The device side is injected as four callables, so the logic runs without
+Home Assistant or a module:
+
+    actual(key)            value the device reports
+    send(key, value)       coroutine that sends the command
+    can_enforce(key)       False while the device cannot take the command
+    pending(key)           True while a sent command awaits confirmation
+"""
+import logging
+import time
+
+from .const import (
+    RECONCILE_ORDER,
+    RECONCILE_BACKOFF_BASE,
+    RECONCILE_BACKOFF_MAX,
+    STATE_POWER,
+    STATE_FLAME,
+    STATE_AUX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Reconciler:
+    def __init__(self, actual, send, can_enforce, pending, clock=time.monotonic):
+        self._actual = actual
+        self._send = send
+        self._can_enforce = can_enforce
+        self._pending = pending
+        self._clock = clock
+        # With Smart Sync off, a wish the device did not take is dropped instead of retried
+        self.smart_sync_enabled = True
+        self.desired = {}
+        self.backoff = {}   # key -> (attempts, next_try monotonic)
+        self.declined = {}  # key -> value the device did not take while Smart Sync is off
+        self.stats = {"commands_sent": 0, "retries": 0, "converged": 0, "superseded": 0, "accepted": 0}
+
+    def desired_state(self, key):
+        """State shown to HA: the pending desired value, else what the device reports."""
+        return self.desired.get(key, self._actual(key))
+
+    def set_desired(self, key, value) -> None:
+        """Record a wish without sending anything; the next reconcile pass enforces it.
+
+        Re-asserting the same value keeps the current backoff, so callers that
+        recompute their demand on every poll do not cause a resend each time.
+        With Smart Sync off, a value the device already declined is not retried.
+        """
+        if not self.smart_sync_enabled and key in self.declined and self.declined[key] == value: return
+        self.declined.pop(key, None)
+        if self.desired.get(key, None) == value and key in self.desired: return
+        if key not in self.desired and self._actual(key) == value: return
+        if key in self.desired: self.stats["superseded"] += 1
+        self.desired[key] = value
+        self.backoff.pop(key, None)
+        if key == STATE_POWER and not value:
+            # Shutting down makes any flame or burner wish meaningless
+            self.clear_desired(STATE_FLAME, STATE_AUX)
+
+    def clear_desired(self, *keys) -> None:
+        for key in keys:
+            self.desired.pop(key, None)
+            self.backoff.pop(key, None)
+
+    def clear(self) -> None:
+        self.desired.clear()
+        self.backoff.clear()
+
+    def defer(self, key, delay) -> None:
+        """Count key as sent once and leave its next check for delay seconds."""
+        self.backoff[key] = (1, self._clock() + delay)
+
+    async def async_request(self, key, value) -> None:
+        """Explicit user request: record it and send the command right away."""
+        self.set_desired(key, value)
+        self.desired[key] = value
+        self.backoff.pop(key, None)
+        self.declined.pop(key, None)
+        await self.async_enforce(key, value)
+
+    async def async_reconcile(self) -> None:
+        """Run one reconcile pass.
+
+        Every wish is sent once. Only with Smart Sync on is a wish the device
+        did not take sent again; with it off the device state is accepted.
+        """
+        now = self._clock()
+        for key in RECONCILE_ORDER:
+            if key not in self.desired: continue
+            # A command for this key is still unconfirmed; judge it after the next poll
+            if self._pending(key): continue
+            value = self.desired[key]
+            if self._actual(key) == value:
+                self.desired.pop(key)
+                if self.backoff.pop(key, None) is not None:
+                    self.stats["converged"] += 1
+                continue
+            if not self.smart_sync_enabled and key in self.backoff:
+                self.declined[key] = self.desired.pop(key)
+                self.backoff.pop(key)
+                self.stats["accepted"] += 1
+                _LOGGER.info(f"{key} did not change to {value}. Smart Sync is off, accepting device state.")
+                continue
+            if not self._can_enforce(key): continue
+            _, next_try = self.backoff.get(key, (0, 0.0))
+            if now < next_try: continue
+            await self.async_enforce(key, value)
+
+    async def async_enforce(self, key, value) -> None:
+        """Send the command for key now and schedule the next check with backoff."""
+        attempts, _ = self.backoff.get(key, (0, 0.0))
+        if attempts: self.stats["retries"] += 1
+        attempts += 1
+        delay = min(RECONCILE_BACKOFF_MAX, RECONCILE_BACKOFF_BASE * 2 ** (attempts - 1))
+        self.backoff[key] = (attempts, self._clock() + delay)
+        self.stats["commands_sent"] += 1
+        if attempts > 1:
+            _LOGGER.info(f"{key} has not converged to {value} after {attempts - 1} attempt(s). Next retry in {delay}s.")
+        try:
+            await self._send(key, value)
+        except Exception as e: _LOGGER.error(f"Error enforcing {key}={value}: {e}")
+
+    @property
+    def metrics(self) -> dict:
+        now = self._clock()
+        return {
+            **self.stats,
+            "pending": {
+                key: {
+                    "desired": value,
+                    "attempts": self.backoff.get(key, (0, 0.0))[0],
+                    "next_try_in": max(0.0, round(self.backoff.get(key, (0, now))[1] - now, 1)),
+                }
+                for key, value in self.desired.items()
+            },
+        }
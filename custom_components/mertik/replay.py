@@ -0,0 +1,145 @@
+"""Offline replay of a Mertik frame capture.
+
+Feeds the frames captured by the diagnostics download back through the status
+decoder, or through a local simulator that answers a real ``Mertik`` client with
+the recorded responses.
+
+    python -m custom_components.mertik.replay capture.json --speed 20
+    python -m custom_components.mertik.replay capture.json --simulate --port 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+from collections import defaultdict, deque
+
+from .const import CMD_PREFIX
+from .core import describe
+from .mertik import Mertik
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def load_capture(path):
+    """Load frames from a diagnostics download (or a bare list of frames)."""
+    with open(path, encoding="utf-8") as f:
+        doc = json.load(f)
+    if isinstance(doc, dict):
+        doc = doc.get("data", doc).get("frames", [])
+    return [
+        (float(fr["time"]), fr["direction"], bytes.fromhex(fr["data"]))
+        for fr in doc
+    ]
+
+
+class MertikSimulator:
+    """Local TCP stand-in for the WiFi module that answers with recorded responses."""
+
+    def __init__(self, frames):
+        self._responses = defaultdict(deque)
+        self._last_response = None
+        pending_tx = None
+        for _, direction, data in frames:
+            if direction == "tx":
+                pending_tx = data
+            elif direction == "rx" and pending_tx is not None:
+                self._responses[pending_tx].append(data)
+                pending_tx = None
+        self._server = None
+
+    def _answer(self, request):
+        queue = self._responses.get(request)
+        if queue:
+            # Keep the last answer around so a longer replay still gets a reply
+            response = queue.popleft() if len(queue) > 1 else queue[0]
+            self._last_response = response
+            return response
+        return self._last_response
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                request = await reader.read(1024)
+                if not request: break
+                # Pipelined requests arrive in one read: answer each frame (STX ...)
+                requests = [b"\x02" + part for part in request.split(b"\x02")[1:]] or [request]
+                responses = [self._answer(frame) for frame in requests]
+                if not all(responses): break
+                writer.write(b"".join(responses))
+                await writer.drain()
+        except (OSError, ConnectionError): pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=0):
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def _sleep_scaled(prev_ts, ts, speed):
+    if speed > 0 and prev_ts is not None and ts > prev_ts:
+        await asyncio.sleep((ts - prev_ts) / speed)
+
+
+async def replay_decode(frames, speed, out=print):
+    """Run every captured response through the decoder of a fresh device."""
+    device = Mertik("replay")
+    start = prev = None
+    for ts, direction, data in frames:
+        await _sleep_scaled(prev, ts, speed)
+        start = ts if start is None else start
+        prev = ts
+        line = {"t": round(ts - start, 3), "dir": direction, "data": data.hex()}
+        if direction == "rx":
+            device._handle_response(data)
+            line["state"] = describe(device)
+        out(json.dumps(line))
+    return device
+
+
+async def replay_simulate(frames, speed, port=0, out=print):
+    """Serve the capture from the simulator and drive a real client against it."""
+    simulator = MertikSimulator(frames)
+    port = await simulator.start(port=port)
+    device = Mertik("127.0.0.1", port)
+    start = prev = None
+    try:
+        for ts, direction, data in frames:
+            if direction != "tx": continue
+            await _sleep_scaled(prev, ts, speed)
+            start = ts if start is None else start
+            prev = ts
+            msg = data.hex()
+            if msg.startswith(CMD_PREFIX): msg = msg[len(CMD_PREFIX):]
+            await device._async_send_command(msg)
+            out(json.dumps({"t": round(ts - start, 3), "cmd": msg, "state": describe(device)}))
+    finally:
+        await simulator.stop()
+    return device
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a Mertik frame capture.")
+    parser.add_argument("capture", help="Diagnostics JSON file containing 'frames'")
+    parser.add_argument("--speed", type=float, default=10.0,
+                        help="Time acceleration factor (0 = as fast as possible)")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Replay through the local simulator instead of the decoder only")
+    parser.add_argument("--port", type=int, default=0, help="Simulator port (0 = random)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    frames = load_capture(args.capture)
+    if args.simulate:
+        asyncio.run(replay_simulate(frames, args.speed, args.port))
+    else:
+        asyncio.run(replay_decode(frames, args.speed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Round-trip time estimation for adaptive timeouts (RFC 6298 style)."""
+
+RTT_ALPHA = 1 / 8
+RTT_BETA = 1 / 4
+RTT_K = 4
+
+
+class RttEstimator:
+    """Smoothed RTT and variance, turned into a timeout with floor and ceiling.
+
+    Until the first sample the ceiling is used. A timeout doubles the current
+    value (exponential backoff) until the next successful sample.
+    """
+
+    def __init__(self, floor, ceiling):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+        self.timeouts = 0
+        self._backoff = 1
+
+    def sample(self, rtt) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self.samples += 1
+        self._backoff = 1
+
+    def on_timeout(self) -> None:
+        self.timeouts += 1
+        self._backoff = min(self._backoff * 2, 64)
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None: return self.ceiling
+        rto = (self.srtt + RTT_K * self.rttvar) * self._backoff
+        return max(self.floor, min(self.ceiling, rto))
+
+    def as_dict(self) -> dict:
+        return {
+            "srtt": None if self.srtt is None else round(self.srtt, 4),
+            "rttvar": None if self.rttvar is None else round(self.rttvar, 4),
+            "timeout": round(self.timeout, 3),
+            "samples": self.samples,
+            "timeouts": self.timeouts,
+        }
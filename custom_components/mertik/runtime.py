@@ -0,0 +1,86 @@
+"""Burner runtime and gas consumption counters.
+
+Integrates flame level and secondary burner state over time as status
+snapshots arrive. Each update is O(1) and only touches a handful of floats,
+so no history needs to be scanned to know the totals.
+"""
+from .const import MAX_INTEGRATION_GAP
+
+
+class BurnerRuntime:
+    """Running totals for one fireplace."""
+
+    def __init__(self, power_table, aux_power, calorific_value):
+        self.power_table = list(power_table)    # kW per flame level 0 - 12 (0 = pilot)
+        self.aux_power = aux_power              # kW added by the secondary burner
+        self.calorific_value = calorific_value  # kWh per m³ of gas
+
+        self.burner_seconds = 0.0
+        self.aux_seconds = 0.0
+        self.ignitions = 0
+        self.energy_kwh = 0.0
+        self.gas_m3 = 0.0
+
+        # Previous snapshot (not persisted: nothing is integrated across a restart)
+        self._last_ts = None
+        self._last_on = False
+        self._last_flame = 0
+        self._last_aux = False
+
+    def _power(self, on, flame, aux) -> float:
+        if not on: return 0.0
+        level = max(0, min(len(self.power_table) - 1, flame))
+        power = self.power_table[level]
+        if aux and flame > 0: power += self.aux_power
+        return power
+
+    def update(self, ts, on, flame, aux) -> None:
+        """Account for the interval since the previous snapshot, then store this one."""
+        if self._last_ts is not None:
+            # The previous state held until now; cap gaps (outages, restarts)
+            dt = min(max(0.0, ts - self._last_ts), MAX_INTEGRATION_GAP)
+            if self._last_on and self._last_flame > 0:
+                self.burner_seconds += dt
+                if self._last_aux: self.aux_seconds += dt
+            energy = self._power(self._last_on, self._last_flame, self._last_aux) * dt / 3600
+            self.energy_kwh += energy
+            if self.calorific_value > 0: self.gas_m3 += energy / self.calorific_value
+            if on and not self._last_on: self.ignitions += 1
+        self._last_ts = ts
+        self._last_on = on
+        self._last_flame = flame
+        self._last_aux = aux
+
+    def reset_baseline(self) -> None:
+        """Forget the previous snapshot, e.g. after an outage: its state is unknown since."""
+        self._last_ts = None
+
+    @property
+    def burner_hours(self) -> float: return self.burner_seconds / 3600
+    @property
+    def aux_hours(self) -> float: return self.aux_seconds / 3600
+
+    def as_dict(self) -> dict:
+        return {
+            "burner_seconds": self.burner_seconds,
+            "aux_seconds": self.aux_seconds,
+            "ignitions": self.ignitions,
+            "energy_kwh": self.energy_kwh,
+            "gas_m3": self.gas_m3,
+        }
+
+    def restore(self, data) -> None:
+        if not data: return
+        self.burner_seconds = float(data.get("burner_seconds", 0.0))
+        self.aux_seconds = float(data.get("aux_seconds", 0.0))
+        self.ignitions = int(data.get("ignitions", 0))
+        self.energy_kwh = float(data.get("energy_kwh", 0.0))
+        self.gas_m3 = float(data.get("gas_m3", 0.0))
+
+
+def parse_power_table(value):
+    """Parse '0.15, 2.0, ..., 7.0' into 13 floats. Raises ValueError if malformed."""
+    table = [float(v) for v in str(value).replace(";", ",").split(",") if v.strip()]
+    if len(table) != 13 or any(v < 0 for v in table):
+        raise ValueError("Expected 13 non-negative values (pilot + levels 1-12)")
+    return table
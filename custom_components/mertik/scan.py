@@ -0,0 +1,74 @@
+"""TCP probing of hosts and subnets for Mertik modules.
+
+UDP discovery does not cross VLANs, so this connects to the control port of
+every host in a range instead. A host only counts as a fireplace when it
+answers a real status poll with a frame that decodes as status.
+
+``find_moved_device`` picks the module that moved to a new address out of a
+discovery broadcast.
+"""
+import asyncio
+import ipaddress
+import logging
+
+from .codec import FRAME_STATUS_POLL, StatusFrame, decode_response
+from .const import SCAN_CONCURRENCY, SCAN_MAX_HOSTS, SCAN_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_probe_host(host, port=2000, timeout=SCAN_TIMEOUT):
+    """Return the decoded status of host, or None if it is not a Mertik module.
+
+    One attempt, with timeout for the connect and again for the reply.
+    """
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        writer.write(FRAME_STATUS_POLL)
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(1024), timeout)
+        frame = decode_response(data) if data else None
+    except (OSError, asyncio.TimeoutError, ValueError, IndexError) as e:
+        _LOGGER.debug(f"Probe of {host}:{port} failed: {repr(e)}")
+        return None
+    finally:
+        if writer is not None:
+            writer.close()
+            try: await writer.wait_closed()
+            except Exception: pass
+    return frame if isinstance(frame, StatusFrame) else None
+
+
+def hosts_in(network):
+    """Host addresses of a CIDR range. Raises ValueError if invalid or too large."""
+    net = ipaddress.ip_network(network, strict=False)
+    if net.num_addresses > SCAN_MAX_HOSTS + 2:
+        raise ValueError(f"{network} has more than {SCAN_MAX_HOSTS} hosts")
+    return [str(ip) for ip in net.hosts()] or [str(net.network_address)]
+
+
+async def async_scan(network, port=2000, concurrency=SCAN_CONCURRENCY, timeout=SCAN_TIMEOUT):
+    """Probe every host of a CIDR range; returns {ip: StatusFrame} of the fireplaces found."""
+    limit = asyncio.Semaphore(concurrency)
+
+    async def probe(host):
+        async with limit:
+            return host, await async_probe_host(host, port, timeout)
+
+    results = await asyncio.gather(*(probe(host) for host in hosts_in(network)))
+    return {host: frame for host, frame in results if frame is not None}
+
+
+def find_moved_device(found, identity, claimed):
+    """Address of our module among the discovery replies, or None.
+
+    found holds {"ip", "response"} per module that answered the broadcast.
+    With a known identity the module is matched by its reply; without one,
+    only a module that is alone and not at an address in claimed (used by
+    another entry) is adopted.
+    """
+    if identity is not None:
+        return next((d["ip"] for d in found if d["response"] == identity), None)
+    free = [d["ip"] for d in found if d["ip"] not in claimed]
+    return free[0] if len(free) == 1 else None
@@ -1,34 +1,118 @@
 import logging
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
-from homeassistant.const import UnitOfTemperature, SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+import time
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.const import (
+    UnitOfTemperature, UnitOfTime, UnitOfEnergy, UnitOfVolume, SIGNAL_STRENGTH_DECIBELS_MILLIWATT
+)
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CAP_AUX,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_TEMPERATURE_MIN_INTERVAL,
+    CONF_TEMPERATURE_MAX_INTERVAL,
+    CONF_SIGNAL_DEADBAND,
+    CONF_SIGNAL_MIN_INTERVAL,
+    CONF_SIGNAL_MAX_INTERVAL,
+    CONF_STATUS_MIN_INTERVAL,
+    CONF_STATUS_MAX_INTERVAL,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_TEMPERATURE_MIN_INTERVAL,
+    DEFAULT_TEMPERATURE_MAX_INTERVAL,
+    DEFAULT_SIGNAL_DEADBAND,
+    DEFAULT_SIGNAL_MIN_INTERVAL,
+    DEFAULT_SIGNAL_MAX_INTERVAL,
+    DEFAULT_STATUS_MIN_INTERVAL,
+    DEFAULT_STATUS_MAX_INTERVAL
+)
+from .throttle import PublishThrottle, parse_deadband
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     dataservice = hass.data[DOMAIN].get(entry.entry_id)
     device_name = entry.data["name"]
-    async_add_entities([
-        MertikTemperatureSensor(dataservice, entry.entry_id, device_name),
+    opts = entry.options
+    temperature_throttle = _build_throttle(
+        opts.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+        opts.get(CONF_TEMPERATURE_MIN_INTERVAL, DEFAULT_TEMPERATURE_MIN_INTERVAL),
+        opts.get(CONF_TEMPERATURE_MAX_INTERVAL, DEFAULT_TEMPERATURE_MAX_INTERVAL),
+    )
+    signal_throttle = _build_throttle(
+        opts.get(CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+        opts.get(CONF_SIGNAL_MIN_INTERVAL, DEFAULT_SIGNAL_MIN_INTERVAL),
+        opts.get(CONF_SIGNAL_MAX_INTERVAL, DEFAULT_SIGNAL_MAX_INTERVAL),
+    )
+    # Status text and flags publish immediately; only the RF level attribute is throttled
+    status_throttle = _build_throttle(
+        opts.get(CONF_SIGNAL_DEADBAND, DEFAULT_SIGNAL_DEADBAND),
+        opts.get(CONF_STATUS_MIN_INTERVAL, DEFAULT_STATUS_MIN_INTERVAL),
+        opts.get(CONF_STATUS_MAX_INTERVAL, DEFAULT_STATUS_MAX_INTERVAL),
+    )
+    entities = [
+        MertikTemperatureSensor(dataservice, entry.entry_id, device_name, temperature_throttle),
         MertikModeSensor(dataservice, entry.entry_id, device_name),
-        MertikStatusSensor(dataservice, entry.entry_id, device_name),
-        MertikSignalSensor(dataservice, entry.entry_id, device_name), # <--- NEW
-    ])
+        MertikStatusSensor(dataservice, entry.entry_id, device_name, status_throttle),
+        MertikSignalSensor(dataservice, entry.entry_id, device_name, signal_throttle), # <--- NEW
+        MertikBurnerHoursSensor(dataservice, entry.entry_id, device_name),
+        MertikIgnitionsSensor(dataservice, entry.entry_id, device_name),
+        MertikEnergySensor(dataservice, entry.entry_id, device_name),
+        MertikGasSensor(dataservice, entry.entry_id, device_name),
+    ]
+    if CAP_AUX in dataservice.capabilities:
+        entities.append(MertikAuxHoursSensor(dataservice, entry.entry_id, device_name))
+    async_add_entities(entities)
 
-# 1. AMBIENT TEMP
-class MertikTemperatureSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, dataservice, entry_id, name):
+def _build_throttle(deadband, min_interval, max_interval):
+    try:
+        amount, relative = parse_deadband(deadband)
+    except ValueError:
+        _LOGGER.warning(f"Invalid deadband {deadband!r}, publishing every change.")
+        amount, relative = 0.0, False
+    return PublishThrottle(amount, relative, float(min_interval), float(max_interval))
+
+class MertikThrottledSensor(CoordinatorEntity, SensorEntity):
+    """Sensor whose state writes go through a PublishThrottle."""
+
+    def __init__(self, dataservice, throttle):
         super().__init__(dataservice)
         self._dataservice = dataservice
+        self._throttle = throttle
+        self._published_available = None
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self._dataservice.publish_throttles[self.unique_id] = self._throttle
+        self.async_on_remove(lambda: self._dataservice.publish_throttles.pop(self.unique_id, None))
+
+    def _live_value(self): return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Availability changes always go through
+        available = self.available
+        force = available != self._published_available
+        if self._throttle.check(self._live_value(), time.monotonic(), force=force):
+            self._published_available = available
+            self.async_write_ha_state()
+
+    @property
+    def native_value(self):
+        if self._throttle.last_publish is None: return self._live_value()
+        return self._throttle.value
+
+# 1. AMBIENT TEMP
+class MertikTemperatureSensor(MertikThrottledSensor):
+    def __init__(self, dataservice, entry_id, name, throttle):
+        super().__init__(dataservice, throttle)
         self._attr_name = name + " Ambient Temperature"
         self._attr_unique_id = entry_id + "-ambient-temp"
         self._attr_device_class = SensorDeviceClass.TEMPERATURE
         self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
         self._attr_suggested_display_precision = 1
 
-    @property
-    def native_value(self):
+    def _live_value(self):
         return self._dataservice.ambient_temperature
 
     @property
@@ -53,16 +137,40 @@ class MertikModeSensor(CoordinatorEntity, SensorEntity):
         return self._dataservice.device_info
 
 # 3. DETAILED STATUS
-class MertikStatusSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, dataservice, entry_id, name):
-        super().__init__(dataservice)
-        self._dataservice = dataservice
+class MertikStatusSensor(MertikThrottledSensor):
+    def __init__(self, dataservice, entry_id, name, throttle):
+        super().__init__(dataservice, throttle)
         self._attr_name = name + " Diagnostics"
         self._attr_unique_id = entry_id + "-diagnostics"
         self._attr_icon = "mdi:message-alert-outline"
+        self._published = None
+        self._published_discrete = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        state, attrs = self._status_text(), self._live_attributes()
+        rf = attrs["rf_signal_level"]
+        discrete = (state, {k: v for k, v in attrs.items() if k != "rf_signal_level"})
+        available = self.available
+        # Any change of text or flags is published at once; RF jitter alone is throttled
+        force = discrete != self._published_discrete or available != self._published_available
+        if self._throttle.check(rf, time.monotonic(), force=force):
+            self._published = (state, attrs)
+            self._published_discrete = discrete
+            self._published_available = available
+            self.async_write_ha_state()
 
     @property
     def native_value(self):
+        if self._published is None: return self._status_text()
+        return self._published[0]
+
+    @property
+    def extra_state_attributes(self):
+        if self._published is None: return self._live_attributes()
+        return self._published[1]
+
+    def _status_text(self):
         m = self._dataservice.mertik
         if m._guard_flame_on:
             if m._low_battery: return "Error: Low Battery Lockout"
@@ -75,8 +183,7 @@ class MertikStatusSensor(CoordinatorEntity, SensorEntity):
             return "Standby (Off)"
         return f"Heating (Level {m.flameHeight})"
 
-    @property
-    def extra_state_attributes(self):
+    def _live_attributes(self):
         m = self._dataservice.mertik
         return {
             "is_igniting": m.is_igniting,
@@ -86,7 +193,11 @@ class MertikStatusSensor(CoordinatorEntity, SensorEntity):
             "fan_active": m._fan_on,
             "rf_signal_level": m._rf_signal_level,
             "raw_mode_id": m.mode,
-            "thermostat_active": self._dataservice.is_thermostat_active
+            "thermostat_active": self._dataservice.is_thermostat_active,
+            "pending_commands": sorted(self._dataservice.desired),
+            "reconcile_retries": self._dataservice.reconcile_stats["retries"],
+            "unconfirmed_intents": len(m._intents),
+            "queued_commands": len(self._dataservice.journal),
         }
 
     @property
@@ -94,20 +205,87 @@ class MertikStatusSensor(CoordinatorEntity, SensorEntity):
         return self._dataservice.device_info
 
 # 4. RF SIGNAL STRENGTH (NEW)
-class MertikSignalSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, dataservice, entry_id, name):
-        super().__init__(dataservice)
-        self._dataservice = dataservice
+class MertikSignalSensor(MertikThrottledSensor):
+    def __init__(self, dataservice, entry_id, name, throttle):
+        super().__init__(dataservice, throttle)
         self._attr_name = name + " RF Signal Strength"
         self._attr_unique_id = entry_id + "-signal"
         self._attr_icon = "mdi:wifi"
         # The value is 0-255 raw, not dBm, so we don't use the Signal device class
         # to avoid confusion with actual dBm math.
 
-    @property
-    def native_value(self):
+    def _live_value(self):
         return self._dataservice.mertik._rf_signal_level
 
     @property
     def device_info(self):
         return self._dataservice.device_info
+
+# 5. RUNTIME COUNTERS (integrated by the coordinator on every snapshot)
+class MertikRuntimeSensor(CoordinatorEntity, SensorEntity):
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, dataservice, entry_id, name, label, key):
+        super().__init__(dataservice)
+        self._dataservice = dataservice
+        self._attr_name = f"{name} {label}"
+        self._attr_unique_id = f"{entry_id}-{key}"
+
+    @property
+    def device_info(self):
+        return self._dataservice.device_info
+
+class MertikBurnerHoursSensor(MertikRuntimeSensor):
+    def __init__(self, dataservice, entry_id, name):
+        super().__init__(dataservice, entry_id, name, "Burner Hours", "burner-hours")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_suggested_display_precision = 1
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        return round(self._dataservice.runtime.burner_hours, 4)
+
+class MertikAuxHoursSensor(MertikRuntimeSensor):
+    def __init__(self, dataservice, entry_id, name):
+        super().__init__(dataservice, entry_id, name, "Secondary Burner Hours", "aux-hours")
+        self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_unit_of_measurement = UnitOfTime.HOURS
+        self._attr_suggested_display_precision = 1
+        self._attr_icon = "mdi:timer-outline"
+
+    @property
+    def native_value(self):
+        return round(self._dataservice.runtime.aux_hours, 4)
+
+class MertikIgnitionsSensor(MertikRuntimeSensor):
+    def __init__(self, dataservice, entry_id, name):
+        super().__init__(dataservice, entry_id, name, "Ignitions", "ignitions")
+        self._attr_icon = "mdi:counter"
+
+    @property
+    def native_value(self):
+        return self._dataservice.runtime.ignitions
+
+class MertikEnergySensor(MertikRuntimeSensor):
+    def __init__(self, dataservice, entry_id, name):
+        super().__init__(dataservice, entry_id, name, "Estimated Energy", "energy")
+        self._attr_device_class = SensorDeviceClass.ENERGY
+        self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+        self._attr_suggested_display_precision = 2
+
+    @property
+    def native_value(self):
+        return round(self._dataservice.runtime.energy_kwh, 4)
+
+class MertikGasSensor(MertikRuntimeSensor):
+    def __init__(self, dataservice, entry_id, name):
+        super().__init__(dataservice, entry_id, name, "Estimated Gas", "gas")
+        self._attr_device_class = SensorDeviceClass.GAS
+        self._attr_native_unit_of_measurement = UnitOfVolume.CUBIC_METERS
+        self._attr_suggested_display_precision = 3
+
+    @property
+    def native_value(self):
+        return round(self._dataservice.runtime.gas_m3, 5)
@@ -0,0 +1,47 @@
+"""Live feed of the frames exchanged with a Mertik module.
+
+A ``FrameSubscription`` registers a listener on ``Mertik.frame_listeners``
+and buffers one event per TX/RX frame, plus one per decoded response with the
+decoded fields and (for status and light replies) the resulting state. The
+buffer is bounded: when a consumer falls behind, the oldest events are dropped
+and counted. ``Mertik`` only checks whether the listener list is empty, so
+nothing is built while nobody is subscribed.
+"""
+import asyncio
+import time
+from collections import deque
+
+from .codec import StatusFrame, LightFrame
+from .const import STREAM_QUEUE_SIZE
+from .core import describe
+
+
+class FrameSubscription:
+    def __init__(self, device, size=STREAM_QUEUE_SIZE):
+        self._device = device
+        self._events = deque(maxlen=size)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        device.frame_listeners.append(self._on_frame)
+
+    def close(self) -> None:
+        if self._on_frame in self._device.frame_listeners:
+            self._device.frame_listeners.remove(self._on_frame)
+
+    def _on_frame(self, direction, data, frame) -> None:
+        event = {"time": time.time(), "direction": direction, "data": bytes(data).hex()}
+        if frame is not None:
+            event["frame"] = type(frame).__name__
+            event["fields"] = frame._asdict()
+            if isinstance(frame, (StatusFrame, LightFrame)): event["state"] = describe(self._device)
+        if len(self._events) == self._events.maxlen: self.dropped += 1
+        self._events.append(event)
+        self._ready.set()
+
+    async def async_get_batch(self) -> list:
+        """Wait for events and return all buffered ones, oldest first."""
+        await self._ready.wait()
+        self._ready.clear()
+        events = list(self._events)
+        self._events.clear()
+        return events
@@ -3,7 +3,7 @@ from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.restore_state import RestoreEntity
-from .const import DOMAIN
+from .const import DOMAIN, CAP_AUX, STATE_POWER, STATE_ECO, STATE_AUX
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -11,13 +11,15 @@ async def async_setup_entry(hass, entry, async_add_entities):
     dataservice = hass.data[DOMAIN].get(entry.entry_id)
     dev_name = entry.data["name"]
     
-    async_add_entities([
+    entities = [
         MertikPowerSwitch(dataservice, entry.entry_id, dev_name),
         MertikEcoSwitch(dataservice, entry.entry_id, dev_name),
-        MertikAuxSwitch(dataservice, entry.entry_id, dev_name),
         MertikPilotSwitch(dataservice, entry.entry_id, dev_name),
         MertikSmartSyncSwitch(dataservice, entry.entry_id, dev_name),
-    ])
+    ]
+    if CAP_AUX in dataservice.capabilities:
+        entities.append(MertikAuxSwitch(dataservice, entry.entry_id, dev_name))
+    async_add_entities(entities)
 
 class MertikSmartSyncSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
     def __init__(self, dataservice, entry_id, name):
@@ -48,72 +50,39 @@ class MertikSmartSyncSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
         self._dataservice.smart_sync_enabled = False
         self.async_write_ha_state()
 
-class MertikBaseSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
+class MertikBaseSwitch(CoordinatorEntity, SwitchEntity):
+    """Switch backed by a key of the coordinator's desired state reconciler."""
+
+    _state_key = None
+
     def __init__(self, dataservice, entry_id, name, switch_type):
         super().__init__(dataservice)
         self._dataservice = dataservice
         self._attr_name = f"{name} {switch_type}"
         self._attr_unique_id = f"{entry_id}-{switch_type.lower().replace(' ', '-')}"
-        self._was_available = False
-        self._is_on_local = False
 
     @property
     def device_info(self): return self._dataservice.device_info
 
-    async def async_added_to_hass(self):
-        await super().async_added_to_hass()
-        last_state = await self.async_get_last_state()
-        if last_state and last_state.state in ["on", "off"]:
-            self._is_on_local = (last_state.state == "on")
-        self._was_available = self.coordinator.last_update_success
-        self._handle_coordinator_update()
-
-    def _handle_coordinator_update(self):
-        is_available = self.coordinator.last_update_success
-        device_is_on = self._get_device_status()
-        smart_sync = getattr(self._dataservice, "smart_sync_enabled", True)
-
-        if self._was_available and is_available:
-            self._is_on_local = device_is_on
-        elif not self._was_available and is_available:
-            if smart_sync:
-                _LOGGER.warning(f"{self.name} recovered. Enforcing HA State: {self._is_on_local}")
-            else:
-                _LOGGER.info(f"{self.name} recovered. Accepting device state: {device_is_on}")
-                self._is_on_local = device_is_on
-        self._was_available = is_available
-        self.async_write_ha_state()
-        if smart_sync: self.hass.async_create_task(self._sync_hardware())
-
-    async def _sync_hardware(self):
-        if not self.coordinator.last_update_success: return
-        device_is_on = self._get_device_status()
-        if self._is_on_local and not device_is_on: await self.async_turn_on_device()
-        elif not self._is_on_local and device_is_on: await self.async_turn_off_device()
-
     @property
-    def is_on(self): return self._is_on_local
+    def is_on(self): return self._dataservice.desired_state(self._state_key)
     async def async_turn_on(self, **kwargs):
-        self._is_on_local = True
-        await self.async_turn_on_device()
+        await self._dataservice.async_request(self._state_key, True)
         self.async_write_ha_state()
     async def async_turn_off(self, **kwargs):
-        self._is_on_local = False
-        await self.async_turn_off_device()
+        await self._dataservice.async_request(self._state_key, False)
         self.async_write_ha_state()
-    def _get_device_status(self): return False
-    async def async_turn_on_device(self): pass
-    async def async_turn_off_device(self): pass
 
 class MertikPowerSwitch(MertikBaseSwitch):
+    _state_key = STATE_POWER
+
     def __init__(self, dataservice, entry_id, name):
         super().__init__(dataservice, entry_id, name, "Power")
         self._attr_icon = "mdi:fireplace"
-    def _get_device_status(self): return self._dataservice.is_on
-    async def async_turn_on_device(self): await self._dataservice.async_ignite_fireplace()
-    async def async_turn_off_device(self): await self._dataservice.async_guard_flame_off()
 
 class MertikEcoSwitch(MertikBaseSwitch):
+    _state_key = STATE_ECO
+
     def __init__(self, dataservice, entry_id, name):
         super().__init__(dataservice, entry_id, name, "Eco Mode")
         self._attr_icon = "mdi:leaf"
@@ -125,25 +94,27 @@ class MertikEcoSwitch(MertikBaseSwitch):
         is_locked = getattr(self._dataservice, "is_thermostat_active", False)
         return is_coord_ok and not is_locked
 
-    def _get_device_status(self): return self._dataservice.mertik.mode == "2"
-    async def async_turn_on_device(self): await self._dataservice.mertik.async_set_eco()
-    async def async_turn_off_device(self): await self._dataservice.mertik.async_set_manual()
-
 class MertikAuxSwitch(MertikBaseSwitch):
+    _state_key = STATE_AUX
+
     def __init__(self, dataservice, entry_id, name):
         super().__init__(dataservice, entry_id, name, "Secondary Burner")
         self._attr_icon = "mdi:fire"
-    def _get_device_status(self): return self._dataservice.is_aux_on
-    async def async_turn_on_device(self): await self._dataservice.mertik.async_aux_on()
-    async def async_turn_off_device(self): await self._dataservice.mertik.async_aux_off()
 
 class MertikPilotSwitch(MertikBaseSwitch):
+    """Preference flag only, nothing to reconcile with the hardware."""
+
     def __init__(self, dataservice, entry_id, name):
         super().__init__(dataservice, entry_id, name, "Keep Pilot On")
         self._attr_icon = "mdi:gas-burner"
-    def _get_device_status(self): return getattr(self._dataservice, "keep_pilot_on", False)
-    async def async_turn_on_device(self): self._dataservice.keep_pilot_on = True
-    async def async_turn_off_device(self):
+
+    @property
+    def is_on(self): return getattr(self._dataservice, "keep_pilot_on", False)
+    async def async_turn_on(self, **kwargs):
+        self._dataservice.keep_pilot_on = True
+        self.async_write_ha_state()
+    async def async_turn_off(self, **kwargs):
         self._dataservice.keep_pilot_on = False
         if self._dataservice.is_on and self._dataservice.get_flame_height() == 0:
-            await self._dataservice.async_guard_flame_off()
+            await self._dataservice.async_request(STATE_POWER, False)
+        self.async_write_ha_state()
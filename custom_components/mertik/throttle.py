@@ -0,0 +1,60 @@
+"""Publication deadbands and rate limits for high-churn sensors."""
+import math
+
+
+def parse_deadband(value):
+    """Parse '0.5' (absolute) or '5%' (relative). Returns (amount, relative)."""
+    text = str(value).strip()
+    relative = text.endswith("%")
+    amount = float(text.rstrip("%").strip() or 0)
+    if amount < 0 or math.isnan(amount): raise ValueError(f"Invalid deadband: {value!r}")
+    return amount, relative
+
+
+class PublishThrottle:
+    """Decides whether a new value is worth a state write.
+
+    A value is published when it moved by at least the deadband and the
+    minimum interval has passed. Once the maximum interval has passed it is
+    published whatever it is, even unchanged, as a heartbeat. A changed value
+    held back otherwise is counted as suppressed.
+    """
+
+    def __init__(self, deadband=0.0, relative=False, min_interval=0.0, max_interval=0.0):
+        self.deadband = deadband
+        self.relative = relative
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self.value = None
+        self.last_publish = None
+        self.published = 0
+        self.suppressed = 0
+
+    def _significant(self, value) -> bool:
+        if not isinstance(value, (int, float)) or not isinstance(self.value, (int, float)):
+            return value != self.value
+        limit = abs(self.value) * self.deadband / 100 if self.relative else self.deadband
+        return abs(value - self.value) >= limit - 1e-9
+
+    def check(self, value, now, force=False) -> bool:
+        """Return True (and remember the value) if it should be published now."""
+        if self.last_publish is None or force:
+            return self._publish(value, now)
+        elapsed = now - self.last_publish
+        if self.max_interval and elapsed >= self.max_interval:
+            return self._publish(value, now)
+        if value == self.value: return False
+        if self._significant(value) and elapsed >= self.min_interval:
+            return self._publish(value, now)
+        self.suppressed += 1
+        return False
+
+    def _publish(self, value, now) -> bool:
+        self.value = value
+        self.last_publish = now
+        self.published += 1
+        return True
+
+    def as_dict(self) -> dict:
+        return {"published": self.published, "suppressed": self.suppressed}
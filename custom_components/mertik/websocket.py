@@ -0,0 +1,47 @@
+"""Websocket API: live frame subscription."""
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import callback
+
+from .const import DOMAIN, STREAM_QUEUE_SIZE
+from .stream import FrameSubscription
+
+
+@callback
+def async_register(hass) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_frames)
+
+
+@websocket_api.websocket_command({
+    vol.Required("type"): "mertik/subscribe_frames",
+    vol.Optional("entry_id"): str,
+    vol.Optional("queue_size", default=STREAM_QUEUE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=4096)),
+})
+@callback
+def ws_subscribe_frames(hass, connection, msg):
+    """Stream every TX/RX frame and decoded response of a fireplace (the one set up last by default)."""
+    coordinators = hass.data.get(DOMAIN, {})
+    entry_id = msg.get("entry_id") or next(reversed(coordinators), None)
+    coordinator = coordinators.get(entry_id)
+    if coordinator is None:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, "Mertik entry not found")
+        return
+
+    subscription = FrameSubscription(coordinator.mertik, msg["queue_size"])
+
+    async def forward():
+        while True:
+            events = await subscription.async_get_batch()
+            connection.send_message(websocket_api.event_message(
+                msg["id"], {"events": events, "dropped": subscription.dropped}
+            ))
+
+    task = hass.async_create_background_task(forward(), f"{DOMAIN} frame subscription {msg['id']}")
+
+    @callback
+    def unsubscribe():
+        task.cancel()
+        subscription.close()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Import the integration as custom_components.mertik without installing it
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,13 @@
+"""Raw device responses for the tests."""
+from custom_components.mertik.codec import RESPONSE_HEADER
+
+
+def status(flame_raw="A0", bits="0800", rf="00", brightness="C8", mode="2", temperature="D2"):
+    """Raw status response laid out as decode_status reads it (after STX)."""
+    text = "030300000003" + rf + flame_raw + bits + brightness + "00" + mode + "00000" + temperature
+    return b"\x02" + text.encode() + b"\r"
+
+
+def datetime_reply(payload="17011506160E2F", end=b"\x03"):
+    """Raw date/time response (2023-01-21 22:14:47 by default), ETX terminated."""
+    return b"\x02" + (RESPONSE_HEADER + "06" + payload).encode() + end
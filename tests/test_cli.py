@@ -0,0 +1,17 @@
+"""Command line argument handling."""
+import pytest
+
+from custom_components.mertik.cli import main
+
+
+@pytest.mark.parametrize("argv", [["send", "127.0.0.1", "flame", "abc"], ["send", "127.0.0.1", "brightness", "1.5"]])
+def test_send_rejects_non_integer_values(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(argv)
+    assert exit_info.value.code == 2
+    assert "invalid int value" in capsys.readouterr().err
+
+
+def test_send_value_out_of_range(capsys):
+    assert main(["send", "127.0.0.1", "flame", "13"]) == 2
+    assert "out of range" in capsys.readouterr().err
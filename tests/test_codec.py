@@ -0,0 +1,118 @@
+"""Codec frames and decoders against the encodings the client used before the codec."""
+import pytest
+
+from custom_components.mertik import codec, const
+from custom_components.mertik.const import (
+    CMD_PREFIX,
+    CMD_FLAME_PREFIX,
+    CMD_FLAME_SUFFIX,
+    CMD_LIGHT_SET_PREFIX,
+    CMD_LIGHT_SET_SUFFIX,
+    FLAME_STEPS,
+)
+from frames import status
+
+
+def legacy_frame(msg):
+    return bytes(bytearray.fromhex(CMD_PREFIX + msg))
+
+
+def legacy_brightness_code(brightness):
+    normalized_brightness = (brightness - 1) / 254 * 100
+    if normalized_brightness == 100: return "4642"
+    if normalized_brightness == 0: return "3633"
+    l = 36 + round(normalized_brightness / 100 * 8)
+    if l >= 40: l += 1
+    return f"{l:02d}{l:02d}"
+
+
+@pytest.mark.parametrize("level", range(13))
+def test_flame_frames(level):
+    expected = legacy_frame(CMD_FLAME_PREFIX + FLAME_STEPS[level] + CMD_FLAME_SUFFIX)
+    assert codec.flame_frame(level) == expected
+    assert isinstance(codec.flame_frame(level), bytes)
+
+
+def test_flame_out_of_range():
+    assert codec.flame_frame(-1) is None
+    assert codec.flame_frame(13) is None
+
+
+@pytest.mark.parametrize("brightness", range(256))
+def test_light_brightness_frames(brightness):
+    expected = legacy_frame(CMD_LIGHT_SET_PREFIX + legacy_brightness_code(brightness) + CMD_LIGHT_SET_SUFFIX)
+    assert codec.light_brightness_frame(brightness) == expected
+
+
+def test_light_brightness_clamped():
+    assert codec.light_brightness_frame(300) == codec.light_brightness_frame(255)
+    assert codec.light_brightness_frame(-5) == codec.light_brightness_frame(0)
+
+
+@pytest.mark.parametrize("start, target", [(0, 255), (255, 1), (40, 200), (128, 128), (-10, 300)])
+def test_light_transition_steps(start, target):
+    steps = codec.light_transition_steps(start, target)
+    clamped = max(0, min(255, target))
+    assert steps[-1] == (clamped, codec.light_brightness_frame(clamped))
+    frames = [frame for _, frame in steps]
+    # One step per device code, none repeating the starting one
+    assert len(set(frames)) == len(frames)
+    assert codec.light_brightness_frame(max(0, min(255, start))) not in frames[:-1]
+    assert all(frame == codec.light_brightness_frame(b) for b, frame in steps)
+    values = [b for b, _ in steps]
+    assert values == sorted(values, reverse=target < start)
+
+
+def test_light_transition_steps_count():
+    # Every code above the starting one is sent once
+    assert len(codec.light_transition_steps(1, 255)) == len(set(codec.LIGHT_BRIGHTNESS_FRAMES[1:])) - 1
+
+
+def test_fixed_frames():
+    for name in ("STATUS_POLL", "IGNITE", "SHUTDOWN", "AUX_ON", "AUX_OFF", "LIGHT_ON", "LIGHT_OFF", "FAN_ON", "FAN_OFF"):
+        assert getattr(codec, f"FRAME_{name}") == legacy_frame(getattr(const, f"CMD_{name}"))
+
+
+@pytest.mark.parametrize("flame_raw, level", [("A0", 4), ("80", 1), ("FF", 12), ("7B", 0)])
+def test_decode_status_flame(flame_raw, level):
+    frame = codec.decode_response(status(flame_raw=flame_raw))
+    assert isinstance(frame, codec.StatusFrame)
+    assert frame.flame_height == level
+    assert frame.on == (level > 0)
+
+
+def test_decode_status_fields():
+    frame = codec.decode_response(status(rf="2A", mode="2", temperature="D2"))
+    assert frame.rf_signal_level == 0x2A
+    assert frame.mode == "2"
+    assert frame.raw_temperature == 21.0
+    assert not frame.light_on and frame.light_brightness == 0
+
+
+def test_decode_status_aux_needs_flame():
+    # Bit 12 of the status bits is the aux burner; it is ignored at pilot
+    assert codec.decode_response(status(flame_raw="A0", bits="0808")).aux_on is False
+    assert codec.decode_response(status(flame_raw="A0", bits="8008")).aux_on is True
+    assert codec.decode_response(status(flame_raw="7B", bits="8008")).aux_on is False
+
+
+def test_decode_status_malformed():
+    with pytest.raises(ValueError):
+        codec.decode_status("0303000000030000")
+
+
+def test_datetime_round_trip():
+    from datetime import datetime
+    when = datetime(2023, 1, 21, 22, 14, 47)
+    # Example from PROTOCOL.md: 23-01-21 (Saturday) 22:14:47
+    assert codec.datetime_frame(when).endswith(b"17011506160E2F\x03")
+    reply = b"\x02" + (codec.RESPONSE_HEADER + "06" + "17011506160E2F").encode() + b"\r"
+    assert codec.decode_response(reply).as_datetime() == when
+
+
+def test_observed_capabilities():
+    # With the top bit set (16 bit string): 0x0008 aux (only with a flame), 0x0004 light, 0x0002 fan
+    assert codec.observed_capabilities(codec.decode_response(status(bits="8000"))) == set()
+    assert codec.observed_capabilities(codec.decode_response(status(bits="8006"))) == {"fan", "light"}
+    assert codec.observed_capabilities(codec.decode_response(status(bits="8008", flame_raw="A0"))) == {"aux"}
+    assert codec.observed_capabilities(codec.decode_response(status(bits="8008", flame_raw="7B"))) == set()
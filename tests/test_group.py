@@ -0,0 +1,26 @@
+"""Staging the heat demand of a fireplace group."""
+import pytest
+
+from custom_components.mertik.const import GROUP_AUX_STEPS
+from custom_components.mertik.group import split_heat_demand
+
+
+@pytest.mark.parametrize("demand, has_aux, expected", [
+    (0, [True, False], [(0, False), (0, False)]),
+    (-5, [True], [(0, False)]),
+    (7, [True, True], [(7, False), (0, False)]),
+    # The first burner is filled before the second one is lit
+    (12, [False, True], [(12, False), (0, False)]),
+    (15, [False, True], [(12, False), (3, False)]),
+    # Secondary burners only once every main burner is at 12
+    (24, [True, True], [(12, False), (12, False)]),
+    (25, [True, True], [(12, True), (12, False)]),
+    (24 + GROUP_AUX_STEPS + 1, [True, True], [(12, True), (12, True)]),
+    (100, [False, True], [(12, False), (12, True)]),
+])
+def test_split_heat_demand(demand, has_aux, expected):
+    assert split_heat_demand(demand, has_aux) == expected
+
+
+def test_no_fireplaces():
+    assert split_heat_demand(10, []) == []
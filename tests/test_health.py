@@ -0,0 +1,94 @@
+"""Lock wait/hold statistics and event loop lag."""
+import asyncio
+import logging
+import time
+
+from custom_components.mertik.health import LockMonitor, LoopWatchdog
+
+
+def test_lock_statistics_and_waiting_tasks():
+    async def run():
+        monitor = LockMonitor("test", asyncio.Lock(), slow_threshold=10)
+        seen = {}
+
+        async def holder():
+            async with monitor.hold():
+                await asyncio.sleep(0.05)
+
+        async def waiter():
+            async with monitor.hold():
+                seen["held"] = monitor.as_dict()
+
+        first = asyncio.create_task(holder())
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(waiter())
+        await asyncio.sleep(0.01)
+        seen["queued"] = monitor.as_dict()
+        await asyncio.gather(first, second)
+        return monitor, seen
+
+    monitor, seen = asyncio.run(run())
+    assert seen["queued"]["holder"].endswith("holder")
+    (queued,) = seen["queued"]["waiting"].items()
+    assert queued[0].endswith("waiter") and queued[1] == 1
+    assert seen["held"]["holder"].endswith("waiter") and seen["held"]["waiting"] == {}
+    stats = monitor.as_dict()
+    assert stats["acquisitions"] == 2 and stats["slow_holds"] == 0
+    assert stats["hold_max"] >= 0.04 and stats["wait_max"] >= 0.03
+    assert stats["holder"] is None and stats["held_for"] is None
+    assert not monitor.lock.locked()
+
+
+def test_long_hold_reported_once_with_stack(caplog):
+    async def run():
+        monitor = LockMonitor("test", asyncio.Lock(), slow_threshold=0.01)
+        async with monitor.hold():
+            await asyncio.sleep(0.02)
+            now = time.monotonic()
+            monitor.check(now)
+            monitor.check(now)
+        return monitor
+
+    with caplog.at_level(logging.WARNING):
+        monitor = asyncio.run(run())
+    held = [r.getMessage() for r in caplog.records if "lock held for" in r.getMessage()]
+    assert len(held) == 1 and "Stack for" in held[0]
+    # Already reported while held: no second warning on release
+    assert not any("lock was held for" in r.getMessage() for r in caplog.records)
+    assert monitor.slow_holds == 1
+
+
+def test_slow_hold_reported_on_release(caplog):
+    async def run():
+        monitor = LockMonitor("test", asyncio.Lock(), slow_threshold=0.01)
+        async with monitor.hold():
+            await asyncio.sleep(0.02)
+        return monitor
+
+    with caplog.at_level(logging.WARNING):
+        assert asyncio.run(run()).slow_holds == 1
+    assert "test lock was held for" in caplog.text
+
+
+def test_watchdog_measures_loop_lag(caplog):
+    class Monitor:
+        checks = 0
+        def check(self, now): self.checks += 1
+
+    async def run():
+        monitor = Monitor()
+        watchdog = LoopWatchdog([monitor], interval=0.01, lag_threshold=0.03)
+        watchdog.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.08)  # Block the loop
+        await asyncio.sleep(0.03)
+        watchdog.stop()
+        return watchdog, monitor
+
+    with caplog.at_level(logging.WARNING):
+        watchdog, monitor = asyncio.run(run())
+    stats = watchdog.as_dict()
+    assert stats["ticks"] >= 2 and monitor.checks == stats["ticks"]
+    assert stats["slow_ticks"] >= 1 and stats["lag_max"] >= 0.05
+    assert "Event loop was blocked" in caplog.text
+    assert watchdog._handle is None
@@ -0,0 +1,56 @@
+"""Snapshot ring buffer and hourly aggregates."""
+from custom_components.mertik.history import HourlyAggregator, SnapshotHistory
+
+
+def test_ring_buffer_before_wrapping():
+    history = SnapshotHistory(4)
+    history.append(1.0, 3, 20.5, 0x1, 40)
+    history.append(2.0, 4, 21.0, 0x3, 300)
+    assert len(history) == 2
+    assert history.column("ts") == [1.0, 2.0]
+    # RF levels are clamped to a byte
+    assert history.column("rf") == [40, 255]
+
+
+def test_ring_buffer_wraps_oldest_first():
+    history = SnapshotHistory(3)
+    for i in range(5): history.append(float(i), i, 20.0 + i, i, i)
+    assert len(history) == 3
+    assert history.column("ts") == [2.0, 3.0, 4.0]
+    assert history.column("flame") == [2, 3, 4]
+    assert history.column("temperature") == [22.0, 23.0, 24.0]
+
+
+def test_since():
+    history = SnapshotHistory(3)
+    for i in range(5): history.append(float(i), i, 20.0, i, -5)
+    assert history.since(2.0) == [
+        {"ts": 3.0, "flame": 3, "temperature": 20.0, "flags": 3, "rf": 0},
+        {"ts": 4.0, "flame": 4, "temperature": 20.0, "flags": 4, "rf": 0},
+    ]
+    assert history.since(10.0) == []
+
+
+def test_hourly_aggregate_completes_on_next_hour():
+    hourly = HourlyAggregator()
+    assert hourly.add(3600, 6, 20.0, True) is None
+    assert hourly.add(3600 + 900, 0, 22.0, True) is None
+    assert hourly.add(3600 + 1800, 12, 21.0, False) is None
+    done = hourly.add(7200, 2, 19.0, True)
+    assert done == {
+        "start": 3600,
+        "samples": 3,
+        "temperature": {"mean": 21.0, "min": 20.0, "max": 22.0},
+        # Off counts as level 0, the pilot (on at level 0) as not burning
+        "flame": {"mean": 2.0, "min": 0, "max": 6},
+        "burning_ratio": 0.333,
+    }
+    assert hourly.as_dict()["start"] == 7200 and hourly.samples == 1
+
+
+def test_hourly_gap_returns_the_last_hour_with_samples():
+    hourly = HourlyAggregator()
+    hourly.add(3600, 4, 20.0, True)
+    done = hourly.add(5 * 3600, 4, 20.0, True)
+    assert done["start"] == 3600
+    assert HourlyAggregator().as_dict() == {"start": None, "samples": 0}
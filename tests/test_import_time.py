@@ -0,0 +1,65 @@
+"""The package and ``core`` import without Home Assistant and stay cheap to import."""
+import asyncio
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import custom_components.mertik as package
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PLATFORMS = ("climate", "number", "switch", "binary_sensor", "sensor", "fan", "light")
+HA_MODULES = ("integration", "config_flow", "diagnostics", "websocket", "mertikdatacoordinator") + PLATFORMS
+LAZY_MODULES = ("proxy", "mqtt_bridge", "replay", "journal", "preheat", "history", "runtime")
+
+# Cumulative import time budgets in microseconds, well above what a cold import takes
+BUDGETS = {"custom_components.mertik": 50_000, "custom_components.mertik.core": 250_000}
+
+
+def import_times(module):
+    """Run -X importtime for module in a fresh interpreter; {module: cumulative us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_skips_home_assistant_and_platforms(module):
+    imported = import_times(module)
+    assert not [name for name in imported if name.split(".")[0] == "homeassistant"]
+    for name in HA_MODULES + LAZY_MODULES:
+        assert f"custom_components.mertik.{name}" not in imported
+
+
+@pytest.mark.parametrize("module, budget", BUDGETS.items())
+def test_import_time_budget(module, budget):
+    # Best of three, so a busy machine does not fail the test
+    assert min(import_times(module)[module] for _ in range(3)) < budget
+
+
+def test_entry_points_import_integration_in_executor(monkeypatch):
+    calls = []
+    integration = types.SimpleNamespace(async_setup_entry=lambda hass, entry: asyncio.sleep(0, result=entry))
+
+    class FakeHass:
+        async def async_add_import_executor_job(self, func, *args):
+            calls.append((func, args))
+            monkeypatch.setitem(sys.modules, args[0], integration)
+            return integration
+
+    monkeypatch.delitem(sys.modules, "custom_components.mertik.integration", raising=False)
+    hass = FakeHass()
+    assert asyncio.run(package.async_setup_entry(hass, "entry")) == "entry"
+    assert asyncio.run(package.async_setup_entry(hass, "again")) == "again"
+    # Imported once, in the executor
+    assert [args for _, args in calls] == [("custom_components.mertik.integration",)]
@@ -0,0 +1,115 @@
+"""Optimistic intents: confirmed, refuted or expired against decoded statuses."""
+import time
+import types
+
+import pytest
+
+from custom_components.mertik import mertik as mertik_module
+from custom_components.mertik.codec import decode_response
+from custom_components.mertik.const import INTENT_GRACE, INTENT_TTL
+from custom_components.mertik.history import FLAG_AUX, FLAG_GUARD_FLAME, FLAG_ON, pack_flags
+from custom_components.mertik.mertik import Mertik
+from frames import status
+
+AUX_OFF = status(bits="8000")
+AUX_ON = status(bits="8008")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mertik_module, "time", types.SimpleNamespace(monotonic=lambda: now[0], time=time.time))
+    return now
+
+
+def poll(device, reply):
+    """A status poll answered with reply, as _async_send_frame handles it."""
+    device._tx_seq += 1
+    device._handle_response(reply)
+
+
+def test_intent_shown_until_confirmed(clock):
+    device = Mertik("127.0.0.1")
+    poll(device, AUX_OFF)
+    ids = [device.set_intent("_aux_on", True)]
+    assert device.is_aux_on
+    device._tx_seq += 1  # The aux command itself
+    device.intent_sent(ids, True)
+    poll(device, AUX_ON)
+    assert device.is_aux_on and not device.has_intent("_aux_on")
+    assert device.intent_stats["confirmed"] == 1
+
+
+def test_poll_sent_before_the_command_does_not_judge_it(clock):
+    device = Mertik("127.0.0.1")
+    ids = [device.set_intent("_aux_on", True)]
+    # In flight: a status decoded now cannot show the command yet
+    device._handle_response(AUX_OFF)
+    assert device.is_aux_on and device.has_intent("_aux_on")
+    device._tx_seq += 1
+    device.intent_sent(ids, True)
+    # A reply to a frame sent no later than the command is not judged either
+    clock[0] += INTENT_GRACE + 1
+    device._handle_response(AUX_OFF)
+    assert device.is_aux_on and device.has_intent("_aux_on")
+
+
+def test_refuted_after_grace(clock):
+    device = Mertik("127.0.0.1")
+    ids = [device.set_intent("_aux_on", True)]
+    device._tx_seq += 1
+    device.intent_sent(ids, True)
+    poll(device, AUX_OFF)
+    # Within the grace period the device may not have switched yet
+    assert device.is_aux_on
+    clock[0] += INTENT_GRACE + 1
+    poll(device, AUX_OFF)
+    assert not device.is_aux_on and not device.has_intent("_aux_on")
+    assert device.intent_stats["refuted"] == 1
+
+
+def test_expired_while_never_answered(clock):
+    device = Mertik("127.0.0.1")
+    device.set_intent("_aux_on", True)
+    clock[0] += INTENT_TTL + 1
+    poll(device, AUX_OFF)
+    assert not device.is_aux_on
+    assert device.intent_stats["expired"] == 1
+
+
+def test_failed_send_rolls_back_on_next_status(clock):
+    device = Mertik("127.0.0.1")
+    poll(device, AUX_OFF)
+    ids = [device.set_intent("_aux_on", True)]
+    device.intent_sent(ids, False)
+    assert not device.has_intent("_aux_on")
+    assert device.intent_stats["failed"] == 1
+    poll(device, AUX_OFF)
+    assert not device.is_aux_on
+
+
+def test_newer_intent_supersedes(clock):
+    device = Mertik("127.0.0.1")
+    device.set_intent("_light_brightness", 100)
+    device.set_intent("_light_brightness", 200)
+    assert device.light_brightness == 200
+    assert device.intent_stats["superseded"] == 1
+
+
+def test_read_cache_keeps_the_decoded_status(clock):
+    device = Mertik("127.0.0.1")
+    poll(device, AUX_OFF)
+    device.set_intent("_aux_on", True)
+    device.set_intent("flameHeight", 9)
+    poll(device, AUX_OFF)
+    decoded = device.read_cache("status")
+    # Runtime, history and preheat are fed from this, not from the intents
+    assert device.is_aux_on and device.get_flame_height() == 9
+    assert not decoded.aux_on and decoded.flame_height == decode_response(AUX_OFF).flame_height
+
+
+def test_pack_flags_from_status():
+    assert pack_flags(decode_response(status(flame_raw="A0", bits="8008"))) == FLAG_ON | FLAG_AUX
+    pilot = decode_response(status(flame_raw="00", bits="0808"))
+    assert pilot.lit and not pilot.on
+    assert pack_flags(pilot) == FLAG_ON | FLAG_GUARD_FLAME
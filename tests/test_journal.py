@@ -0,0 +1,39 @@
+"""Command journal: collapsing, expiry and the reconciler state it replays."""
+from custom_components.mertik.journal import CommandJournal, desired_change
+
+
+def test_pending_keeps_latest_per_actuator_power_first():
+    journal = CommandJournal()
+    journal.add("async_set_flame_height", [4], 0)
+    journal.add("async_light_on", [], 1)
+    journal.add("async_set_flame_height", [9], 2)
+    journal.add("async_ignite_fireplace", [], 3)
+    assert [(e["command"], e["args"]) for e in journal.pending(10)] == [
+        ("async_ignite_fireplace", []), ("async_set_flame_height", [9]), ("async_light_on", []),
+    ]
+
+
+def test_shutdown_drops_burner_entries():
+    journal = CommandJournal()
+    journal.add("async_set_flame_height", [6], 0)
+    journal.add("async_aux_on", [], 1)
+    journal.add("async_guard_flame_off", [], 2)
+    assert [e["command"] for e in journal.pending(10)] == ["async_guard_flame_off"]
+
+
+def test_ignition_expires_sooner():
+    journal = CommandJournal(ttl=900, ignition_ttl=60)
+    journal.add("async_ignite_fireplace", [], 0)
+    journal.add("async_fan_on", [], 0)
+    assert [e["command"] for e in journal.pending(120)] == ["async_fan_on"]
+    assert journal.stats["expired"] == 1
+
+
+def test_desired_change():
+    journal = CommandJournal()
+    for command, args in (("async_set_flame_height", [7]), ("async_set_eco", []),
+                          ("async_guard_flame_off", []), ("async_set_light_brightness", [90])):
+        journal.add(command, args, 0)
+    assert [desired_change(e) for e in journal.entries] == [
+        ("flame", 7), ("eco", True), ("power", False), ("light", True),
+    ]
@@ -0,0 +1,200 @@
+"""MQTT bridge: commands reach the coordinator as requests, state is published once per change."""
+import asyncio
+
+import pytest
+
+from custom_components.mertik.core import describe
+from custom_components.mertik.mertik import Mertik
+from custom_components.mertik.mqtt_bridge import LocalBroker, MertikMqttBridge
+from frames import status
+
+BASE = "mertik/living"
+
+
+class FakeCoordinator:
+    def __init__(self, fail=False):
+        self.mertik = Mertik("test")
+        self.light_brightness_target = 255
+        self.requests = []
+        self.transitions_cancelled = 0
+        self._fail = fail
+
+    async def async_request(self, key, value):
+        if self._fail: raise RuntimeError("device gone")
+        self.requests.append((key, value))
+
+    def cancel_light_transition(self):
+        self.transitions_cancelled += 1
+
+
+async def send(coordinator, *messages):
+    broker = LocalBroker()
+    bridge = MertikMqttBridge(coordinator, "mertik/living", broker.publish, broker.subscribe, min_interval=0)
+    await bridge.async_start()
+    for command, payload in messages:
+        await broker.publish(f"mertik/living/{command}/set", payload)
+    await asyncio.sleep(0.01)
+    await bridge.async_stop(publish_offline=False)
+    return bridge.stats
+
+
+@pytest.mark.parametrize("command, payload, expected", [
+    ("power", "ON", ("power", True)),
+    ("power", "off", ("power", False)),
+    ("flame", "7", ("flame", 7)),
+    ("flame", "0", ("flame", 0)),
+    ("aux", "ON", ("aux", True)),
+    ("light", "OFF", ("light", False)),
+    ("fan", "1", ("fan", True)),
+    ("mode", "eco", ("eco", True)),
+    ("mode", "Manual", ("eco", False)),
+    ("brightness", "0", ("light", False)),
+])
+def test_command_becomes_request(command, payload, expected):
+    coordinator = FakeCoordinator()
+    stats = asyncio.run(send(coordinator, (command, payload)))
+    assert coordinator.requests == [expected]
+    assert stats["commands"] == 1
+
+
+def test_brightness_sets_light_target():
+    coordinator = FakeCoordinator()
+    asyncio.run(send(coordinator, ("brightness", "400")))
+    assert coordinator.light_brightness_target == 255
+    asyncio.run(send(coordinator, ("brightness", "128")))
+    assert coordinator.light_brightness_target == 128
+    assert coordinator.requests == [("light", True), ("light", True)]
+    assert coordinator.transitions_cancelled == 2
+
+
+@pytest.mark.parametrize("command, payload", [("flame", "13"), ("power", "PILOT"), ("mode", "turbo"), ("unknown", "1")])
+def test_invalid_command_rejected(command, payload):
+    coordinator = FakeCoordinator()
+    stats = asyncio.run(send(coordinator, (command, payload)))
+    assert coordinator.requests == []
+    assert stats["rejected"] == 1
+
+
+def test_failing_request_is_logged_not_raised(caplog):
+    stats = asyncio.run(send(FakeCoordinator(fail=True), ("power", "ON")))
+    assert stats["failed_commands"] == 1
+    assert "MQTT power command failed" in caplog.text
+
+
+async def publish_states(coordinator, *snapshots, min_interval=0):
+    """Feed (available, reply) snapshots to a running bridge; returns the broker and the stats."""
+    broker = LocalBroker()
+    bridge = MertikMqttBridge(coordinator, BASE, broker.publish, broker.subscribe, min_interval=min_interval)
+    await bridge.async_start()
+    for available, reply in snapshots:
+        if reply is not None: coordinator.mertik._handle_response(reply)
+        bridge.update(available)
+        await asyncio.sleep(0.01)
+    await bridge.async_stop(publish_offline=False)
+    return broker, bridge.stats
+
+
+def test_publishes_retained_state_then_only_changes():
+    coordinator = FakeCoordinator()
+    broker, stats = asyncio.run(publish_states(coordinator, (True, status()), (True, status(flame_raw="FF"))))
+    assert broker.retained[f"{BASE}/available"] == "online"
+    assert broker.retained[f"{BASE}/on"] == "ON"
+    assert broker.retained[f"{BASE}/light"] == "OFF"
+    assert broker.retained[f"{BASE}/temp"] == "21.0"
+    assert all(retain for _, _, retain in broker.messages)
+    # Availability plus every field, then only the flame height that changed
+    first = 1 + len(describe(coordinator.mertik))
+    assert stats["published"] == first + 1
+    assert broker.messages[first:] == [(f"{BASE}/flame", "12", True)]
+
+
+def test_changes_within_the_interval_are_coalesced():
+    async def run():
+        coordinator = FakeCoordinator()
+        broker = LocalBroker()
+        bridge = MertikMqttBridge(coordinator, BASE, broker.publish, broker.subscribe, min_interval=0.2)
+        coordinator.mertik._handle_response(status())
+        bridge.update(True)
+        await bridge.async_start()
+        await asyncio.sleep(0.01)
+        first = len(broker.messages)
+        # While the worker waits out the interval, three flame heights come in
+        for flame_raw in ("C0", "FF", "00"):
+            coordinator.mertik._handle_response(status(flame_raw=flame_raw))
+            bridge.update(True)
+        assert len(broker.messages) == first
+        await asyncio.sleep(0.3)
+        await bridge.async_stop(publish_offline=False)
+        return broker, bridge.stats, broker.messages[first:]
+    broker, stats, later = asyncio.run(run())
+    assert stats["coalesced"] == 2
+    flame = [payload for topic, payload, _ in later if topic == f"{BASE}/flame"]
+    assert flame == ["0"]
+
+
+def test_change_reverted_before_publishing_is_dropped():
+    coordinator = FakeCoordinator()
+    bridge = MertikMqttBridge(coordinator, BASE, LocalBroker().publish, LocalBroker().subscribe)
+    bridge._published = {f"{BASE}/{field}": payload for field, payload in (("available", "online"), ("flame", "0"))}
+    coordinator.mertik._handle_response(status(flame_raw="FF"))
+    bridge.update(True)
+    assert bridge._pending[f"{BASE}/flame"] == "12"
+    coordinator.mertik._handle_response(status(flame_raw="00"))
+    bridge.update(True)
+    assert f"{BASE}/flame" not in bridge._pending
+
+
+def test_availability():
+    coordinator = FakeCoordinator()
+    broker, _ = asyncio.run(publish_states(coordinator, (True, status()), (False, None)))
+    assert broker.retained[f"{BASE}/available"] == "offline"
+    # Offline only flips availability; the last known state stays retained
+    assert broker.messages[-1] == (f"{BASE}/available", "offline", True)
+    assert broker.retained[f"{BASE}/on"] == "ON"
+
+
+def test_stop_publishes_offline():
+    async def run():
+        broker = LocalBroker()
+        bridge = MertikMqttBridge(FakeCoordinator(), BASE, broker.publish, broker.subscribe, min_interval=0)
+        await bridge.async_start()
+        bridge.update(True)
+        await asyncio.sleep(0.01)
+        await bridge.async_stop()
+        return broker
+    assert asyncio.run(run()).retained[f"{BASE}/available"] == "offline"
+
+
+def test_failed_publish_is_retried():
+    async def run():
+        broker = LocalBroker()
+        calls = []
+
+        async def flaky(topic, payload, retain):
+            calls.append(topic)
+            if len(calls) == 1: raise OSError("broker away")
+            await broker.publish(topic, payload, retain)
+
+        bridge = MertikMqttBridge(FakeCoordinator(), BASE, flaky, broker.subscribe, min_interval=0)
+        await bridge.async_start()
+        bridge.update(False)
+        await asyncio.sleep(0.01)
+        await bridge.async_stop(publish_offline=False)
+        return broker, bridge.stats
+    broker, stats = asyncio.run(run())
+    assert stats["failed"] == 1 and stats["published"] == 1
+    assert broker.retained == {f"{BASE}/available": "offline"}
+
+
+def test_command_tasks_are_referenced_until_done():
+    async def run():
+        coordinator = FakeCoordinator()
+        broker = LocalBroker()
+        bridge = MertikMqttBridge(coordinator, BASE, broker.publish, broker.subscribe, min_interval=0)
+        await bridge.async_start()
+        await broker.publish(f"{BASE}/aux/set", "ON")
+        running = len(bridge._commands)
+        await asyncio.sleep(0.01)
+        await bridge.async_stop(publish_offline=False)
+        return running, len(bridge._commands), coordinator.requests
+    assert asyncio.run(run()) == (1, 0, [("aux", True)])
@@ -0,0 +1,95 @@
+"""Cached reads that request several payloads back to back on one connection."""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from custom_components.mertik.codec import FRAME_DATETIME_GET, FRAME_STATUS_POLL, DateTimeFrame, StatusFrame
+from custom_components.mertik.mertik import Mertik
+from custom_components.mertik.replay import MertikSimulator
+from custom_components.mertik.rtt import RttEstimator
+from frames import datetime_reply, status
+
+WHEN = datetime(2023, 1, 21, 22, 14, 47)
+
+
+class DribblingModule:
+    """Answers every frame of a write, a few bytes at a time; logs each write."""
+
+    def __init__(self, responses, chunk=5):
+        self.responses = responses
+        self.chunk = chunk
+        self.writes = []
+
+    async def handle(self, reader, writer):
+        while data := await reader.read(1024):
+            self.writes.append(data)
+            reply = b"".join(self.responses.get(b"\x02" + part, b"") for part in data.split(b"\x02")[1:])
+            for i in range(0, len(reply), self.chunk):
+                writer.write(reply[i:i + self.chunk])
+                await writer.drain()
+                await asyncio.sleep(0.001)
+        writer.close()
+
+
+async def read_from(handler, payloads, read_rtt=None, **kwargs):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    device = Mertik("127.0.0.1", server.sockets[0].getsockname()[1])
+    if read_rtt is not None: device.read_rtt = read_rtt
+    try:
+        return device, await device.async_read(payloads, **kwargs)
+    finally:
+        await device.async_close()
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize("end", [b"\x03", b"\r"])
+def test_replies_split_across_reads(end):
+    module = DribblingModule({FRAME_STATUS_POLL: status(), FRAME_DATETIME_GET: datetime_reply(end=end)})
+    device, result = asyncio.run(read_from(module.handle, ("status", "datetime")))
+    assert isinstance(result["status"], StatusFrame)
+    assert result["datetime"].as_datetime() == WHEN
+    # Both answered by the pipelined write: no per-frame fallback
+    assert module.writes == [FRAME_STATUS_POLL + FRAME_DATETIME_GET]
+
+
+def test_datetime_reply_updates_clock():
+    module = DribblingModule({FRAME_STATUS_POLL: status(), FRAME_DATETIME_GET: datetime_reply()})
+    device, _ = asyncio.run(read_from(module.handle, ("status", "datetime")))
+    assert isinstance(device.device_clock, DateTimeFrame)
+    assert device.device_clock.as_datetime() == WHEN
+
+
+def test_unanswered_payload_is_not_retried_once_the_module_answered():
+    # A module that answers status but ignores the datetime request
+    module = DribblingModule({FRAME_STATUS_POLL: status()})
+    device, result = asyncio.run(read_from(module.handle, ("status", "datetime"), read_rtt=RttEstimator(0.05, 0.1)))
+    assert isinstance(result["status"], StatusFrame) and result["datetime"] is None
+    assert module.writes == [FRAME_STATUS_POLL + FRAME_DATETIME_GET]
+    assert device.failures == 0 and device.read_rtt.timeouts == 0
+    # Not asked for again before its TTL
+    assert device.read_ages().keys() == {"status", "datetime"} and device.read_cache("datetime") is None
+
+
+def test_simulator_replay_and_cache():
+    simulator = MertikSimulator([
+        (0.0, "tx", FRAME_STATUS_POLL), (0.1, "rx", status(flame_raw="FF")),
+        (0.2, "tx", FRAME_DATETIME_GET), (0.3, "rx", datetime_reply()),
+    ])
+
+    async def run():
+        port = await simulator.start()
+        device = Mertik("127.0.0.1", port)
+        first = await device.async_read(("status", "datetime"))
+        await device.async_close()
+        await simulator.stop()
+        # Within their lifetime both payloads come from the cache, with the module gone
+        second = await device.async_read(("status", "datetime"), max_age={"status": 60})
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first["status"].flame_height == 12
+    assert first["datetime"].as_datetime() == WHEN
+    assert second == first
+
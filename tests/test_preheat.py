@@ -0,0 +1,101 @@
+"""Optimal start: learned rates, planned start and schedule expiry."""
+import pytest
+
+from custom_components.mertik.const import (
+    MAX_INTEGRATION_GAP,
+    PREHEAT_DEFAULT_HEAT_RATE,
+    PREHEAT_MARGIN,
+    PREHEAT_MIN_SEGMENT,
+)
+from custom_components.mertik.preheat import PreheatModel
+
+
+def run(model, start, seconds, temperature, rate, on, flame, step=60):
+    """Feed one poll per step while the temperature changes by rate °C/h; returns (end ts, temperature)."""
+    ts = start
+    for _ in range(seconds // step):
+        model.update(ts, temperature, on, flame)
+        ts += step
+        temperature += rate * step / 3600
+    return ts, temperature
+
+
+def test_learns_heat_rate_per_level_and_cool_rate():
+    model = PreheatModel()
+    ts, temp = run(model, 0, 1200, 18.0, 3.0, True, 8)
+    ts, temp = run(model, ts, 1200, temp, -0.6, False, 0)
+    model.update(ts, temp, True, 8)
+    assert model.heat_rates[8] == pytest.approx(3.0, rel=0.05)
+    assert model.cool_rate == pytest.approx(0.6, rel=0.05)
+    assert model.heat_samples[8] == 1 and model.cool_samples == 1
+
+
+def test_pilot_counts_as_cooling():
+    model = PreheatModel()
+    ts, temp = run(model, 0, 1200, 20.0, -1.0, True, 0)
+    model.update(ts, temp, True, 5)
+    assert model.cool_samples == 1 and model.heat_samples == [0] * 13
+
+
+def test_short_segments_and_outages_are_not_learned():
+    model = PreheatModel()
+    ts, temp = run(model, 0, PREHEAT_MIN_SEGMENT - 120, 18.0, 3.0, True, 8)
+    model.update(ts, temp, False, 0)
+    # A gap longer than MAX_INTEGRATION_GAP restarts the segment
+    run(model, ts, 900, temp, -0.5, False, 0)
+    model.update(ts + 900 + MAX_INTEGRATION_GAP + 1, temp, True, 4)
+    assert model.heat_samples[8] == 0 and model.cool_samples == 0
+
+
+def test_best_level():
+    model = PreheatModel()
+    assert model.best_level() == (12, PREHEAT_DEFAULT_HEAT_RATE)
+    model.heat_rates[6] = 2.5
+    model.heat_rates[12] = 2.0
+    model.heat_rates[3] = -0.1
+    assert model.best_level() == (6, 2.5)
+
+
+def test_plan_follows_the_formula():
+    model = PreheatModel()
+    model.heat_rates[12] = 2.0
+    model.cool_rate = 0.5
+    now, deadline = 0, 4 * 3600
+    # (4 - 2 / 2) / (1 + 0.5 / 2) = 2.4 h
+    assert model.plan(now, 18.0, 20.0, deadline) == pytest.approx(2.4 * 3600 - PREHEAT_MARGIN)
+
+
+def test_plan_is_never_before_now_nor_after_the_deadline():
+    model = PreheatModel()
+    # Too cold to make it: start at once
+    assert model.plan(1000, 10.0, 22.0, 1000 + 3600) == 1000
+    # Already warmer than the target: not after the deadline
+    deadline = 1000 + 2 * 3600
+    assert model.plan(1000, 25.0, 20.0, deadline) == deadline - PREHEAT_MARGIN
+    # Deadline passed
+    assert model.plan(1000, 18.0, 20.0, 500) == 1000
+
+
+def test_schedule_action():
+    model = PreheatModel()
+    schedule = {"target": 21.0, "at": 10 * 3600}
+    assert model.schedule_action(0, 20.0, None) is None
+    assert model.schedule_action(0, 20.0, schedule) is None
+    # Ten minutes before the deadline a 1 °C rise is overdue
+    late = schedule["at"] - 600
+    assert model.schedule_action(late, 20.0, schedule) == "start"
+    # Unknown temperature: keep waiting, but never past the deadline
+    assert model.schedule_action(late, None, schedule) is None
+    assert model.schedule_action(schedule["at"], None, schedule) == "expire"
+    assert model.schedule_action(schedule["at"] + 7200, 25.0, schedule) == "expire"
+
+
+def test_restore_round_trip():
+    model = PreheatModel()
+    model.heat_rates[5] = 1.234
+    model.heat_samples[5] = 3
+    model.cool_rate = 0.42
+    model.cool_samples = 2
+    restored = PreheatModel()
+    restored.restore(model.as_dict())
+    assert restored.as_dict() == model.as_dict()
@@ -0,0 +1,108 @@
+"""Local proxy: framing, status cache and shutdown."""
+import asyncio
+import time
+
+import pytest
+
+from custom_components.mertik.codec import FRAME_AUX_ON, FRAME_LIGHT_OFF, FRAME_STATUS_POLL, split_frames
+from custom_components.mertik.proxy import MertikProxy
+
+
+class FakeMertik:
+    """Upstream side: echoes each frame back with a marker, optionally holding replies."""
+
+    def __init__(self):
+        self.keep_alive = False
+        self.last_status_response = None
+        self.last_status_time = 0.0
+        self.sent = []
+        self.release = None
+
+    async def _async_send_frame(self, frame):
+        self.sent.append(frame)
+        if self.release is not None: await self.release.wait()
+        return b"ok:" + frame
+
+    async def async_close(self): pass
+
+
+def test_split_frames():
+    frames, rest = split_frames(b"\x02AB\x03\x02CD\x03\n\x02E")
+    assert frames == [b"\x02AB\x03", b"\x02CD\x03\n"]
+    assert rest == b"\x02E"
+    frames, rest = split_frames(rest + b"F\x03")
+    assert frames == [b"\x02EF\x03"] and rest == b""
+
+
+async def _exchange(proxy, *writes, expected):
+    reader, writer = await asyncio.open_connection("127.0.0.1", proxy.port)
+    for data in writes:
+        writer.write(data)
+        await writer.drain()
+        await asyncio.sleep(0.01)
+    received = b""
+    while len(received) < len(expected):
+        received += await asyncio.wait_for(reader.read(1024), 1)
+    writer.close()
+    assert received == expected
+
+
+def test_frames_are_split_on_etx():
+    async def run():
+        mertik = FakeMertik()
+        proxy = MertikProxy(mertik, 0)
+        await proxy.async_start()
+        try:
+            # Two frames in one write, then one frame across two writes
+            await _exchange(proxy, FRAME_AUX_ON + FRAME_LIGHT_OFF, expected=b"ok:" + FRAME_AUX_ON + b"ok:" + FRAME_LIGHT_OFF)
+            await _exchange(proxy, FRAME_AUX_ON[:5], FRAME_AUX_ON[5:], expected=b"ok:" + FRAME_AUX_ON)
+        finally:
+            await proxy.async_stop()
+        return mertik.sent
+    assert asyncio.run(run()) == [FRAME_AUX_ON, FRAME_LIGHT_OFF, FRAME_AUX_ON]
+
+
+def test_binds_loopback_by_default():
+    async def run():
+        proxy = MertikProxy(FakeMertik(), 0)
+        await proxy.async_start()
+        host = proxy._server.sockets[0].getsockname()[0]
+        await proxy.async_stop()
+        return host
+    assert asyncio.run(run()) == "127.0.0.1"
+
+
+def test_status_poll_served_from_cache():
+    async def run():
+        mertik = FakeMertik()
+        mertik.last_status_response = b"\x02cached\r"
+        mertik.last_status_time = time.monotonic()
+        proxy = MertikProxy(mertik, 0, status_ttl=15)
+        worker = asyncio.create_task(proxy._async_worker())
+        cached = await proxy.async_forward(FRAME_STATUS_POLL)
+        mertik.last_status_time -= 20
+        forwarded = await proxy.async_forward(FRAME_STATUS_POLL)
+        worker.cancel()
+        return cached, forwarded, proxy.stats
+    cached, forwarded, stats = asyncio.run(run())
+    assert cached == b"\x02cached\r"
+    assert forwarded == b"ok:" + FRAME_STATUS_POLL
+    assert stats["cache_hits"] == 1 and stats["forwarded"] == 1
+
+
+def test_stop_releases_waiting_clients():
+    async def run():
+        mertik = FakeMertik()
+        mertik.release = asyncio.Event()
+        proxy = MertikProxy(mertik, 0)
+        await proxy.async_start()
+        # One frame in flight upstream, two more queued behind it
+        waiting = [asyncio.create_task(proxy.async_forward(FRAME_AUX_ON)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        await proxy.async_stop()
+        results = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), 1)
+        with pytest.raises(ConnectionError):
+            await proxy.async_forward(FRAME_AUX_ON)
+        return results
+    results = asyncio.run(run())
+    assert len(results) == 3 and all(isinstance(r, ConnectionError) for r in results)
@@ -0,0 +1,148 @@
+"""Desired-state reconciler against a fake device."""
+import asyncio
+
+from custom_components.mertik.const import RECONCILE_BACKOFF_BASE, RECONCILE_BACKOFF_MAX
+from custom_components.mertik.reconciler import Reconciler
+
+
+class FakeDevice:
+    """Device state per reconciler key; commands are recorded and applied when obeying."""
+
+    def __init__(self, obey=True, **state):
+        self.state = {"power": False, "flame": 0, "aux": False, "light": False, "fan": False, "eco": False, **state}
+        self.obey = obey
+        self.sent = []
+        self.pending = set()
+        self.blocked = set()
+        self.now = 0.0
+
+    async def send(self, key, value):
+        self.sent.append((key, value))
+        if self.obey: self.state[key] = value
+
+    def reconciler(self):
+        return Reconciler(
+            self.state.get, self.send, lambda key: key not in self.blocked, lambda key: key in self.pending,
+            clock=lambda: self.now,
+        )
+
+
+def test_reconcile_sends_in_order():
+    device = FakeDevice()
+    r = device.reconciler()
+    r.set_desired("light", True)
+    r.set_desired("flame", 6)
+    r.set_desired("power", True)
+    assert device.sent == []
+    asyncio.run(r.async_reconcile())
+    assert device.sent == [("power", True), ("flame", 6), ("light", True)]
+
+
+def test_set_desired_ignores_what_the_device_already_reports():
+    device = FakeDevice(power=True)
+    r = device.reconciler()
+    r.set_desired("power", True)
+    assert r.desired == {}
+
+
+def test_power_off_drops_burner_wishes():
+    device = FakeDevice(power=True)
+    r = device.reconciler()
+    r.set_desired("flame", 8)
+    r.set_desired("aux", True)
+    r.set_desired("power", False)
+    assert r.desired == {"power": False}
+
+
+def test_convergence_pops_the_wish():
+    device = FakeDevice()
+    r = device.reconciler()
+    r.set_desired("power", True)
+    asyncio.run(r.async_reconcile())
+    assert "power" in r.desired
+    asyncio.run(r.async_reconcile())
+    assert r.desired == {} and r.backoff == {}
+    assert r.stats["converged"] == 1
+    assert device.sent == [("power", True)]
+
+
+def test_backoff_grows_and_is_capped():
+    device = FakeDevice(obey=False)
+    r = device.reconciler()
+    r.set_desired("fan", True)
+    delays = []
+    for _ in range(8):
+        asyncio.run(r.async_reconcile())
+        attempts, next_try = r.backoff["fan"]
+        delays.append(next_try - device.now)
+        # Nothing is resent before the backoff runs out
+        asyncio.run(r.async_reconcile())
+        assert len(device.sent) == attempts
+        device.now = next_try
+    assert delays[:4] == [RECONCILE_BACKOFF_BASE * 2 ** n for n in range(4)]
+    assert delays[-1] == RECONCILE_BACKOFF_MAX
+    assert r.stats["retries"] == 7
+
+
+def test_pending_intent_is_not_judged():
+    device = FakeDevice(obey=False)
+    r = device.reconciler()
+    r.set_desired("aux", True)
+    device.pending.add("aux")
+    asyncio.run(r.async_reconcile())
+    assert device.sent == []
+    # Still pending after the backoff: neither resent nor dropped
+    device.now = RECONCILE_BACKOFF_MAX
+    asyncio.run(r.async_reconcile())
+    assert device.sent == [] and r.desired == {"aux": True}
+    device.pending.clear()
+    asyncio.run(r.async_reconcile())
+    assert device.sent == [("aux", True)]
+
+
+def test_blocked_key_waits_without_counting_an_attempt():
+    device = FakeDevice()
+    r = device.reconciler()
+    r.set_desired("flame", 5)
+    device.blocked.add("flame")
+    asyncio.run(r.async_reconcile())
+    assert device.sent == [] and "flame" not in r.backoff
+
+
+def test_smart_sync_off_accepts_the_device_state():
+    device = FakeDevice(obey=False)
+    r = device.reconciler()
+    r.smart_sync_enabled = False
+    r.set_desired("eco", True)
+    asyncio.run(r.async_reconcile())
+    assert device.sent == [("eco", True)]
+    device.now = RECONCILE_BACKOFF_MAX
+    asyncio.run(r.async_reconcile())
+    # Sent once, then dropped instead of retried
+    assert device.sent == [("eco", True)]
+    assert r.desired == {} and r.stats["accepted"] == 1
+    # The declined value is not asserted again until Smart Sync is back on
+    r.set_desired("eco", True)
+    assert r.desired == {}
+    r.smart_sync_enabled = True
+    r.set_desired("eco", True)
+    assert r.desired == {"eco": True}
+
+
+def test_request_sends_at_once_and_resets_backoff():
+    device = FakeDevice(obey=False)
+    r = device.reconciler()
+    r.set_desired("light", True)
+    asyncio.run(r.async_reconcile())
+    asyncio.run(r.async_request("light", True))
+    assert device.sent == [("light", True), ("light", True)]
+    assert r.backoff["light"][0] == 1
+
+
+def test_send_errors_are_contained():
+    async def fail(key, value): raise OSError("unreachable")
+    r = Reconciler(lambda key: None, fail, lambda key: True, lambda key: False, clock=lambda: 0.0)
+    r.set_desired("power", True)
+    asyncio.run(r.async_reconcile())
+    assert r.stats["commands_sent"] == 1
+    assert r.metrics["pending"] == {"power": {"desired": True, "attempts": 1, "next_try_in": RECONCILE_BACKOFF_BASE}}
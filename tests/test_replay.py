@@ -0,0 +1,63 @@
+"""Frame captures: loading, decoder replay and the simulator."""
+import asyncio
+import json
+
+import pytest
+
+from custom_components.mertik.codec import FRAME_AUX_ON, FRAME_STATUS_POLL
+from custom_components.mertik.const import CMD_PREFIX
+from custom_components.mertik.mertik import Mertik
+from custom_components.mertik.replay import MertikSimulator, load_capture, replay_decode, replay_simulate
+from frames import status
+
+FRAMES = [
+    (100.0, "tx", FRAME_STATUS_POLL), (100.1, "rx", status()),
+    (130.0, "tx", FRAME_AUX_ON), (130.1, "rx", status(bits="8008")),
+]
+
+
+def capture_of(frames):
+    device = Mertik("127.0.0.1")
+    for _, direction, data in frames: device._record_frame(direction, data)
+    return [dict(fr, time=ts) for fr, (ts, _, _) in zip(device.get_frame_capture(), frames)]
+
+
+@pytest.mark.parametrize("wrap", [
+    lambda frames: {"data": {"frames": frames}},  # Diagnostics download
+    lambda frames: {"frames": frames},
+    lambda frames: frames,
+])
+def test_load_capture(tmp_path, wrap):
+    path = tmp_path / "capture.json"
+    path.write_text(json.dumps(wrap(capture_of(FRAMES))), encoding="utf-8")
+    assert load_capture(path) == FRAMES
+
+
+def test_replay_decode():
+    lines = []
+    device = asyncio.run(replay_decode(FRAMES, speed=0, out=lines.append))
+    events = [json.loads(line) for line in lines]
+    assert [e["t"] for e in events] == [0.0, 0.1, 30.0, 30.1]
+    assert "state" not in events[0]
+    assert not events[1]["state"]["aux"] and events[3]["state"]["aux"]
+    assert device.is_aux_on
+
+
+def test_simulator_repeats_its_last_answer():
+    simulator = MertikSimulator([
+        (0.0, "tx", FRAME_STATUS_POLL), (0.1, "rx", status(flame_raw="00")),
+        (1.0, "tx", FRAME_STATUS_POLL), (1.1, "rx", status(flame_raw="FF")),
+    ])
+    assert simulator._answer(FRAME_STATUS_POLL) == status(flame_raw="00")
+    assert simulator._answer(FRAME_STATUS_POLL) == status(flame_raw="FF")
+    assert simulator._answer(FRAME_STATUS_POLL) == status(flame_raw="FF")
+    # Unknown requests get the last answer given
+    assert simulator._answer(FRAME_AUX_ON) == status(flame_raw="FF")
+
+
+def test_replay_simulate():
+    lines = []
+    device = asyncio.run(replay_simulate(FRAMES, speed=0, out=lines.append))
+    events = [json.loads(line) for line in lines]
+    assert [e["cmd"] for e in events] == [f.hex()[len(CMD_PREFIX):] for f in (FRAME_STATUS_POLL, FRAME_AUX_ON)]
+    assert events[-1]["state"]["aux"] and device.is_aux_on
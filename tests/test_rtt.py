@@ -0,0 +1,114 @@
+"""Adaptive timeouts and what is resent after one expires."""
+import asyncio
+
+import pytest
+
+from custom_components.mertik.codec import FRAME_IGNITE, FRAME_STATUS_POLL
+from custom_components.mertik.mertik import Mertik, ReplyTimeout
+from custom_components.mertik.rtt import RttEstimator
+from frames import status
+
+
+def test_ceiling_until_first_sample():
+    assert RttEstimator(0.5, 10).timeout == 10
+
+
+def test_srtt_and_rttvar_updates():
+    rtt = RttEstimator(0.0, 100)
+    rtt.sample(1.0)
+    assert (rtt.srtt, rtt.rttvar) == (1.0, 0.5)
+    assert rtt.timeout == pytest.approx(3.0)
+    rtt.sample(2.0)
+    assert rtt.rttvar == pytest.approx(0.75 * 0.5 + 0.25 * 1.0)
+    assert rtt.srtt == pytest.approx(0.875 * 1.0 + 0.125 * 2.0)
+    assert rtt.timeout == pytest.approx(rtt.srtt + 4 * rtt.rttvar)
+
+
+def test_floor_and_ceiling_clamp():
+    rtt = RttEstimator(0.5, 2.0)
+    rtt.sample(0.01)
+    assert rtt.timeout == 0.5
+    rtt.sample(10)
+    assert rtt.timeout == 2.0
+
+
+def test_backoff_doubles_and_resets():
+    rtt = RttEstimator(0.0, 1000)
+    rtt.sample(1.0)
+    base = rtt.timeout
+    rtt.on_timeout()
+    assert rtt.timeout == pytest.approx(2 * base)
+    rtt.on_timeout()
+    assert rtt.timeout == pytest.approx(4 * base)
+    for _ in range(10): rtt.on_timeout()
+    # Capped at 64 times the estimate
+    assert rtt.timeout == pytest.approx(64 * base)
+    assert rtt.timeouts == 12
+    rtt.sample(1.0)
+    assert rtt.timeout < 2 * base
+
+
+class SilentModule:
+    """Reads every frame and never answers."""
+
+    def __init__(self):
+        self.received = []
+
+    async def handle(self, reader, writer):
+        while data := await reader.read(1024):
+            self.received.append(data)
+        writer.close()
+
+
+async def _send_to(handler, frame):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    device = Mertik("127.0.0.1", server.sockets[0].getsockname()[1])
+    device.read_rtt = RttEstimator(0.05, 0.05)
+    try:
+        return device, await device._async_send_frame(frame)
+    finally:
+        await device.async_close()
+        server.close()
+        await server.wait_closed()
+
+
+def test_command_not_resent_after_reply_timeout():
+    module = SilentModule()
+    device, reply = asyncio.run(_send_to(module.handle, FRAME_IGNITE))
+    assert reply is None
+    assert module.received == [FRAME_IGNITE]
+    assert device.failures == 1
+
+
+def test_command_resent_when_the_reused_session_was_dropped():
+    writes = []
+
+    async def handle(reader, writer):
+        data = await reader.read(1024)
+        writes.append(data)
+        writer.write(status())
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        device = Mertik("127.0.0.1", server.sockets[0].getsockname()[1])
+        device.keep_alive = True
+        await device._async_send_frame(FRAME_STATUS_POLL)
+        await asyncio.sleep(0.05)
+        # The module closed the kept session: the command never reached it and is sent again
+        reply = await device._async_send_frame(FRAME_IGNITE)
+        await device.async_close()
+        server.close()
+        await server.wait_closed()
+        return reply
+
+    assert asyncio.run(run()) is not None
+    assert writes[-1] == FRAME_IGNITE
+
+
+def test_may_resend():
+    assert Mertik._may_resend(FRAME_STATUS_POLL, ReplyTimeout())
+    assert Mertik._may_resend(FRAME_IGNITE, asyncio.TimeoutError())
+    assert Mertik._may_resend(FRAME_IGNITE, ConnectionResetError())
+    assert not Mertik._may_resend(FRAME_IGNITE, ReplyTimeout())
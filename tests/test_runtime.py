@@ -0,0 +1,40 @@
+"""Burner runtime integration across polls and outages."""
+import pytest
+
+from custom_components.mertik.runtime import BurnerRuntime
+
+TABLE = [0.2] + [1.0] * 12  # kW: pilot, then levels 1-12
+
+
+def make_runtime():
+    return BurnerRuntime(TABLE, aux_power=2.0, calorific_value=10.0)
+
+
+def test_integrates_previous_state_until_next_snapshot():
+    runtime = make_runtime()
+    runtime.update(0, True, 6, False)
+    runtime.update(60, True, 6, True)
+    runtime.update(90, False, 0, False)
+    assert runtime.burner_seconds == 90
+    assert runtime.aux_seconds == 30
+    assert runtime.energy_kwh == pytest.approx((1.0 * 60 + 3.0 * 30) / 3600)
+    assert runtime.gas_m3 == pytest.approx(runtime.energy_kwh / 10.0)
+
+
+def test_reset_baseline_credits_nothing_for_the_outage():
+    runtime = make_runtime()
+    runtime.update(0, True, 6, False)
+    runtime.update(15, True, 6, False)
+    runtime.reset_baseline()
+    runtime.update(75, True, 6, False)
+    assert runtime.burner_seconds == 15
+    runtime.update(90, True, 6, False)
+    assert runtime.burner_seconds == 30
+
+
+def test_ignition_counted_on_transition_only():
+    runtime = make_runtime()
+    runtime.update(0, False, 0, False)
+    runtime.update(15, True, 3, False)
+    runtime.update(30, True, 3, False)
+    assert runtime.ignitions == 1
@@ -0,0 +1,84 @@
+"""Host probing used by the config flow, and finding a module that moved."""
+import asyncio
+import time
+
+import pytest
+
+from custom_components.mertik.codec import FRAME_STATUS_POLL, StatusFrame
+from custom_components.mertik.scan import async_probe_host, find_moved_device, hosts_in
+from frames import status
+
+
+async def probe_local(handle, timeout=1.0):
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await async_probe_host("127.0.0.1", port, timeout=timeout)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_probe_decodes_status():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(await reader.read(1024))
+        writer.write(status())
+        await writer.drain()
+        writer.close()
+
+    assert isinstance(asyncio.run(probe_local(handle)), StatusFrame)
+    assert connections == [FRAME_STATUS_POLL]
+
+
+def test_probe_tries_once_and_gives_up_quickly():
+    connections = []
+
+    async def handle(reader, writer):
+        # Accepts the poll but never answers
+        connections.append(await reader.read(1024))
+        await asyncio.sleep(1)
+        writer.close()
+
+    start = time.monotonic()
+    assert asyncio.run(probe_local(handle, timeout=0.1)) is None
+    assert time.monotonic() - start < 1
+    assert connections == [FRAME_STATUS_POLL]
+
+
+def test_probe_rejects_non_status_reply():
+    async def handle(reader, writer):
+        await reader.read(1024)
+        writer.write(b"HTTP/1.1 400 Bad Request\r\n")
+        await writer.drain()
+        writer.close()
+
+    assert asyncio.run(probe_local(handle)) is None
+
+
+def test_hosts_in():
+    assert hosts_in("192.168.1.0/30") == ["192.168.1.1", "192.168.1.2"]
+    assert hosts_in("192.168.1.7/32") == ["192.168.1.7"]
+    with pytest.raises(ValueError): hosts_in("10.0.0.0/16")
+
+
+FOUND = [
+    {"ip": "192.168.1.20", "response": "4d6f64756c6541"},
+    {"ip": "192.168.1.31", "response": "4d6f64756c6542"},
+]
+
+
+def test_moved_device_matched_by_identity():
+    assert find_moved_device(FOUND, "4d6f64756c6542", {"192.168.1.20", "192.168.1.10"}) == "192.168.1.31"
+    # Identity known but not among the replies: never adopt another module
+    assert find_moved_device(FOUND[:1], "4d6f64756c6542", set()) is None
+    assert find_moved_device([], "4d6f64756c6542", set()) is None
+
+
+def test_moved_device_without_identity_needs_a_single_unclaimed_module():
+    assert find_moved_device(FOUND, None, {"192.168.1.10", "192.168.1.20"}) == "192.168.1.31"
+    # Two candidates: ambiguous
+    assert find_moved_device(FOUND, None, {"192.168.1.10"}) is None
+    # Every module belongs to an entry
+    assert find_moved_device(FOUND, None, {"192.168.1.20", "192.168.1.31"}) is None
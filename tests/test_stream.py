@@ -0,0 +1,63 @@
+"""Live frame feed: events per frame, bounded buffer, unsubscribe."""
+import asyncio
+
+from custom_components.mertik.codec import FRAME_STATUS_POLL
+from custom_components.mertik.mertik import Mertik
+from custom_components.mertik.stream import FrameSubscription
+from frames import datetime_reply, status
+
+
+def test_events_for_sent_received_and_decoded_frames():
+    device = Mertik("127.0.0.1")
+    subscription = FrameSubscription(device)
+    reply = status(flame_raw="FF")
+    device._record_frame("tx", FRAME_STATUS_POLL)
+    device._record_frame("rx", reply)
+    device._handle_response(reply)
+    events = asyncio.run(subscription.async_get_batch())
+    assert [e["direction"] for e in events] == ["tx", "rx", "decoded"]
+    assert events[0]["data"] == FRAME_STATUS_POLL.hex()
+    assert "frame" not in events[1]
+    decoded = events[2]
+    assert decoded["frame"] == "StatusFrame"
+    assert decoded["fields"]["flame_height"] == 12
+    assert decoded["state"]["flame"] == 12 and decoded["state"]["on"]
+
+
+def test_datetime_reply_carries_no_state():
+    device = Mertik("127.0.0.1")
+    subscription = FrameSubscription(device)
+    device._handle_response(datetime_reply())
+    (event,) = asyncio.run(subscription.async_get_batch())
+    assert event["frame"] == "DateTimeFrame" and "state" not in event
+
+
+def test_oldest_events_dropped_when_behind():
+    device = Mertik("127.0.0.1")
+    subscription = FrameSubscription(device, size=3)
+    for i in range(5): device._record_frame("tx", bytes([i]))
+    events = asyncio.run(subscription.async_get_batch())
+    assert [e["data"] for e in events] == ["02", "03", "04"]
+    assert subscription.dropped == 2
+
+
+def test_batch_waits_for_the_next_event():
+    async def run():
+        device = Mertik("127.0.0.1")
+        subscription = FrameSubscription(device)
+        waiter = asyncio.ensure_future(subscription.async_get_batch())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        device._record_frame("tx", b"\x01")
+        return await asyncio.wait_for(waiter, 1)
+    assert [e["data"] for e in asyncio.run(run())] == ["01"]
+
+
+def test_close_removes_the_listener():
+    device = Mertik("127.0.0.1")
+    first, second = FrameSubscription(device), FrameSubscription(device)
+    first.close()
+    first.close()
+    assert device.frame_listeners == [second._on_frame]
+    device._record_frame("tx", b"\x01")
+    assert not first._events and len(second._events) == 1
@@ -0,0 +1,71 @@
+"""Publication deadbands, intervals and the max-interval heartbeat."""
+import pytest
+
+from custom_components.mertik.throttle import PublishThrottle, parse_deadband
+
+
+@pytest.mark.parametrize("text, expected", [("0.5", (0.5, False)), ("5%", (5.0, True)), (" 2 % ", (2.0, True)), ("", (0.0, False))])
+def test_parse_deadband(text, expected):
+    assert parse_deadband(text) == expected
+
+
+@pytest.mark.parametrize("text", ["-1", "nan", "abc"])
+def test_parse_deadband_rejects(text):
+    with pytest.raises(ValueError):
+        parse_deadband(text)
+
+
+def test_first_value_and_force_always_publish():
+    throttle = PublishThrottle(deadband=10, min_interval=60)
+    assert throttle.check(20.0, 0)
+    assert not throttle.check(20.5, 100)
+    assert throttle.check(20.5, 101, force=True)
+    assert throttle.value == 20.5
+
+
+def test_absolute_deadband_and_min_interval():
+    throttle = PublishThrottle(deadband=0.5, min_interval=60)
+    throttle.check(20.0, 0)
+    assert not throttle.check(20.3, 100)
+    assert not throttle.check(21.0, 30)
+    assert throttle.check(21.0, 60)
+    assert throttle.as_dict() == {"published": 2, "suppressed": 2}
+
+
+def test_relative_deadband():
+    throttle = PublishThrottle(deadband=10, relative=True)
+    throttle.check(200, 0)
+    assert not throttle.check(215, 1)
+    assert throttle.check(220, 2)
+
+
+def test_unchanged_value_is_not_counted_as_suppressed():
+    throttle = PublishThrottle(deadband=1)
+    throttle.check(5, 0)
+    assert not throttle.check(5, 10)
+    assert throttle.suppressed == 0
+
+
+def test_max_interval_is_a_heartbeat():
+    throttle = PublishThrottle(deadband=1, min_interval=60, max_interval=900)
+    throttle.check(20.0, 0)
+    # Small change held back until the max interval, then published
+    assert not throttle.check(20.2, 600)
+    assert throttle.check(20.2, 900)
+    # Unchanged value is published again once the max interval passes
+    assert not throttle.check(20.2, 1700)
+    assert throttle.check(20.2, 1800)
+    assert throttle.last_publish == 1800
+
+
+def test_no_heartbeat_without_max_interval():
+    throttle = PublishThrottle(deadband=1)
+    throttle.check(20.0, 0)
+    assert not throttle.check(20.0, 10 ** 6)
+
+
+def test_non_numeric_values_publish_on_change():
+    throttle = PublishThrottle(deadband=5, min_interval=0)
+    throttle.check("ok", 0)
+    assert not throttle.check("ok", 1)
+    assert throttle.check("fault", 2)
@@ -0,0 +1,41 @@
+"""Named wait states on decoded status frames."""
+import pytest
+
+from custom_components.mertik.codec import WAIT_STATES, decode_response
+from frames import status
+
+# Status bits as decode_status reads them: 0x010 shutting down, 0x008 guard flame, 0x001 igniting
+FRAMES = {
+    "off": status(flame_raw="7B", bits="0800"),
+    "igniting": status(flame_raw="7B", bits="0801"),
+    "igniting_with_pilot": status(flame_raw="7B", bits="0809"),
+    "pilot": status(flame_raw="7B", bits="0808"),
+    "flame": status(flame_raw="A0", bits="0800"),
+    "flame_with_guard": status(flame_raw="A0", bits="0808"),
+    "shutting_down": status(flame_raw="7B", bits="0810"),
+}
+
+EXPECTED = {
+    "off": {"off"},
+    "igniting": set(),
+    "igniting_with_pilot": set(),
+    "pilot": {"ignited", "pilot"},
+    "flame": {"ignited", "flame_on"},
+    "flame_with_guard": {"ignited", "flame_on"},
+    "shutting_down": set(),
+}
+
+
+def test_frames_decode_as_described():
+    pilot = decode_response(FRAMES["pilot"])
+    assert (pilot.on, pilot.flame_height, pilot.guard_flame_on, pilot.igniting) == (False, 0, True, False)
+    flame = decode_response(FRAMES["flame"])
+    assert (flame.on, flame.flame_height, flame.guard_flame_on) == (True, 4, False)
+    assert decode_response(FRAMES["igniting"]).igniting
+    assert decode_response(FRAMES["shutting_down"]).shutting_down
+
+
+@pytest.mark.parametrize("name", list(FRAMES))
+def test_wait_states(name):
+    frame = decode_response(FRAMES[name])
+    assert {state for state, holds in WAIT_STATES.items() if holds(frame)} == EXPECTED[name]